@@ -0,0 +1,58 @@
+"""
+Description: Compares finding the largest loan of every plan for a budget by
+searching with trial Mortgage objects against the affordability solver.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_affordability [--applicants N] [--sample N]
+The trial search is timed on a sample of applicants and scaled up to all of them.
+"""
+
+import argparse
+import random
+import time
+
+from mortgage.affordability import maximum_loans, cheapest_plans
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, GROUPS
+
+
+def trial_maximum_loan(budget: float, rate, frequency, amortization: int) -> float:
+    # Bisect on whole cents with calculate_payment, the way it is done without the solver.
+    low, high = 0, 10 ** 11
+    while low < high:
+        middle = (low + high + 1) // 2
+        if Mortgage(middle / 100, rate, frequency, amortization).calculate_payment() <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return low / 100
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the affordability solver.")
+    parser.add_argument("--applicants", type=int, default=10000, help="the number of applicants")
+    parser.add_argument("--sample", type=int, default=20, help="the applicants timed for the trial search")
+    args = parser.parse_args()
+
+    generator = random.Random(0)
+    budgets = [round(generator.uniform(200, 10000), 2) for _ in range(args.applicants)]
+    amounts = [round(generator.uniform(50000, 2000000), 2) for _ in range(args.applicants)]
+    plans = [(RATES_BY_CODE[rate_code], FREQUENCIES_BY_CODE[frequency_code], amortization)
+             for rate_code, frequency_code, amortization in GROUPS]
+
+    start = time.perf_counter()
+    for budget in budgets[:args.sample]:
+        for rate, frequency, amortization in plans:
+            # A monthly budget spread over the plan's own payments.
+            trial_maximum_loan(budget * (12 / frequency.value), rate, frequency, amortization)
+    trial = (time.perf_counter() - start) / args.sample * args.applicants
+    print(f"trial     {trial:8.2f} s (estimated)  {len(plans)} plans x {args.applicants:,} applicants")
+
+    start = time.perf_counter()
+    maximum_loans(budgets)
+    solver = time.perf_counter() - start
+    print(f"solver    {solver:8.2f} s  ({trial / solver:.0f}x)")
+
+    start = time.perf_counter()
+    cheapest_plans(amounts, budgets)
+    print(f"cheapest  {time.perf_counter() - start:8.2f} s")
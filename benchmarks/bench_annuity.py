@@ -0,0 +1,71 @@
+"""
+Description: Compares pricing with the annuity factor table against evaluating
+the annuity formula for every loan.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_annuity [--loans N]
+"""
+
+import argparse
+import random
+import time
+from array import array
+
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION, RATE_TABLES
+
+
+def price_with_formula(amounts, rate_codes, frequency_codes, amortizations) -> array:
+    """
+    Price every loan by evaluating the annuity formula, as calculate_payment used to.
+    returns:
+        The payments as an array of floats.
+    """
+    rates = RATE_TABLES.current.rates_by_code
+    frequencies = [frequency.value for frequency in FREQUENCIES_BY_CODE]
+    payments = array("d")
+    for amount, rate_code, frequency_code, amortization in zip(
+            amounts, rate_codes, frequency_codes, amortizations):
+        i = rates[rate_code] / frequencies[frequency_code]
+        n = amortization * frequencies[frequency_code]
+        payments.append(round(amount * (i * (1 + i) ** n) / ((1 + i) ** n - 1), 2))
+    return payments
+
+
+def price_with_table(amounts, rate_codes, frequency_codes, amortizations) -> array:
+    """
+    Price every loan with one factor lookup and one multiply.
+    returns:
+        The payments as an array of floats.
+    """
+    factors = RATE_TABLES.current.factors_by_code
+    payments = array("d")
+    for amount, rate_code, frequency_code, amortization in zip(
+            amounts, rate_codes, frequency_codes, amortizations):
+        payments.append(round(amount * factors[(rate_code, frequency_code, amortization)], 2))
+    return payments
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the annuity factor table.")
+    parser.add_argument("--loans", type=int, default=10000000, help="the number of loans")
+    parser.add_argument("--seed", type=int, default=0, help="the random seed")
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    amounts = array("d", (round(generator.uniform(50000, 2000000), 2) for _ in range(args.loans)))
+    rate_codes = array("B", (generator.randrange(len(RATES_BY_CODE)) for _ in range(args.loans)))
+    frequency_codes = array("B", (generator.randrange(len(FREQUENCIES_BY_CODE))
+                                  for _ in range(args.loans)))
+    amortizations = array("B", (generator.choice(VALID_AMORTIZATION) for _ in range(args.loans)))
+
+    timings = {}
+    results = {}
+    for name, pricer in (("formula", price_with_formula), ("table", price_with_table)):
+        start = time.perf_counter()
+        results[name] = pricer(amounts, rate_codes, frequency_codes, amortizations)
+        timings[name] = time.perf_counter() - start
+        print(f"{name:<8} {timings[name]:8.2f} s"
+              f"  {timings[name] / args.loans * 1e9:8.1f} ns/loan")
+    differences = sum(a != b for a, b in zip(results["formula"], results["table"]))
+    print(f"speedup  {timings['formula'] / timings['table']:8.2f}x"
+          f"  payments differing by a cent: {differences}")
@@ -0,0 +1,46 @@
+"""
+Description: Compares float batch pricing against exact integer-cents pricing
+on a synthetic book.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_cents [--rows N]
+The conversion of the amounts to cents is timed separately from the pricing.
+"""
+
+import argparse
+import random
+import time
+
+from mortgage.batch import calculate_payments
+from mortgage.cents import to_cents_column, calculate_payments_cents, exact_factors
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time exact integer-cents pricing.")
+    parser.add_argument("--rows", type=int, default=1000000, help="the number of loans to price")
+    args = parser.parse_args()
+
+    generator = random.Random(0)
+    amounts = [round(generator.uniform(50000, 2000000), 2) for _ in range(args.rows)]
+    rate_codes = [generator.randrange(len(RATES_BY_CODE)) for _ in range(args.rows)]
+    frequency_codes = [generator.randrange(len(FREQUENCIES_BY_CODE)) for _ in range(args.rows)]
+    amortizations = [generator.choice(VALID_AMORTIZATION) for _ in range(args.rows)]
+
+    start = time.perf_counter()
+    exact_factors()
+    print(f"factors   {time.perf_counter() - start:8.3f} s  (once per rate table)")
+
+    start = time.perf_counter()
+    calculate_payments(amounts, rate_codes, frequency_codes, amortizations)
+    floats = time.perf_counter() - start
+    print(f"float     {floats:8.3f} s  {args.rows:,} loans")
+
+    start = time.perf_counter()
+    cents = to_cents_column(amounts)
+    print(f"to_cents  {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    calculate_payments_cents(cents, rate_codes, frequency_codes, amortizations)
+    exact = time.perf_counter() - start
+    print(f"cents     {exact:8.3f} s  ({exact / floats:.2f}x the float time)")
@@ -0,0 +1,76 @@
+"""
+Description: Measures the memory used per loan by the dictionary-backed object
+layout, the __slots__ Mortgage and the columnar MortgagePortfolio.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_memory [--loans N]
+"""
+
+import argparse
+import random
+import tracemalloc
+from array import array
+
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION
+from mortgage.portfolio import MortgagePortfolio
+
+
+class DictMortgage:
+    # The attribute layout Mortgage had before __slots__: one __dict__ per loan.
+    def __init__(self, loan_amount, rate, frequency, amortization):
+        self._loan_amount = loan_amount
+        self._rate = rate
+        self._frequency = frequency
+        self._amortization = amortization
+
+
+def build_objects(cls, terms) -> list:
+    # Build one object per loan.
+    return [cls(amount, RATES_BY_CODE[rate_code], FREQUENCIES_BY_CODE[frequency_code], amortization)
+            for amount, rate_code, frequency_code, amortization in terms]
+
+
+def build_portfolio(terms) -> MortgagePortfolio:
+    # Store every loan in the columns of one portfolio, with its payments and
+    # group index.
+    columns = (array("d"), array("B"), array("B"), array("B"))
+    for row in terms:
+        for column, value in zip(columns, row):
+            column.append(value)
+    portfolio = MortgagePortfolio()
+    portfolio.extend(*columns)
+    return portfolio
+
+
+def measure(build, terms: list) -> float:
+    """
+    Measure the memory held by a layout once it is built.
+    Amounts are converted from strings inside the measurement so that the float
+    objects held by the object layouts are counted.
+    returns:
+        The bytes allocated per loan.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    layout = build((float(amount), rate_code, frequency_code, amortization)
+                   for amount, rate_code, frequency_code, amortization in terms)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del layout
+    return (after - before) / len(terms)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure bytes per loan for each layout.")
+    parser.add_argument("--loans", type=int, default=1000000, help="the number of loans")
+    args = parser.parse_args()
+
+    generator = random.Random(0)
+    terms = [(str(round(generator.uniform(50000, 2000000), 2)), generator.randrange(len(RATES_BY_CODE)),
+              generator.randrange(len(FREQUENCIES_BY_CODE)), generator.choice(VALID_AMORTIZATION))
+             for _ in range(args.loans)]
+
+    print(f"dict      {measure(lambda rows: build_objects(DictMortgage, rows), terms):8.1f} bytes/loan")
+    print(f"slots     {measure(lambda rows: build_objects(Mortgage, rows), terms):8.1f} bytes/loan")
+    print(f"columnar  {measure(build_portfolio, terms):8.1f} bytes/loan")
@@ -0,0 +1,48 @@
+"""
+Description: Measures the throughput of the parallel pricer at several worker counts.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_parallel [--rows N] [--workers 1 2 4 8]
+A synthetic file is generated in a temporary directory, priced once per worker
+count, and every parallel report is checked against the single-process report.
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_file
+from mortgage.parallel import price_file
+
+
+def run(path: str, workers: int) -> tuple:
+    """
+    Price a file with the given number of workers.
+    returns:
+        A tuple (seconds, digest of the report text).
+    """
+    digest = hashlib.sha256()
+    start = time.perf_counter()
+    for text in price_file(path, workers):
+        digest.update(text.encode())
+    return time.perf_counter() - start, digest.hexdigest()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the parallel pricer.")
+    parser.add_argument("--rows", type=int, default=2000000, help="the number of synthetic rows")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="the worker counts to measure")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "mortgages.txt")
+        write_file(path, args.rows)
+        baseline = None
+        for workers in args.workers:
+            seconds, digest = run(path, workers)
+            baseline = baseline or (seconds, digest)
+            print(f"workers={workers:<3} {args.rows / seconds:>12,.0f} loans/sec"
+                  f"  speedup={baseline[0] / seconds:5.2f}x"
+                  f"  identical={digest == baseline[1]}")
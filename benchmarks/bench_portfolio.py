@@ -0,0 +1,64 @@
+"""
+Description: Measures how long a MortgagePortfolio takes to absorb intraday
+changes: single-loan edits through a view and a change to one rate.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_portfolio [--loans N] [--edits N]
+"""
+
+import argparse
+import random
+import time
+from array import array
+
+from mortgage.pixell_lookup import (MortgageRate, RATES_BY_CODE, FREQUENCIES_BY_CODE,
+                                    VALID_AMORTIZATION, RATE_TABLES)
+from mortgage.portfolio import MortgagePortfolio
+
+
+def build_portfolio(loans: int, seed: int = 0) -> MortgagePortfolio:
+    # Fill a portfolio with random valid loans.
+    generator = random.Random(seed)
+    portfolio = MortgagePortfolio()
+    portfolio.extend(array("d", (round(generator.uniform(50000, 2000000), 2) for _ in range(loans))),
+                     array("B", (generator.randrange(len(RATES_BY_CODE)) for _ in range(loans))),
+                     array("B", (generator.randrange(len(FREQUENCIES_BY_CODE)) for _ in range(loans))),
+                     array("B", (generator.choice(VALID_AMORTIZATION) for _ in range(loans))))
+    return portfolio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time portfolio edits and rate changes.")
+    parser.add_argument("--loans", type=int, default=1000000, help="the number of loans")
+    parser.add_argument("--edits", type=int, default=10000, help="the number of single-loan edits")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    portfolio = build_portfolio(args.loans)
+    print(f"build        {time.perf_counter() - start:10.3f} s")
+
+    generator = random.Random(1)
+    rows = [generator.randrange(args.loans) for _ in range(args.edits)]
+    start = time.perf_counter()
+    for row in rows:
+        view = portfolio[row]
+        view.loan_amount = view.loan_amount + 1000
+        view.rate = RATES_BY_CODE[generator.randrange(len(RATES_BY_CODE))]
+    elapsed = time.perf_counter() - start
+    print(f"loan edit    {elapsed / args.edits * 1e6:10.1f} us per loan (amount and rate)")
+
+    start = time.perf_counter()
+    portfolio.monthly_cash_flow()
+    print(f"cash flow    {(time.perf_counter() - start) * 1e6:10.1f} us")
+
+    original = RATE_TABLES.current
+    rates = dict(original.rates)
+    rates[MortgageRate.FIXED_5] += 0.0025
+    try:
+        start = time.perf_counter()
+        repriced = portfolio.reprice(RATE_TABLES.update(rates))
+        elapsed = time.perf_counter() - start
+    finally:
+        RATE_TABLES.update(original.rates)
+    print(f"rate change  {elapsed:10.3f} s for {repriced:,} loans "
+          f"({elapsed / max(repriced, 1) * 1e9:.0f} ns per loan)")
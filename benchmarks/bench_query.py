@@ -0,0 +1,72 @@
+"""
+Description: Compares dashboard queries answered by scanning the loans of a
+portfolio against the indexes of an IndexedPortfolio.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_query [--loans N] [--edits N]
+"""
+
+import argparse
+import random
+import time
+from array import array
+
+from mortgage.pixell_lookup import (MortgageRate, MortgageFrequency, RATES_BY_CODE, FREQUENCIES_BY_CODE,
+                                    VALID_AMORTIZATION)
+from mortgage.query import IndexedPortfolio
+
+QUERIES = {
+    "book by rate": {"group_by": ("rate",)},
+    "monthly by amortization": {"frequency": MortgageFrequency.MONTHLY, "group_by": ("amortization",)},
+    "fixed 200k-500k": {"rate": (MortgageRate.FIXED_1, MortgageRate.FIXED_3, MortgageRate.FIXED_5),
+                        "min_amount": 200000, "max_amount": 500000},
+    "jumbo by frequency": {"min_amount": 1500000, "group_by": ("frequency",)},
+}
+
+
+def scan(portfolio: IndexedPortfolio, rate=None, frequency=None, amortization=None, min_amount=None,
+         max_amount=None, group_by=()) -> dict:
+    # Answer a query by reading every loan's terms and payment through its view.
+    totals = {}
+    for mortgage in portfolio:
+        if ((rate is None or mortgage.rate in (rate if isinstance(rate, tuple) else (rate,)))
+                and (frequency is None or mortgage.frequency == frequency)
+                and (amortization is None or mortgage.amortization == amortization)
+                and (min_amount is None or mortgage.loan_amount >= min_amount)
+                and (max_amount is None or mortgage.loan_amount <= max_amount)):
+            key = tuple(getattr(mortgage, column) for column in group_by)
+            count, amount, payment = totals.get(key, (0, 0.0, 0.0))
+            totals[key] = (count + 1, amount + mortgage.loan_amount, payment + mortgage.calculate_payment())
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time indexed portfolio queries.")
+    parser.add_argument("--loans", type=int, default=1000000, help="the number of loans")
+    parser.add_argument("--edits", type=int, default=10000, help="the number of single-loan edits")
+    args = parser.parse_args()
+
+    generator = random.Random(0)
+    portfolio = IndexedPortfolio()
+    start = time.perf_counter()
+    portfolio.extend(array("d", (round(generator.uniform(50000, 2000000), 2) for _ in range(args.loans))),
+                     array("B", (generator.randrange(len(RATES_BY_CODE)) for _ in range(args.loans))),
+                     array("B", (generator.randrange(len(FREQUENCIES_BY_CODE)) for _ in range(args.loans))),
+                     array("B", (generator.choice(VALID_AMORTIZATION) for _ in range(args.loans))))
+    print(f"build      {time.perf_counter() - start:8.2f} s  {args.loans:,} loans")
+
+    start = time.perf_counter()
+    for _ in range(args.edits):
+        portfolio[generator.randrange(args.loans)].loan_amount = round(generator.uniform(50000, 2000000), 2)
+    print(f"edits      {(time.perf_counter() - start) / args.edits * 1e6:8.1f} us per edit")
+
+    start = time.perf_counter()
+    scan(portfolio, **QUERIES["book by rate"])
+    print(f"scan       {time.perf_counter() - start:8.2f} s per query")
+    for name, filters in QUERIES.items():
+        start = time.perf_counter()
+        portfolio.aggregate(**filters)
+        print(f"{name:24s} {(time.perf_counter() - start) * 1000:8.2f} ms")
+    start = time.perf_counter()
+    portfolio.select(rate=MortgageRate.FIXED_5, frequency=MortgageFrequency.WEEKLY).bit_count()
+    print(f"{'select fixed 5 weekly':24s} {(time.perf_counter() - start) * 1000:8.2f} ms")
@@ -0,0 +1,56 @@
+"""
+Description: Compares pricing a book under many rate scenarios with a
+calculate_payment loop against the scenario engine.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_scenarios [--loans N] [--workers N]
+The loop is timed on a sample of scenarios and scaled up to all of them.
+"""
+
+import argparse
+import random
+import time
+from array import array
+
+from mortgage.batch import build_mortgages
+from mortgage.mortgage import clear_payment_cache
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION, RATE_TABLES
+from mortgage.scenarios import parallel_shifts, price_scenarios, aggregate_scenarios
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time scenario pricing.")
+    parser.add_argument("--loans", type=int, default=100000, help="the number of loans")
+    parser.add_argument("--workers", type=int, default=1, help="the number of worker processes")
+    parser.add_argument("--sample", type=int, default=2, help="the scenarios timed for the loop")
+    args = parser.parse_args()
+
+    generator = random.Random(0)
+    columns = (array("d", (round(generator.uniform(50000, 2000000), 2) for _ in range(args.loans))),
+               array("B", (generator.randrange(len(RATES_BY_CODE)) for _ in range(args.loans))),
+               array("B", (generator.randrange(len(FREQUENCIES_BY_CODE)) for _ in range(args.loans))),
+               array("B", (generator.choice(VALID_AMORTIZATION) for _ in range(args.loans))))
+    scenarios = parallel_shifts(-300, 300, 25)
+
+    mortgages = build_mortgages(*columns)
+    original = RATE_TABLES.current
+    start = time.perf_counter()
+    try:
+        for shock in scenarios[:args.sample]:
+            RATE_TABLES.update({rate: value + shock[0] for rate, value in original.rates.items()})
+            clear_payment_cache()
+            [mortgage.calculate_payment() for mortgage in mortgages]
+    finally:
+        RATE_TABLES.update(original.rates)
+    loop = (time.perf_counter() - start) / args.sample * len(scenarios)
+    print(f"loop       {loop:8.2f} s (estimated)  {len(scenarios)} scenarios x {args.loans:,} loans")
+
+    start = time.perf_counter()
+    for _ in price_scenarios(*columns, scenarios, workers=args.workers):
+        pass
+    matrix = time.perf_counter() - start
+    print(f"matrix     {matrix:8.2f} s  ({loop / matrix:.1f}x)")
+
+    start = time.perf_counter()
+    aggregate_scenarios(*columns, scenarios, workers=args.workers)
+    aggregate = time.perf_counter() - start
+    print(f"aggregate  {aggregate:8.2f} s  ({loop / aggregate:.0f}x)")
@@ -0,0 +1,62 @@
+"""
+Description: Compares simulating cash flows with a loop over loans, periods
+and paths against the Monte Carlo simulator.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.bench_simulation [--loans N] [--paths N] [--workers N]
+The loop is timed on a sample of loans and paths and scaled up to the book.
+"""
+
+import argparse
+import random
+import time
+from array import array
+
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION, RATE_TABLES
+from mortgage.simulation import Assumptions, simulate
+
+
+def loop_path(amount: float, rate: float, frequency: int, amortization: int, generator: random.Random,
+              assumptions: Assumptions) -> float:
+    # Project one loan along one path payment by payment, the way it is done without the simulator.
+    cash = 0.0
+    balance = amount
+    i = rate / frequency
+    n = amortization * frequency
+    payment = balance * i / (1 - (1 + i) ** -n)
+    smm = 1 - (1 - assumptions.cpr) ** (1 / frequency)
+    for period in range(n):
+        balance -= payment - balance * i
+        cash += payment
+        if generator.random() < smm:
+            return cash + balance
+    return cash
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the Monte Carlo simulator.")
+    parser.add_argument("--loans", type=int, default=100000, help="the number of loans")
+    parser.add_argument("--paths", type=int, default=1000, help="the number of paths")
+    parser.add_argument("--workers", type=int, default=1, help="the number of worker processes")
+    parser.add_argument("--sample", type=int, default=2000, help="the loan paths timed for the loop")
+    args = parser.parse_args()
+
+    generator = random.Random(0)
+    columns = (array("d", (round(generator.uniform(50000, 2000000), 2) for _ in range(args.loans))),
+               array("B", (generator.randrange(len(RATES_BY_CODE)) for _ in range(args.loans))),
+               array("B", (generator.randrange(len(FREQUENCIES_BY_CODE)) for _ in range(args.loans))),
+               array("B", (generator.choice(VALID_AMORTIZATION) for _ in range(args.loans))))
+
+    assumptions = Assumptions()
+    rates = RATE_TABLES.current.rates_by_code
+    start = time.perf_counter()
+    for row in range(args.sample):
+        loop_path(columns[0][row], rates[columns[1][row]], FREQUENCIES_BY_CODE[columns[2][row]].value,
+                  columns[3][row], generator, assumptions)
+    loop = (time.perf_counter() - start) / args.sample * args.loans * args.paths
+    print(f"loop       {loop / 3600:8.1f} h (estimated)  {args.loans:,} loans x {args.paths:,} paths")
+
+    start = time.perf_counter()
+    result = simulate(*columns, paths=args.paths, workers=args.workers)
+    simulator = time.perf_counter() - start
+    print(f"simulator  {simulator:8.2f} s  ({loop / simulator:,.0f}x)  expected life {result.expected_life:.2f} years")
@@ -0,0 +1,128 @@
+"""
+Description: A load generator for the asyncio pricing service that reports
+latency percentiles and throughput at several concurrency levels.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.load_client [--host H] [--port P | --unix PATH]
+           [--concurrency 1 8 64 256] [--duration 5] [--spawn]
+Each concurrency level opens that many connections; every connection sends a
+request, waits for its response and sends the next one until the duration is
+up. With --spawn a service is started in a subprocess for the run.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, VALID_AMORTIZATION
+from mortgage.service import DEFAULT_PORT
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    The nearest-rank percentile of a list of values.
+    args:
+        values(list): The values, which are sorted in place.
+        fraction(float): The percentile as a fraction, such as 0.99.
+    returns:
+        The percentile value.
+    """
+    values.sort()
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+async def _open(host: str, port: int, path: str) -> tuple:
+    # Open a TCP or Unix socket connection to the service.
+    if path:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _client(host: str, port: int, path: str, deadline: float, latencies: list, seed: int):
+    # Send requests one after another on one connection until the deadline.
+    generator = random.Random(seed)
+    rates = [rate.name for rate in MortgageRate]
+    frequencies = [frequency.name for frequency in MortgageFrequency]
+    reader, writer = await _open(host, port, path)
+    request_id = 0
+    while time.perf_counter() < deadline:
+        request_id += 1
+        request = {"id": request_id, "loan_amount": round(generator.uniform(50000, 2000000), 2),
+                   "rate": generator.choice(rates), "frequency": generator.choice(frequencies),
+                   "amortization": generator.choice(VALID_AMORTIZATION)}
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_level(host: str, port: int, path: str, concurrency: int, duration: float) -> dict:
+    """
+    Drive the service with a number of concurrent connections for a duration.
+    returns:
+        A dictionary with the request count, requests/sec and p50/p99 latency in ms.
+    """
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_client(host, port, path, deadline, latencies, seed)
+                           for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"concurrency": concurrency, "requests": len(latencies),
+            "requests_per_sec": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000}
+
+
+async def _wait_for_service(host: str, port: int, path: str, timeout: float = 10.0):
+    # Retry connecting until a spawned service is listening.
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await _open(host, port, path)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def main(args):
+    # Run every concurrency level in turn and print one line per level.
+    if args.spawn:
+        await _wait_for_service(args.host, args.port, args.unix)
+    for concurrency in args.concurrency:
+        result = await run_level(args.host, args.port, args.unix, concurrency, args.duration)
+        print(f"concurrency={result['concurrency']:<5} {result['requests_per_sec']:>10,.0f} req/sec"
+              f"  p50={result['p50_ms']:7.2f} ms  p99={result['p99_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate load against the pricing service.")
+    parser.add_argument("--host", default="127.0.0.1", help="the TCP host")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="the TCP port")
+    parser.add_argument("--unix", help="connect to this Unix socket path instead of TCP")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64, 256],
+                        help="the concurrency levels to measure")
+    parser.add_argument("--duration", type=float, default=5.0, help="the seconds per level")
+    parser.add_argument("--spawn", action="store_true", help="start a service for the run")
+    args = parser.parse_args()
+    service = None
+    if args.spawn:
+        command = [sys.executable, "-m", "mortgage.service", "--host", args.host, "--port", str(args.port)]
+        if args.unix:
+            command += ["--unix", args.unix]
+        service = subprocess.Popen(command)
+    try:
+        asyncio.run(main(args))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
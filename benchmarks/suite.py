@@ -0,0 +1,203 @@
+"""
+Description: A benchmark suite that times each stage of the mortgage pipeline
+on a synthetic file and compares the results with a stored baseline.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.suite [--rows N] [--output results.json]
+           [--baseline baseline.json] [--threshold 0.10]
+Every stage reports its time, throughput (loans/sec) and peak traced memory.
+With --baseline, any stage whose throughput fell by more than the threshold is
+reported as a regression and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_file
+from mortgage.batch import build_mortgages, calculate_payments
+from mortgage.cli import report
+from mortgage.mortgage import Mortgage, clear_payment_cache
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE
+from mortgage.reader import read_chunks
+from mortgage.report import render_text
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def _parse(path: str) -> list:
+    # Parse the whole file into chunks.
+    return list(read_chunks(path))
+
+
+def _construct(chunks: list) -> list:
+    # Build a validated Mortgage for every parsed row.
+    return [Mortgage(amount, RATES_BY_CODE[rate_code], FREQUENCIES_BY_CODE[frequency_code], amortization)
+            for chunk in chunks
+            for amount, rate_code, frequency_code, amortization
+            in zip(chunk.amounts, chunk.rate_codes, chunk.frequency_codes, chunk.amortizations)]
+
+
+def _construct_bulk(chunks: list) -> list:
+    # Build the same objects with the column-validated bulk factory.
+    return [mortgage for chunk in chunks
+            for mortgage in build_mortgages(chunk.amounts, chunk.rate_codes,
+                                            chunk.frequency_codes, chunk.amortizations)]
+
+
+def _price_scalar(mortgages: list) -> list:
+    # Call calculate_payment on every object, starting from empty caches so
+    # repeated runs measure the calculation rather than cache hits.
+    clear_payment_cache()
+    for mortgage in mortgages:
+        mortgage._payment = None
+    return [mortgage.calculate_payment() for mortgage in mortgages]
+
+
+def _price_batch(chunks: list) -> list:
+    # Price every chunk with the batch engine.
+    return [calculate_payments(chunk.amounts, chunk.rate_codes, chunk.frequency_codes, chunk.amortizations)
+            for chunk in chunks]
+
+
+def _format_scalar(mortgages: list) -> int:
+    # Format every object with __str__, as the original client printed them.
+    return sum(len(str(mortgage)) for mortgage in mortgages)
+
+
+def _format_batch(chunks: list, priced: list) -> int:
+    # Render every chunk's report text.
+    return sum(len(render_text(chunk, payments, errors)) for chunk, (payments, errors) in zip(chunks, priced))
+
+
+def _client(path: str) -> None:
+    # Run the client program's report end to end with its output discarded.
+    with open(os.devnull, "w") as devnull:
+        report(path, output=devnull)
+
+
+def measure(function, *args, repeat: int = 3, trace_memory: bool = True) -> tuple:
+    """
+    Time a stage, keeping the best of several runs, and optionally trace its
+    peak memory in a separate run so tracing does not slow the timed runs.
+    returns:
+        A tuple (seconds, peak_bytes, result); peak_bytes is None when memory
+        is not traced.
+    """
+    seconds = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    peak = None
+    if trace_memory:
+        del result
+        tracemalloc.start()
+        result = function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def run_suite(rows: int, seed: int = 0, repeat: int = 3, trace_memory: bool = True) -> dict:
+    """
+    Generate a synthetic file and time every stage of the pipeline on it.
+    args:
+        rows(int): The number of synthetic rows.
+        seed(int): The random seed for the synthetic file.
+        repeat(int): The number of timed runs per stage; the fastest is kept.
+        trace_memory(bool): Whether to measure peak memory for each stage.
+    returns:
+        A dictionary of results that can be saved as JSON.
+    """
+    stages = {}
+
+    def record(name: str, loans: int, function, *args):
+        seconds, peak, result = measure(function, *args, repeat=repeat, trace_memory=trace_memory)
+        stages[name] = {"seconds": seconds, "loans_per_sec": loans / seconds if seconds else None,
+                        "peak_bytes": peak}
+        return result
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "mortgages.txt")
+        write_file(path, rows, seed)
+        chunks = record("parse", rows, _parse, path)
+        loans = sum(len(chunk.amounts) for chunk in chunks)
+        record("construct_bulk", loans, _construct_bulk, chunks)
+        mortgages = record("construct", loans, _construct, chunks)
+        record("price_scalar", loans, _price_scalar, mortgages)
+        priced = record("price_batch", loans, _price_batch, chunks)
+        record("format_scalar", loans, _format_scalar, mortgages)
+        record("format_batch", loans, _format_batch, chunks, priced)
+        record("client", rows, _client, path)
+
+    return {"rows": rows, "seed": seed, "repeat": repeat, "python": platform.python_version(),
+            "machine": platform.machine(), "stages": stages}
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Compare the throughput of each stage with a baseline.
+    args:
+        results(dict): The results of run_suite.
+        baseline(dict): Earlier results of run_suite.
+        threshold(float): The fractional slowdown that counts as a regression.
+    returns:
+        A list of (stage, baseline loans/sec, current loans/sec, change) tuples
+        for every stage that slowed down by more than the threshold.
+    """
+    regressions = []
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous or not previous.get("loans_per_sec") or not current.get("loans_per_sec"):
+            continue
+        change = current["loans_per_sec"] / previous["loans_per_sec"] - 1
+        if change < -threshold:
+            regressions.append((stage, previous["loans_per_sec"], current["loans_per_sec"], change))
+    return regressions
+
+
+def main(argv=None) -> int:
+    """
+    Run the suite from the command line.
+    args:
+        argv(list): The command line arguments, sys.argv[1:] when None.
+    returns:
+        The exit status: 1 when a regression was found, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the mortgage pipeline.")
+    parser.add_argument("--rows", type=int, default=200000, help="the number of synthetic rows")
+    parser.add_argument("--seed", type=int, default=0, help="the random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="the timed runs per stage")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    parser.add_argument("--output", help="the JSON file to save the results to")
+    parser.add_argument("--baseline", help="the JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="the fractional slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.rows, args.seed, args.repeat, not args.no_memory)
+    for stage, values in results["stages"].items():
+        peak = values["peak_bytes"]
+        print(f"{stage:<14} {values['seconds']:8.3f} s {values['loans_per_sec']:>12,.0f} loans/sec"
+              + (f" {peak / 1024 / 1024:9.1f} MiB peak" if peak is not None else ""))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r") as input:
+            regressions = compare(results, json.load(input), args.threshold)
+        for stage, previous, current, change in regressions:
+            print(f"REGRESSION {stage}: {previous:,.0f} -> {current:,.0f} loans/sec ({change:+.1%})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
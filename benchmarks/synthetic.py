@@ -0,0 +1,79 @@
+"""
+Description: Generates synthetic mortgage files in the same format as
+data/pixell_river_mortgages.txt for benchmarking.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m benchmarks.synthetic OUTPUT ROWS [--seed N] [--bad-fraction F]
+"""
+
+import argparse
+import random
+
+from mortgage.batch import calculate_payments
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION
+
+# Rows that the client program must reject, in the styles found in the sample file.
+BAD_ROWS = (
+    "125999.99,FIXED_5,22,WEEKLY,EXCEPTION",
+    "One_Million, FIXED_5, 30, MONTHLY,EXCEPTION",
+    "0,FIXED_1,10,MONTHLY,EXCEPTION",
+    "-499283,VARIABLE_3,10,BI_WEEKLY,EXCEPTION",
+    "1000000,FIXED_33,30,BI_WEEKLY,2703.85,EXCEPTION",
+    "293812,VARIABLE_1,15,BI_MONTHLY,2606.49,EXCEPTION",
+)
+BLOCK_SIZE = 65536
+
+
+def generate_rows(rows: int, seed: int = 0, bad_fraction: float = 0.01):
+    """
+    Generate synthetic mortgage rows with their expected payment column.
+    args:
+        rows(int): The number of rows to generate.
+        seed(int): The random seed, so the same file can be generated again.
+        bad_fraction(float): The share of rows that must be rejected.
+    returns:
+        A generator of blocks of lines, each line ending in a newline.
+    """
+    generator = random.Random(seed)
+    remaining = rows
+    while remaining > 0:
+        size = min(BLOCK_SIZE, remaining)
+        remaining -= size
+        amounts = [round(generator.uniform(50000, 2000000), 2) for _ in range(size)]
+        rate_codes = [generator.randrange(len(RATES_BY_CODE)) for _ in range(size)]
+        frequency_codes = [generator.randrange(len(FREQUENCIES_BY_CODE)) for _ in range(size)]
+        amortizations = [generator.choice(VALID_AMORTIZATION) for _ in range(size)]
+        payments, _ = calculate_payments(amounts, rate_codes, frequency_codes, amortizations)
+        lines = []
+        for amount, rate_code, frequency_code, amortization, payment in zip(
+                amounts, rate_codes, frequency_codes, amortizations, payments):
+            if generator.random() < bad_fraction:
+                lines.append(generator.choice(BAD_ROWS) + "\n")
+            else:
+                lines.append(f"{amount},{RATES_BY_CODE[rate_code].name},{amortization},"
+                             f"{FREQUENCIES_BY_CODE[frequency_code].name},{payment:.2f}\n")
+        yield lines
+
+
+def write_file(path: str, rows: int, seed: int = 0, bad_fraction: float = 0.01):
+    """
+    Write a synthetic mortgage file.
+    args:
+        path(str): The path of the file to write.
+        rows(int): The number of rows to generate.
+        seed(int): The random seed.
+        bad_fraction(float): The share of rows that must be rejected.
+    """
+    with open(path, "w") as output:
+        for lines in generate_rows(rows, seed, bad_fraction):
+            output.writelines(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic mortgage file.")
+    parser.add_argument("output", help="the file to write")
+    parser.add_argument("rows", type=int, help="the number of rows")
+    parser.add_argument("--seed", type=int, default=0, help="the random seed")
+    parser.add_argument("--bad-fraction", type=float, default=0.01, help="the share of rejected rows")
+    args = parser.parse_args()
+    write_file(args.output, args.rows, args.seed, args.bad_fraction)
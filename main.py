@@ -1,57 +1,30 @@
 """
-Description: A client program written to verify accuracy of and 
+Description: A client program written to verify accuracy of and
 calculate payments for PiXELL River Mortgages.
 Author: ACE Faculty
 Edited by: Benjamin Omoregie
 Date: 12/11/2023
+Usage: python main.py [path] [--workers N] [--format text|csv|jsonl] [--output FILE]
+       python main.py [path] --reconcile [--tolerance AMOUNT]
+       python main.py price AMOUNT RATE AMORTIZATION FREQUENCY
+       Add --rates FILE to price with the rates in a rate file instead of the
+       built-in rates, --stats FILE to save a JSON summary of stage times and
+       counters (with --trace-memory for the peak memory), and --profile FILE
+       to save cProfile statistics.
+The file is streamed in chunks, each chunk is priced as a batch and the report
+is written through a buffered ReportWriter in large blocks. With more than one
+worker the file is split into byte ranges that are priced in parallel by
+worker processes. A columnar book written by mortgage.columnar is read through
+mmap instead (in a single process). With --reconcile the expected payment
+column is checked against the calculated payments instead, and the exit status
+is 1 when any row does not reconcile. The price mode prints the payment of a
+single loan. The command line is implemented in mortgage.cli, which imports
+each mode's modules only when that mode runs.
 """
 
-### REQUIREMENT
-### ADD IMPORT STATEMENTS FOR THE MORTGAGE CLASS, THE 
-### MORTGAGERATE AND MORTGAGEFREQUENCY ENUMERATIONS AND THE 
-### VALID_AMORTIZATION LIST
-from mortgage.mortgage import Mortgage
-from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, VALID_AMORTIZATION
+import sys
 
+from mortgage.cli import main
 
-
-
-### REQUIREMENT
-### ENCLOSE THE FOLLOWING 'WITH OPEN' BLOCK IN A 'TRY-EXCEPT' BLOCK WHICH 
-### WILL CATCH A 'FILENOTFOUNDERROR' EXCEPTION
-try:
-    with open ("data\\pixell_river_mortgages.txt","r") as input:
-        print("**************************************************")
-        
-        for data in input:
-            items = data.split(",")
-            
-            try:
-                amount = float(items[0])
-                rate = items[1]
-                amortization = items[2]
-                frequency = items[3]
-                ### REQUIREMENT:
-                ###THIS CONVERT THE RATE, AMORTIZATION AND FREQUENCY VALUES
-                rate = MortgageRate[rate]
-                amortization = int(amortization)
-                frequency = MortgageFrequency[frequency]
-                ### INSTANTIATE A MORTGAGE OBJECT USING THE VALUES
-                ### FOR AMOUNT, RATE, FREQUENCY AND AMORTIZATION ABOVE.
-                mortgage = Mortgage(amount, rate,  frequency, amortization)
-                ### REQUIREMENT:
-                ### PRINT THE MORTGAGE OBJECT
-                print(mortgage)
-            except ValueError as e:
-                # This except block will catch Explicit exceptions: 
-                # Those raised by the programmer in the Mortgage class.
-                print(f"Data: {data.strip()} caused Exception: {e}")
-            
-            except Exception as e:
-                # This except block will catch Implicit exceptions:  
-                # Those raised through normal execution.
-                print(f"Data: {data.strip()} caused Exception: {e}")
-            finally:
-                print("**************************************************")
-except FileNotFoundError as e:
-    print(f"File not found: {e}")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
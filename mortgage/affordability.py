@@ -0,0 +1,169 @@
+"""
+Description: Solves the affordability question for whole columns of applicants:
+the largest loan each plan allows for a payment budget, and the plans that keep
+a loan's payments lowest.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Pass a column of budgets to maximum_loans for the largest loan of every
+plan, or columns of loan amounts and budgets to rank_plans (or cheapest_plans)
+for the plans each applicant can afford, cheapest first. A plan is one
+(rate code, frequency code, amortization) group, in pixell_lookup.GROUPS order. A
+budget is the largest payment per period of budget_frequency (monthly by
+default); each plan gets the same yearly budget, spread over its own payments,
+so a $500 monthly budget allows a weekly plan $500 * 12 / 52 per payment. The
+affordability check and the ranking therefore both compare yearly amounts.
+The payment is the loan amount times the plan's annuity factor, rounded to the
+cent, so the annuity formula is inverted in closed form (budget / factor) and
+the result is moved to the nearest cent that calculate_payment agrees with.
+"""
+
+import math
+from array import array
+from itertools import repeat
+from operator import mul
+
+from mortgage.pixell_lookup import MortgageFrequency, FREQUENCIES_BY_CODE, RATE_TABLES, GROUPS
+
+DEFAULT_BLOCK_SIZE = 4096
+
+# The number of payments per year of every plan, in GROUPS order.
+_PAYMENTS_PER_YEAR = tuple(FREQUENCIES_BY_CODE[frequency_code].value for _, frequency_code, _ in GROUPS)
+
+
+def _plan_factors(rate_table) -> list:
+    # The annuity factor of every plan, in GROUPS order.
+    factors = (rate_table if rate_table is not None else RATE_TABLES.current).factors_by_code
+    return [factors[group] for group in GROUPS]
+
+
+def _plan_ratios(budget_frequency) -> list:
+    # The share of one budget_frequency budget each plan may spend per
+    # payment, in GROUPS order: the number of budget periods per year over
+    # the plan's payments per year, exactly 1.0 for plans of the same frequency.
+    if not isinstance(budget_frequency, MortgageFrequency):
+        raise ValueError("Frequency provided is invalid.")
+    return [budget_frequency.value / payments for payments in _PAYMENTS_PER_YEAR]
+
+
+def _check_column(values, name: str):
+    # Reject values that are not positive finite numbers.
+    if len(values) and not (min(values) > 0 and not any(map(math.isnan, values))):
+        raise ValueError(f"{name} must be positive.")
+    if not all(map(math.isfinite, values)):
+        raise ValueError(f"{name} must be a finite number.")
+
+
+def _maximum_loan(budget: float, factor: float) -> float:
+    # The largest loan, in whole cents, whose payment round(loan * factor, 2)
+    # is within the budget. The payment can be at most the budget rounded down
+    # to the cent, so the loan times the factor must stay below that plus half
+    # a cent; inverting that bound lands within a cent of the answer, and the
+    # loops step to the exact cent with calculate_payment's own rounding.
+    limit = (math.floor(budget * 100 + 1e-6) + 0.5) / 100
+    cents = math.floor(limit / factor * 100)
+    while round((cents + 1) / 100 * factor, 2) <= budget:
+        cents += 1
+    while cents > 0 and round(cents / 100 * factor, 2) > budget:
+        cents -= 1
+    return cents / 100
+
+
+def maximum_loans(budgets, rate_table=None, budget_frequency=MortgageFrequency.MONTHLY) -> list:
+    """
+    Calculate the largest loan every plan allows for each budget.
+    args:
+        budgets: A sequence of payment budgets, one per applicant.
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+        budget_frequency(MortgageFrequency): The period each budget covers.
+    returns:
+        A list with, per plan in GROUPS order, an array of the largest loan for
+        each budget, in whole cents. Its payment is within the plan's share of
+        the budget and the payment of a loan one cent larger is not. A budget
+        below the smallest payment of a plan gives 0.0.
+    raises:
+        ValueError: When a budget is not a positive finite number or the
+            frequency is invalid.
+    """
+    ratios = _plan_ratios(budget_frequency)
+    _check_column(budgets, "Payment budget")
+    return [array("d", map(_maximum_loan, budgets if ratio == 1.0 else map(mul, budgets, repeat(ratio)),
+                           repeat(factor)))
+            for factor, ratio in zip(_plan_factors(rate_table), ratios)]
+
+
+def _plan_order(factors: list) -> list:
+    # Plans ordered by their yearly cost per dollar borrowed. Per applicant the
+    # rounding of payments can only swap plans that are nearly equal, so this
+    # order is almost sorted and re-sorting it costs close to one pass.
+    return sorted(range(len(GROUPS)), key=lambda plan: factors[plan] * _PAYMENTS_PER_YEAR[plan])
+
+
+def _affordable_blocks(loan_amounts, budgets, rate_table, block_size: int, budget_frequency):
+    # Find the affordable plans of each applicant, one block of applicants at a
+    # time: the payments of a block are calculated plan by plan over the whole
+    # column, then read back applicant by applicant. A plan is affordable when
+    # its payment is within the plan's share of the budget. Yields the
+    # affordable plans in _plan_order with the yearly payments of every plan.
+    if len(loan_amounts) != len(budgets):
+        raise ValueError("Columns must all be the same length.")
+    if block_size <= 0:
+        raise ValueError("Block size must be positive.")
+    _check_column(loan_amounts, "Loan amount")
+    ratios = _plan_ratios(budget_frequency)
+    _check_column(budgets, "Payment budget")
+    factors = _plan_factors(rate_table)
+    order = _plan_order(factors)
+    two = repeat(2)
+    for start in range(0, len(loan_amounts), block_size):
+        amounts = loan_amounts[start:start + block_size]
+        columns = [list(map(round, map(mul, amounts, repeat(factor)), two)) for factor in factors]
+        for budget, payments in zip(budgets[start:start + block_size], zip(*columns)):
+            limits = [budget * ratio for ratio in ratios]
+            yield ([plan for plan in order if payments[plan] <= limits[plan]],
+                   list(map(mul, payments, _PAYMENTS_PER_YEAR)))
+
+
+def rank_plans(loan_amounts, budgets, rate_table=None, block_size: int = DEFAULT_BLOCK_SIZE,
+               budget_frequency=MortgageFrequency.MONTHLY) -> list:
+    """
+    Rank the plans each applicant can afford by the total of their payments
+    over a year, cheapest first. A plan is affordable when the payment of the
+    loan is within the plan's share of the budget, so its yearly payments are
+    within the yearly budget.
+    args:
+        loan_amounts: A sequence of loan amounts, one per applicant.
+        budgets: A sequence of payment budgets, one per applicant.
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+        block_size(int): The number of applicants whose payments are held at a time.
+        budget_frequency(MortgageFrequency): The period each budget covers.
+    returns:
+        A list with, per applicant, an array of plan indexes into GROUPS. Plans
+        with the same yearly payments are ordered by their unrounded cost, then
+        by GROUPS order; an applicant who can afford no plan gets an empty array.
+    raises:
+        ValueError: When the columns are not the same length, a loan amount
+            or budget is not a positive finite number, the block size is not
+            positive, or the frequency is invalid.
+    """
+    ranked = []
+    for plans, yearly in _affordable_blocks(loan_amounts, budgets, rate_table, block_size, budget_frequency):
+        plans.sort(key=yearly.__getitem__)
+        ranked.append(array("B", plans))
+    return ranked
+
+
+def cheapest_plans(loan_amounts, budgets, rate_table=None, block_size: int = DEFAULT_BLOCK_SIZE,
+                   budget_frequency=MortgageFrequency.MONTHLY) -> array:
+    """
+    Find the affordable plan with the lowest yearly payments for each applicant.
+    args:
+        The same as rank_plans.
+    returns:
+        An array with, per applicant, the plan index into GROUPS, or -1 when
+        the applicant can afford no plan.
+    raises:
+        ValueError: The same as rank_plans.
+    """
+    return array("h", (min(plans, key=yearly.__getitem__) if plans else -1
+                       for plans, yearly in _affordable_blocks(loan_amounts, budgets, rate_table, block_size,
+                                                               budget_frequency)))
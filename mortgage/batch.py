@@ -0,0 +1,271 @@
+"""
+Description: Column-oriented payment calculation for whole mortgage books.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Pass parallel columns of loan amounts, rate codes, frequency codes and
+amortization periods to calculate_payments to price every loan in one pass, or
+to calculate_balances and calculate_schedules for amortization schedules.
+build_mortgages turns validated columns into Mortgage objects in bulk, and
+group_indexes and sum_by_group map loans to their pixell_lookup.GROUPS index.
+Rate and frequency codes are positions in RATES_BY_CODE and FREQUENCIES_BY_CODE.
+Each call prices with one rate table snapshot: the one passed in, or
+RATE_TABLES.current when none is given.
+"""
+
+import math
+from array import array
+
+from mortgage import instrumentation
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import (RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION, RATE_TABLES, GROUPS,
+                                    GROUP_INDEX)
+
+NAN = float("nan")
+
+_RATE_CODE_SET = frozenset(range(len(RATES_BY_CODE)))
+_FREQUENCY_CODE_SET = frozenset(range(len(FREQUENCIES_BY_CODE)))
+_AMORTIZATION_SET = frozenset(VALID_AMORTIZATION)
+
+
+def row_error(amount, rate_code: int, frequency_code: int) -> str:
+    """
+    The Mortgage error message of a row that has no annuity factor or a loan
+    amount that is not positive. Checks run in the same order as
+    Mortgage.__init__ so the first failing check produces the same message.
+    args:
+        amount: The loan amount.
+        rate_code(int): The MortgageRate code.
+        frequency_code(int): The MortgageFrequency code.
+    returns:
+        The error message.
+    """
+    if not amount > 0:
+        return "Loan amount must be positive."
+    if not 0 <= rate_code < len(RATES_BY_CODE):
+        return "Rate provided is invalid."
+    if not 0 <= frequency_code < len(FREQUENCIES_BY_CODE):
+        return "Frequency provided is invalid."
+    return "Amortization provided is invalid."
+
+
+def calculate_payments(loan_amounts, rate_codes, frequency_codes, amortizations, rate_table=None) -> tuple:
+    """
+    Calculate the periodic payment for every row of a mortgage book.
+    Invalid rows do not stop the batch: they are reported in the error list.
+    args:
+        loan_amounts: A sequence of loan amounts.
+        rate_codes: A sequence of MortgageRate codes.
+        frequency_codes: A sequence of MortgageFrequency codes.
+        amortizations: A sequence of amortization periods in years.
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+    returns:
+        A tuple (payments, errors). payments is an array of floats, rounded to
+        the cent, holding NaN for invalid rows. errors is a list holding None for
+        valid rows and the Mortgage ValueError message for invalid rows.
+    raises:
+        ValueError: When the columns are not all the same length.
+    """
+    count = len(loan_amounts)
+    if not count == len(rate_codes) == len(frequency_codes) == len(amortizations):
+        raise ValueError("Columns must all be the same length.")
+
+    factors = (rate_table if rate_table is not None else RATE_TABLES.current).factors_by_code
+    payments = array("d", bytes(8 * count))
+    errors = [None] * count
+
+    run = instrumentation.active()
+    with run.stage("price"):
+        for row, (amount, rate_code, frequency_code, amortization) in enumerate(
+                zip(loan_amounts, rate_codes, frequency_codes, amortizations)):
+            factor = factors.get((rate_code, frequency_code, amortization))
+            if factor is not None and amount > 0:
+                payments[row] = round(amount * factor, 2)
+                continue
+            errors[row] = row_error(amount, rate_code, frequency_code)
+            payments[row] = NAN
+    if run.enabled:
+        run.count("loans_priced", errors.count(None))
+        run.count_rejects(error for error in errors if error is not None)
+
+    return payments, errors
+
+
+def group_indexes(loan_amounts, rate_codes, frequency_codes, amortizations) -> array:
+    """
+    Map every loan to the index of its (rate code, frequency code,
+    amortization) group in GROUPS.
+    args:
+        loan_amounts: A sequence of loan amounts.
+        rate_codes: A sequence of MortgageRate codes.
+        frequency_codes: A sequence of MortgageFrequency codes.
+        amortizations: A sequence of amortization periods in years.
+    returns:
+        An array of group indexes, one per loan.
+    raises:
+        ValueError: With the Mortgage message of the first invalid loan.
+    """
+    try:
+        groups = array("B", map(GROUP_INDEX.__getitem__, zip(rate_codes, frequency_codes, amortizations)))
+        if len(loan_amounts) and min(loan_amounts) > 0 and not any(map(math.isnan, loan_amounts)):
+            return groups
+    except KeyError:
+        pass
+    _, errors = calculate_payments(loan_amounts, rate_codes, frequency_codes, amortizations)
+    for error in errors:
+        if error is not None:
+            raise ValueError(error)
+    return array("B")
+
+
+def sum_by_group(loan_amounts, groups) -> list:
+    """
+    Total the loan amounts of each group.
+    args:
+        loan_amounts: A sequence of loan amounts.
+        groups: The group index of each loan, from group_indexes.
+    returns:
+        A list with the total of each group, in GROUPS order.
+    """
+    totals = [0.0] * len(GROUPS)
+    for amount, group in zip(loan_amounts, groups):
+        totals[group] += amount
+    return totals
+
+
+def build_mortgages(loan_amounts, rate_codes, frequency_codes, amortizations) -> list:
+    """
+    Create a Mortgage for every row of validated-once columns. Each column is
+    checked as a whole (its minimum, or its set of distinct values) instead of
+    row by row, and the objects are then built without per-object checks.
+    args:
+        loan_amounts: A sequence of loan amounts.
+        rate_codes: A sequence of MortgageRate codes.
+        frequency_codes: A sequence of MortgageFrequency codes.
+        amortizations: A sequence of amortization periods in years.
+    returns:
+        A list of Mortgage objects in row order.
+    raises:
+        ValueError: When the columns are not all the same length, or with the
+            Mortgage error message of the first invalid row.
+    """
+    count = len(loan_amounts)
+    if not count == len(rate_codes) == len(frequency_codes) == len(amortizations):
+        raise ValueError("Columns must all be the same length.")
+    if count and not (min(loan_amounts) > 0 and not any(map(math.isnan, loan_amounts))
+                      and _RATE_CODE_SET.issuperset(rate_codes)
+                      and _FREQUENCY_CODE_SET.issuperset(frequency_codes)
+                      and _AMORTIZATION_SET.issuperset(amortizations)):
+        # Find the first failing row the slow way to report its message.
+        _, errors = calculate_payments(loan_amounts, rate_codes, frequency_codes, amortizations)
+        raise ValueError(next(error for error in errors if error is not None))
+
+    new = Mortgage.__new__
+    mortgages = []
+    append = mortgages.append
+    run = instrumentation.active()
+    with run.stage("construct"):
+        for amount, rate_code, frequency_code, amortization in zip(
+                loan_amounts, rate_codes, frequency_codes, amortizations):
+            # The body of Mortgage.from_validated, inlined to save a call per row.
+            mortgage = new(Mortgage)
+            mortgage._loan_amount = amount
+            mortgage._rate = RATES_BY_CODE[rate_code]
+            mortgage._frequency = FREQUENCIES_BY_CODE[frequency_code]
+            mortgage._amortization = amortization
+            mortgage._payment = None
+            mortgage._rate_table = None
+            append(mortgage)
+    run.count("mortgages_built", count)
+    return mortgages
+
+
+def _period_rates(rate_table) -> dict:
+    # The rate per payment period for every (rate code, frequency code) pair.
+    return {(rate_code, frequency_code): rate / frequency.value
+            for rate_code, rate in enumerate(rate_table.rates_by_code)
+            for frequency_code, frequency in enumerate(FREQUENCIES_BY_CODE)}
+
+
+def calculate_balances(loan_amounts, rate_codes, frequency_codes, amortizations, period: int,
+                       rate_table=None) -> array:
+    """
+    Calculate the balance of every loan after the same period, in closed form.
+    The results match Mortgage.balance_at.
+    args:
+        loan_amounts: A sequence of loan amounts.
+        rate_codes: A sequence of MortgageRate codes.
+        frequency_codes: A sequence of MortgageFrequency codes.
+        amortizations: A sequence of amortization periods in years.
+        period(int): The number of payments made.
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+    returns:
+        An array of balances, holding NaN for invalid rows and for loans whose
+        amortization has fewer periods than period.
+    raises:
+        ValueError: When the columns are not all the same length.
+    """
+    if rate_table is None:
+        rate_table = RATE_TABLES.current
+    payments, errors = calculate_payments(loan_amounts, rate_codes, frequency_codes, amortizations, rate_table)
+    period_rates = _period_rates(rate_table)
+    balances = array("d", bytes(8 * len(payments)))
+    for row, (amount, rate_code, frequency_code, amortization, payment, error) in enumerate(
+            zip(loan_amounts, rate_codes, frequency_codes, amortizations, payments, errors)):
+        n = amortization * FREQUENCIES_BY_CODE[frequency_code].value if error is None else -1
+        if not 0 <= period <= n:
+            balances[row] = NAN
+        elif period == n:
+            balances[row] = 0.0
+        else:
+            i = period_rates[(rate_code, frequency_code)]
+            growth = (1 + i) ** period
+            balances[row] = amount * growth - payment * (growth - 1) / i
+    return balances
+
+
+def calculate_schedules(loan_amounts, rate_codes, frequency_codes, amortizations, rate_table=None) -> tuple:
+    """
+    Calculate the full amortization schedule of many loans at once. The rows
+    match Mortgage.schedule and are stored loan by loan in flat columns; price a
+    large book in slices, as the row count is the sum of every loan's periods.
+    Invalid rows contribute no schedule rows.
+    args:
+        loan_amounts: A sequence of loan amounts.
+        rate_codes: A sequence of MortgageRate codes.
+        frequency_codes: A sequence of MortgageFrequency codes.
+        amortizations: A sequence of amortization periods in years.
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+    returns:
+        A tuple of arrays (loans, periods, payments, interest, principal,
+        balances), where loans holds the input row of each schedule row.
+    raises:
+        ValueError: When the columns are not all the same length.
+    """
+    if rate_table is None:
+        rate_table = RATE_TABLES.current
+    payments, errors = calculate_payments(loan_amounts, rate_codes, frequency_codes, amortizations, rate_table)
+    period_rates = _period_rates(rate_table)
+    loans, periods = array("Q"), array("H")
+    paid, interest, principal, balances = array("d"), array("d"), array("d"), array("d")
+    for row, (amount, rate_code, frequency_code, amortization, payment, error) in enumerate(
+            zip(loan_amounts, rate_codes, frequency_codes, amortizations, payments, errors)):
+        if error is not None:
+            continue
+        i = period_rates[(rate_code, frequency_code)]
+        n = amortization * FREQUENCIES_BY_CODE[frequency_code].value
+        balance = amount
+        loans.extend([row] * n)
+        periods.extend(range(1, n + 1))
+        for _ in range(n - 1):
+            charge = balance * i
+            balance -= payment - charge
+            paid.append(payment)
+            interest.append(charge)
+            principal.append(payment - charge)
+            balances.append(balance)
+        charge = balance * i
+        paid.append(balance + charge)
+        interest.append(charge)
+        principal.append(balance)
+        balances.append(0.0)
+    return loans, periods, paid, interest, principal, balances
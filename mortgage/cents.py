@@ -0,0 +1,233 @@
+"""
+Description: Exact pricing in integer cents with a fixed rounding rule.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Convert loan amounts with to_cents (or to_cents_column for a whole
+column), then price them with calculate_payments_cents, or one loan with
+price_cents or Mortgage.calculate_payment_cents. calculate_payments_exact is a
+drop-in replacement for batch.calculate_payments that prices in cents and
+returns the payments in dollars, for the report writers; it converts each
+amount on its own, so an amount that cannot be priced in cents is reported in
+its row's error like any other invalid loan.
+Rounding rule:
+    A loan amount is rounded to the cent, half up, from its shortest decimal
+    form (the one repr prints). The annuity factor of each (rate, frequency,
+    amortization) group is calculated once per rate table with Decimal at
+    FACTOR_PRECISION significant digits, from the decimal form of the rate,
+    and kept as an integer scaled by 10 ** FACTOR_DIGITS, rounded half up.
+    A payment is amount_cents * factor / 10 ** FACTOR_DIGITS, rounded half up
+    to the cent with integer arithmetic.
+Every step after the factor tables is integer arithmetic, so scalar, batch
+and worker process results are identical on every machine, and a loan costs
+one multiplication and one division, close to the speed of float pricing.
+"""
+
+import math
+from array import array
+from decimal import Decimal, ROUND_HALF_UP, localcontext
+from functools import lru_cache
+
+from mortgage import instrumentation
+from mortgage.batch import row_error
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION, RATE_TABLES
+
+FACTOR_DIGITS = 24
+FACTOR_PRECISION = 60
+
+_SCALE = 10 ** FACTOR_DIGITS
+_HALF = _SCALE // 2
+_RATE_CODES = {rate: code for code, rate in enumerate(RATES_BY_CODE)}
+_FREQUENCY_CODES = {frequency: code for code, frequency in enumerate(FREQUENCIES_BY_CODE)}
+
+
+@lru_cache(maxsize=16)
+def _factors_for(rates_by_code: tuple) -> dict:
+    # The scaled integer factors of every group for one set of rates. Keyed
+    # on the rates themselves, so equal tables share one entry.
+    factors = {}
+    with localcontext() as context:
+        context.prec = FACTOR_PRECISION
+        context.rounding = ROUND_HALF_UP
+        for rate_code, rate in enumerate(rates_by_code):
+            for frequency_code, frequency in enumerate(FREQUENCIES_BY_CODE):
+                i = Decimal(repr(rate)) / frequency.value
+                for amortization in VALID_AMORTIZATION:
+                    n = amortization * frequency.value
+                    if i:
+                        growth = (1 + i) ** n
+                        factor = i * growth / (growth - 1)
+                    else:
+                        factor = Decimal(1) / n
+                    factors[(rate_code, frequency_code, amortization)] = int(
+                        (factor * _SCALE).to_integral_value(ROUND_HALF_UP))
+    return factors
+
+
+def exact_factors(rate_table=None) -> dict:
+    """
+    The scaled integer annuity factors of a rate table.
+    args:
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+    returns:
+        A dictionary keyed like RateTable.factors_by_code of factors scaled by
+        10 ** FACTOR_DIGITS; it must not be modified.
+    """
+    return _factors_for((rate_table if rate_table is not None else RATE_TABLES.current).rates_by_code)
+
+
+def to_cents(amount) -> int:
+    """
+    Convert a dollar amount to integer cents, rounding half up from its
+    shortest decimal form.
+    args:
+        amount: The amount in dollars, as an int, float or string.
+    returns:
+        The amount in cents as an int.
+    raises:
+        ValueError: When the amount is not a number or is not finite.
+    """
+    if isinstance(amount, float):
+        if not math.isfinite(amount):
+            raise ValueError("Loan amount must be a finite number.")
+        cents = round(amount * 100)
+        # Amounts with at most two decimals need no Decimal arithmetic.
+        if cents / 100 == amount:
+            return cents
+        amount = repr(amount)
+    try:
+        value = Decimal(amount)
+    except (ArithmeticError, TypeError, ValueError):
+        raise ValueError("Loan amount must be a number.")
+    if not value.is_finite():
+        raise ValueError("Loan amount must be a finite number.")
+    try:
+        return int(value.scaleb(2).to_integral_value(ROUND_HALF_UP))
+    except ArithmeticError:
+        raise ValueError("Loan amount is too large.")
+
+
+def to_cents_column(loan_amounts) -> array:
+    """
+    Convert a column of dollar amounts to integer cents.
+    args:
+        loan_amounts: A sequence of amounts in dollars.
+    returns:
+        An array of 64-bit integer cents.
+    raises:
+        ValueError: When an amount is not a finite number or does not fit in
+            64-bit cents.
+    """
+    try:
+        return array("q", map(to_cents, loan_amounts))
+    except OverflowError:
+        raise ValueError("Loan amount is too large.")
+
+
+def format_cents(cents: int) -> str:
+    """
+    Format integer cents as dollars with two decimals.
+    args:
+        cents(int): The amount in cents.
+    returns:
+        The amount as a string, such as "584.59".
+    """
+    sign = "-" if cents < 0 else ""
+    return f"{sign}{abs(cents) // 100}.{abs(cents) % 100:02d}"
+
+
+def price_cents(amount_cents: int, rate, frequency, amortization: int, rate_table=None) -> int:
+    """
+    Price one loan in integer cents.
+    args:
+        amount_cents(int): The loan amount in cents.
+        rate(MortgageRate): The rate.
+        frequency(MortgageFrequency): The payment frequency.
+        amortization(int): The amortization period in years.
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+    returns:
+        The payment in cents as an int.
+    raises:
+        ValueError: When the terms are invalid, with the Mortgage error message.
+    """
+    rate_code = _RATE_CODES.get(rate, -1)
+    frequency_code = _FREQUENCY_CODES.get(frequency, -1)
+    factor = exact_factors(rate_table).get((rate_code, frequency_code, amortization))
+    if factor is None or not amount_cents > 0:
+        raise ValueError(row_error(amount_cents, rate_code, frequency_code))
+    return (amount_cents * factor + _HALF) // _SCALE
+
+
+def _calculate(loan_amounts, convert, rate_codes, frequency_codes, amortizations, rate_table) -> tuple:
+    # Price every row in cents, first converting its positive amount with
+    # convert when one is given, so other amounts keep the Mortgage message.
+    # A row that cannot be converted, or whose payment does not fit in 64-bit
+    # cents, gets an error instead of stopping the batch.
+    count = len(loan_amounts)
+    if not count == len(rate_codes) == len(frequency_codes) == len(amortizations):
+        raise ValueError("Columns must all be the same length.")
+
+    factors = exact_factors(rate_table)
+    payments = array("q", bytes(8 * count))
+    errors = [None] * count
+
+    run = instrumentation.active()
+    with run.stage("price"):
+        for row, (amount, rate_code, frequency_code, amortization) in enumerate(
+                zip(loan_amounts, rate_codes, frequency_codes, amortizations)):
+            try:
+                if convert is not None and amount > 0:
+                    amount = convert(amount)
+                factor = factors.get((rate_code, frequency_code, amortization))
+                if factor is not None and amount > 0:
+                    payments[row] = (amount * factor + _HALF) // _SCALE
+                else:
+                    errors[row] = row_error(amount, rate_code, frequency_code)
+            except ValueError as error:
+                errors[row] = str(error)
+            except OverflowError:
+                errors[row] = "Loan amount is too large."
+    if run.enabled:
+        run.count("loans_priced", errors.count(None))
+        run.count_rejects(error for error in errors if error is not None)
+
+    return payments, errors
+
+
+def calculate_payments_cents(amount_cents, rate_codes, frequency_codes, amortizations, rate_table=None) -> tuple:
+    """
+    Calculate the payment in cents for every row of a mortgage book.
+    Invalid rows do not stop the batch: they are reported in the error list.
+    args:
+        amount_cents: A sequence of loan amounts in integer cents.
+        rate_codes: A sequence of MortgageRate codes.
+        frequency_codes: A sequence of MortgageFrequency codes.
+        amortizations: A sequence of amortization periods in years.
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+    returns:
+        A tuple (payments, errors). payments is an array of 64-bit integer
+        cents holding 0 for invalid rows. errors is a list holding None for
+        valid rows and the Mortgage ValueError message for invalid rows, or
+        "Loan amount is too large." when the payment does not fit in 64 bits.
+    raises:
+        ValueError: When the columns are not all the same length.
+    """
+    return _calculate(amount_cents, None, rate_codes, frequency_codes, amortizations, rate_table)
+
+
+def calculate_payments_exact(loan_amounts, rate_codes, frequency_codes, amortizations, rate_table=None) -> tuple:
+    """
+    Price dollar amounts in exact cents, with the interface of
+    batch.calculate_payments. Each amount is converted with to_cents on its
+    own row, and a conversion failure becomes that row's error.
+    args:
+        The same as batch.calculate_payments.
+    returns:
+        A tuple (payments, errors) like batch.calculate_payments, with every
+        payment being its exact cents divided by 100.
+    raises:
+        ValueError: When the columns are not all the same length.
+    """
+    payments, errors = _calculate(loan_amounts, to_cents, rate_codes, frequency_codes, amortizations,
+                                  rate_table)
+    return array("d", (payment / 100 if error is None else float("nan")
+                       for payment, error in zip(payments, errors))), errors
@@ -0,0 +1,277 @@
+"""
+Description: The command line entry point for pricing PiXELL River mortgages.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python main.py price AMOUNT RATE AMORTIZATION FREQUENCY
+       python main.py [report] [path] [--workers N] [--format text|csv|jsonl] [--output FILE]
+                      [--rates FILE] [--stats FILE] [--trace-memory] [--profile FILE]
+       python main.py reconcile [path] [--tolerance AMOUNT]
+       python main.py scenarios PATH [--low -300] [--high 300] [--step 25] [--workers N]
+       python main.py simulate PATH [--paths 1000] [--seed 0] [--workers N]
+       python main.py bench [--rows N] [--baseline FILE]
+Every mode imports only the modules it uses, when it runs. The price mode
+prices one loan, printing its payment, and imports nothing but
+mortgage.mortgage and mortgage.pixell_lookup when called with exactly its four
+arguments; argparse is only loaded for options, help and the other modes.
+--exact prices in integer cents with mortgage.cents instead of floats.
+The report mode keeps the original client's interface, including --reconcile.
+"""
+
+import os
+import sys
+
+DATA_FILE = os.path.join("data", "pixell_river_mortgages.txt")
+COMMANDS = ("price", "report", "reconcile", "scenarios", "simulate", "bench")
+
+
+def price(amount: str, rate: str, amortization: str, frequency: str, exact: bool = False) -> float:
+    """
+    Price one loan given as the fields of a mortgage file line.
+    args:
+        amount(str): The loan amount.
+        rate(str): The MortgageRate name.
+        amortization(str): The amortization period in years.
+        frequency(str): The MortgageFrequency name.
+        exact(bool): Price in exact integer cents with Mortgage.calculate_payment_cents.
+    returns:
+        The payment as a float.
+    raises:
+        ValueError: When a field is invalid, with the Mortgage error message
+            (or the float conversion message for an amount that is not a number).
+    """
+    from mortgage.mortgage import Mortgage
+    from mortgage.pixell_lookup import MortgageRate, MortgageFrequency
+    # Unknown names and periods are passed through for Mortgage to reject.
+    rate = MortgageRate.__members__.get(rate.strip(), rate)
+    frequency = MortgageFrequency.__members__.get(frequency.strip(), frequency)
+    amortization = int(amortization) if amortization.strip().isdigit() else amortization
+    mortgage = Mortgage(float(amount), rate, frequency, amortization)
+    if exact:
+        return mortgage.calculate_payment_cents() / 100
+    return mortgage.calculate_payment()
+
+
+def _price_command(fields: list, exact: bool = False) -> int:
+    # Print the payment of one loan, or its error on stderr.
+    try:
+        payment = price(*fields, exact=exact)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{payment:.2f}")
+    return 0
+
+
+def write_chunks(writer, chunks, exact: bool = False):
+    """
+    Price each chunk as a batch and add it to the report, rendering it with
+    the rate table snapshot that priced it.
+    args:
+        writer(ReportWriter): The report being written.
+        chunks: An iterable of MortgageChunk objects.
+        exact(bool): Price in exact integer cents with cents.calculate_payments_exact.
+    """
+    from mortgage.pixell_lookup import RATE_TABLES
+    if exact:
+        from mortgage.cents import calculate_payments_exact as calculate
+    else:
+        from mortgage.batch import calculate_payments as calculate
+    for chunk in chunks:
+        rate_table = RATE_TABLES.current
+        payments, errors = calculate(chunk.amounts, chunk.rate_codes,
+                                     chunk.frequency_codes, chunk.amortizations, rate_table)
+        writer.write_chunk(chunk, payments, errors, rate_table)
+
+
+def report(path: str = DATA_FILE, workers: int = 1, format: str = "text", output=None,
+           exact: bool = False):
+    """
+    Price every mortgage in the file and write the report.
+    args:
+        path(str): The path of the mortgage file.
+        workers(int): The number of worker processes.
+        format(str): The report format: text, csv or jsonl.
+        output: The text stream to write the report to, sys.stdout when None.
+        exact(bool): Price in exact integer cents with cents.calculate_payments_exact.
+    raises:
+        ValueError: When the worker count is not positive.
+    """
+    from mortgage.columnar import ColumnarBook, is_columnar
+    from mortgage.reader import parse_lines
+    from mortgage.report import ReportWriter
+    if workers <= 0:
+        raise ValueError("Worker count must be positive.")
+    with ReportWriter(output or sys.stdout, format) as writer:
+        try:
+            if is_columnar(path):
+                with ColumnarBook(path) as book:
+                    writer.write_preamble()
+                    write_chunks(writer, book.chunks(), exact)
+            elif workers > 1:
+                from mortgage.parallel import price_file
+                pieces = price_file(path, workers, format=format, exact=exact)
+                writer.write_preamble()
+                for text in pieces:
+                    writer.write(text)
+            else:
+                with open(path, "r") as input:
+                    writer.write_preamble()
+                    write_chunks(writer, parse_lines(input), exact)
+        except FileNotFoundError as e:
+            writer.flush()
+            print(f"File not found: {e}")
+
+
+def reconcile_file(path: str = DATA_FILE, tolerance: float = None) -> bool:
+    """
+    Reconcile the expected payments in the file and print the report.
+    args:
+        path(str): The path of the mortgage file.
+        tolerance(float): The largest difference counted as a match,
+            reconcile.DEFAULT_TOLERANCE when None.
+    returns:
+        True when every row reconciled.
+    """
+    from mortgage.columnar import ColumnarBook, is_columnar
+    from mortgage.reader import parse_lines
+    from mortgage.reconcile import DEFAULT_TOLERANCE, reconcile_chunks
+    if tolerance is None:
+        tolerance = DEFAULT_TOLERANCE
+    try:
+        if is_columnar(path):
+            with ColumnarBook(path) as book:
+                report = reconcile_chunks(book.chunks(), tolerance)
+        else:
+            with open(path, "r") as input:
+                report = reconcile_chunks(parse_lines(input), tolerance)
+    except FileNotFoundError as e:
+        print(f"File not found: {e}")
+        return False
+    print(report)
+    return report.is_clean()
+
+
+def positive_int(value: str) -> int:
+    """
+    An argparse type for counts that must be at least one.
+    args:
+        value(str): The command line value.
+    returns:
+        The count as an int.
+    raises:
+        ArgumentTypeError: When the value is not a positive integer.
+    """
+    import argparse
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value!r}")
+    return count
+
+
+def _load_rates(path: str) -> bool:
+    # Publish a rate file, printing why it cannot be loaded on stderr.
+    from mortgage.pixell_lookup import RATE_TABLES
+    try:
+        RATE_TABLES.load(path)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return False
+    return True
+
+
+def _report_command(argv: list, reconcile: bool = False) -> int:
+    # Write a report (or reconcile) with the original client's options.
+    import argparse
+    from mortgage import instrumentation
+
+    parser = argparse.ArgumentParser(prog="main.py reconcile" if reconcile else "main.py",
+                                     description="Calculate payments for PiXELL River Mortgages.")
+    parser.add_argument("path", nargs="?", default=DATA_FILE, help="the mortgage file to price")
+    parser.add_argument("--workers", type=positive_int, default=1, help="the number of worker processes")
+    parser.add_argument("--format", choices=["text", "csv", "jsonl"], default="text",
+                        help="the report format")
+    parser.add_argument("--output", help="the file to write the report to (default: stdout)")
+    parser.add_argument("--reconcile", action="store_true", default=reconcile,
+                        help="check the expected payments instead of writing a report")
+    parser.add_argument("--tolerance", type=float, help="the largest payment difference counted as a match")
+    parser.add_argument("--rates", help="the rate file to price with (default: built-in rates)")
+    parser.add_argument("--stats", help="the JSON file to save stage times and counters to")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="add the peak traced memory to the --stats summary")
+    parser.add_argument("--profile", help="the file to save cProfile statistics to")
+    parser.add_argument("--exact", action="store_true", help="price in exact integer cents")
+    args = parser.parse_args(argv)
+    if args.rates and not _load_rates(args.rates):
+        return 1
+    if args.stats or args.profile:
+        instrumentation.enable(profile=bool(args.profile), trace_memory=args.trace_memory)
+    clean = True
+    try:
+        if args.reconcile:
+            clean = reconcile_file(args.path, args.tolerance)
+        elif args.output:
+            with open(args.output, "w") as output:
+                report(args.path, args.workers, args.format, output, args.exact)
+        else:
+            report(args.path, args.workers, args.format, exact=args.exact)
+    finally:
+        run = instrumentation.disable()
+        if run is not None and args.stats:
+            run.write_summary(args.stats)
+        if run is not None and args.profile:
+            run.write_profile(args.profile)
+    return 0 if clean else 1
+
+
+def _parsed_price_command(argv: list) -> int:
+    # The price mode with argparse, for --help, --rates and --exact.
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py price", description="Price one mortgage.")
+    parser.add_argument("amount", help="the loan amount")
+    parser.add_argument("rate", help="the MortgageRate name, such as FIXED_5")
+    parser.add_argument("amortization", help="the amortization period in years")
+    parser.add_argument("frequency", help="the MortgageFrequency name, such as MONTHLY")
+    parser.add_argument("--rates", help="the rate file to price with (default: built-in rates)")
+    parser.add_argument("--exact", action="store_true", help="price in exact integer cents")
+    args = parser.parse_args(argv)
+    if args.rates and not _load_rates(args.rates):
+        return 1
+    return _price_command([args.amount, args.rate, args.amortization, args.frequency], args.exact)
+
+
+def main(argv: list = None) -> int:
+    """
+    Run the command line client.
+    args:
+        argv(list): The command line arguments, sys.argv[1:] when None.
+    returns:
+        The exit status.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    command = argv[0] if argv and argv[0] in COMMANDS else "report"
+    arguments = argv[1:] if argv and argv[0] in COMMANDS else argv
+    if command == "price":
+        if len(arguments) == 4 and not any(argument.startswith("--") for argument in arguments):
+            return _price_command(arguments)
+        return _parsed_price_command(arguments)
+    if command == "reconcile":
+        return _report_command(arguments, reconcile=True)
+    if command == "scenarios":
+        from mortgage.scenarios import main as scenarios_main
+        return scenarios_main(arguments)
+    if command == "simulate":
+        from mortgage.simulation import main as simulation_main
+        return simulation_main(arguments)
+    if command == "bench":
+        from benchmarks.suite import main as bench_main
+        return bench_main(arguments)
+    return _report_command(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
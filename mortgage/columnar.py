@@ -0,0 +1,255 @@
+"""
+Description: A binary columnar file format for mortgage books, read through
+memory-mapped, zero-copy views.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Convert a text mortgage file once with convert(text_path, book_path)
+(or python -m mortgage.columnar TEXT BOOK), then open it with ColumnarBook.
+The book's columns are memoryviews over the mapped file that can be passed
+straight to the batch engine, and book.chunks() yields MortgageChunk objects
+for the report writer.
+
+File layout (little-endian):
+    header      64 bytes: magic, format version, row count, rejected count,
+                offset of the rejected section, offset of the malformed section
+    line_numbers  uint64 per row
+    amounts       float64 per row
+    expected      float64 per row (NaN for EXCEPTION or a malformed value)
+    rate_codes    uint8 per row
+    amortizations uint8 per row
+    frequency_codes uint8 per row
+    rejected    one JSON array [line_number, data, message] per line
+    malformed   one JSON array [line_number, text] per expected payment that
+                is neither a number nor EXCEPTION
+"""
+
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+from mortgage.reader import DEFAULT_CHUNK_SIZE, MortgageChunk, read_chunks
+
+MAGIC = b"PXMBOOK\0"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIxxxxQQQQ")
+HEADER_SIZE = 64
+
+# (attribute, array typecode) in file order: 8-byte columns first so that
+# every column starts on an aligned offset.
+COLUMNS = (
+    ("line_numbers", "Q"),
+    ("amounts", "d"),
+    ("expected", "d"),
+    ("rate_codes", "B"),
+    ("amortizations", "B"),
+    ("frequency_codes", "B"),
+)
+_ITEM_SIZES = {"Q": 8, "d": 8, "B": 1}
+
+
+def is_columnar(path: str) -> bool:
+    """
+    Check whether a file is a columnar mortgage book.
+    args:
+        path(str): The path of the file.
+    returns:
+        True when the file starts with the columnar magic bytes.
+    raises:
+        FileNotFoundError: When the file does not exist.
+    """
+    with open(path, "rb") as input:
+        return input.read(len(MAGIC)) == MAGIC
+
+
+def convert(text_path: str, book_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple:
+    """
+    Convert a text mortgage file to a columnar book in one streaming pass.
+    Each column is spooled to its own temporary file, so memory use is bounded
+    by the chunk size.
+    args:
+        text_path(str): The path of the text mortgage file.
+        book_path(str): The path of the book to write.
+        chunk_size(int): The number of lines parsed at a time.
+    returns:
+        A tuple (rows, rejected) with the number of valid and rejected rows.
+    raises:
+        ValueError: When the machine is not little-endian.
+        FileNotFoundError: When the text file does not exist.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Columnar books can only be written on little-endian machines.")
+    directory = os.path.dirname(os.path.abspath(book_path))
+    spools = {name: tempfile.TemporaryFile(dir=directory) for name, _ in COLUMNS}
+    rejected_spool = tempfile.TemporaryFile(dir=directory)
+    malformed_spool = tempfile.TemporaryFile(dir=directory)
+    sections = list(spools.values()) + [rejected_spool, malformed_spool]
+    rows = 0
+    rejected = 0
+    try:
+        for chunk in read_chunks(text_path, chunk_size):
+            for name, _ in COLUMNS:
+                getattr(chunk, name).tofile(spools[name])
+            for record in chunk.rejected:
+                rejected_spool.write(json.dumps(record).encode() + b"\n")
+            for record in chunk.malformed_expected.items():
+                malformed_spool.write(json.dumps(record).encode() + b"\n")
+            rows += len(chunk.line_numbers)
+            rejected += len(chunk.rejected)
+        rejected_offset = HEADER_SIZE + sum(_ITEM_SIZES[code] for _, code in COLUMNS) * rows
+        malformed_offset = rejected_offset + rejected_spool.tell()
+        with open(book_path, "wb") as output:
+            header = _HEADER.pack(MAGIC, FORMAT_VERSION, rows, rejected, rejected_offset, malformed_offset)
+            output.write(header.ljust(HEADER_SIZE, b"\0"))
+            for spool in sections:
+                spool.seek(0)
+                shutil.copyfileobj(spool, output)
+    finally:
+        for spool in sections:
+            spool.close()
+    return rows, rejected
+
+
+class ColumnarBook:
+    """
+    A columnar mortgage book opened with mmap. Each column attribute is a
+    read-only memoryview over the mapped file, typed like the matching
+    MortgageChunk column; nothing is copied or parsed when the book is opened.
+    """
+    def __init__(self, path: str):
+        """
+        Open a columnar book.
+        args:
+            path(str): The path of the book.
+        raises:
+            FileNotFoundError: When the file does not exist.
+            ValueError: When the file is not a columnar book of a supported version,
+                or the machine is not little-endian.
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Columnar books can only be read on little-endian machines.")
+        with open(path, "rb") as input:
+            if os.fstat(input.fileno()).st_size < HEADER_SIZE:
+                raise ValueError("File is not a columnar mortgage book.")
+            self._map = mmap.mmap(input.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rows, rejected, rejected_offset, malformed_offset = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError("File is not a columnar mortgage book.")
+        if version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError("Columnar book version is not supported.")
+        self._rows = rows
+        self._rejected_offset = rejected_offset
+        self._malformed_offset = malformed_offset
+        self._rejected = None
+        self._malformed = None
+        self._views = []
+        offset = HEADER_SIZE
+        whole = memoryview(self._map)
+        self._views.append(whole)
+        for name, code in COLUMNS:
+            end = offset + _ITEM_SIZES[code] * rows
+            view = whole[offset:end].cast(code)
+            self._views.append(view)
+            setattr(self, name, view)
+            offset = end
+
+    def __len__(self) -> int:
+        """
+        The number of valid rows in the book.
+        returns:
+            The row count as an int.
+        """
+        return self._rows
+
+    def __enter__(self) -> "ColumnarBook":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def rejected(self) -> list:
+        """
+        The rows rejected when the book was converted, read on first use.
+        returns:
+            A list of (line_number, data, message) tuples in line order.
+        """
+        if self._rejected is None:
+            self._rejected = [tuple(json.loads(line)) for line in
+                              self._map[self._rejected_offset:self._malformed_offset].splitlines()]
+        return self._rejected
+
+    @property
+    def malformed_expected(self) -> list:
+        """
+        The expected payments that were neither a number nor EXCEPTION when
+        the book was converted, read on first use.
+        returns:
+            A list of (line_number, text) tuples in line order.
+        """
+        if self._malformed is None:
+            self._malformed = [tuple(json.loads(line))
+                               for line in self._map[self._malformed_offset:].splitlines()]
+        return self._malformed
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Split the book into MortgageChunk objects whose columns are zero-copy
+        slices of the mapped columns. Rejected rows are placed in the chunk that
+        covers their line number, so chunks come out in original line order.
+        args:
+            chunk_size(int): The number of valid rows in each chunk.
+        returns:
+            A generator of MortgageChunk objects.
+        raises:
+            ValueError: When the chunk size is not positive.
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive.")
+        rejected = self.rejected
+        malformed = self.malformed_expected
+        position = 0
+        malformed_position = 0
+        for start in range(0, max(self._rows, 1), chunk_size):
+            end = min(start + chunk_size, self._rows)
+            chunk = MortgageChunk()
+            for name, _ in COLUMNS:
+                setattr(chunk, name, getattr(self, name)[start:end])
+            # Rejected rows before the next chunk's first line belong here.
+            limit = self.line_numbers[end] if end < self._rows else float("inf")
+            first = position
+            while position < len(rejected) and rejected[position][0] < limit:
+                position += 1
+            chunk.rejected = rejected[first:position]
+            first = malformed_position
+            while malformed_position < len(malformed) and malformed[malformed_position][0] < limit:
+                malformed_position += 1
+            chunk.malformed_expected = dict(malformed[first:malformed_position])
+            yield chunk
+
+    def close(self):
+        """
+        Release the column views and unmap the file. Chunks handed out by
+        chunks() must no longer be referenced.
+        returns:
+            None
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a text mortgage file to a columnar book.")
+    parser.add_argument("text_path", help="the text mortgage file")
+    parser.add_argument("book_path", help="the columnar book to write")
+    args = parser.parse_args()
+    rows, rejected = convert(args.text_path, args.book_path)
+    print(f"Wrote {rows:,} rows ({rejected:,} rejected) to {args.book_path}")
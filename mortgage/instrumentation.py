@@ -0,0 +1,310 @@
+"""
+Description: Stage timers, counters and optional profiling for the mortgage
+pipeline.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Call enable() before a run and disable() after it, then save
+summary() (or call write_summary) to keep a JSON record of the run. The
+reader, batch engine and report writer report to active(), which is a no-op
+object while instrumentation is disabled, so the hooks cost one method call
+per chunk. Hooks run per chunk rather than per loan; for a per-function
+breakdown of the hot paths turn on cProfile with enable(profile=True).
+Work done in worker processes is measured there and added to the parent's
+run with merge(measurements()); stage seconds are then summed over workers.
+Stages:
+    parse: turning input lines into chunks.
+    construct: building Mortgage objects in bulk.
+    price: calculating payments with the batch engine.
+    render: turning priced chunks into report text.
+    flush: writing report text to the output stream.
+Counters:
+    rows_parsed, rows_rejected, loans_priced, mortgages_built, characters_written.
+"""
+
+import time
+from collections import Counter
+
+# cProfile, tracemalloc, json and datetime are imported when a run needs them,
+# so importing the hooks costs next to nothing.
+
+
+class _Stage:
+    # Adds the time spent inside a with block to one stage.
+    __slots__ = ("_totals", "_name", "_start")
+
+    def __init__(self, totals: dict, name: str):
+        self._totals = totals
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        totals = self._totals.setdefault(self._name, [0.0, 0])
+        totals[0] += time.perf_counter() - self._start
+        totals[1] += 1
+
+
+class _NullStage:
+    # A with block that does nothing.
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class DisabledInstrumentation:
+    """
+    The instrumentation used while measuring is turned off: every hook does nothing.
+    """
+    enabled = False
+
+    def stage(self, name: str):
+        return _NULL_STAGE
+
+    def timed(self, name: str, iterable):
+        return iterable
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def count_rejects(self, messages):
+        pass
+
+
+class Instrumentation:
+    """
+    Collects the time spent in each stage, the run's counters and the number
+    of rejected rows per error message.
+    attributes:
+        stages: A dictionary of stage name to [seconds, calls].
+        counters: A Counter of counter name to count.
+        rejected: A Counter of error message to the number of rows rejected with it.
+    """
+    enabled = True
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        """
+        Initialize an instrumentation run.
+        args:
+            profile(bool): Whether to run cProfile during the run.
+            trace_memory(bool): Whether to trace the peak memory of the run.
+        """
+        self.stages = {}
+        self.counters = Counter()
+        self.rejected = Counter()
+        if profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+        else:
+            self._profiler = None
+        self._trace_memory = trace_memory
+        self._peak_bytes = None
+        self._started = None
+        self._start = None
+        self._seconds = None
+
+    def start(self):
+        """
+        Start the run clock and any profiler or memory tracing.
+        returns:
+            None
+        """
+        from datetime import datetime, timezone
+        self._started = datetime.now(timezone.utc)
+        if self._trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self._profiler is not None:
+            self._profiler.enable()
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """
+        Stop the run clock and any profiler or memory tracing.
+        returns:
+            None
+        """
+        self._seconds = time.perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._trace_memory:
+            import tracemalloc
+            self._peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def stage(self, name: str) -> _Stage:
+        """
+        Time a with block as part of a stage.
+        args:
+            name(str): The stage name.
+        returns:
+            A context manager.
+        """
+        return _Stage(self.stages, name)
+
+    def timed(self, name: str, iterable):
+        """
+        Time how long an iterable takes to produce each item, such as a
+        generator of parsed chunks, as part of a stage. Each item counts as
+        one call; the time spent finding the end is added without a call.
+        args:
+            name(str): The stage name.
+            iterable: The iterable to time.
+        returns:
+            A generator of the same items.
+        """
+        iterator = iter(iterable)
+        totals = self.stages.setdefault(name, [0.0, 0])
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                totals[0] += time.perf_counter() - start
+                return
+            totals[0] += time.perf_counter() - start
+            totals[1] += 1
+            yield item
+
+    def count(self, name: str, amount: int = 1):
+        """
+        Add to a counter.
+        args:
+            name(str): The counter name.
+            amount(int): The amount to add.
+        returns:
+            None
+        """
+        self.counters[name] += amount
+
+    def count_rejects(self, messages):
+        """
+        Count rejected rows by their error message.
+        args:
+            messages: An iterable of error messages, one per rejected row.
+        returns:
+            None
+        """
+        messages = list(messages)
+        self.rejected.update(messages)
+        self.counters["rows_rejected"] += len(messages)
+
+    def measurements(self) -> dict:
+        """
+        The stage times and counters of the run, in a form that can be sent
+        between processes and passed to merge.
+        returns:
+            A dictionary with stages, counters and rejected.
+        """
+        return {"stages": {name: tuple(totals) for name, totals in self.stages.items()},
+                "counters": dict(self.counters),
+                "rejected": dict(self.rejected)}
+
+    def merge(self, measurements: dict):
+        """
+        Add the measurements of another run, such as one in a worker process.
+        args:
+            measurements(dict): The result of another run's measurements().
+        returns:
+            None
+        """
+        for name, (seconds, calls) in measurements["stages"].items():
+            totals = self.stages.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += calls
+        self.counters.update(measurements["counters"])
+        self.rejected.update(measurements["rejected"])
+
+    def summary(self) -> dict:
+        """
+        The machine-readable record of the run.
+        returns:
+            A dictionary that can be saved as JSON.
+        """
+        import platform
+        return {"started": self._started.isoformat() if self._started else None,
+                "seconds": self._seconds,
+                "python": platform.python_version(),
+                "stages": {name: {"seconds": seconds, "calls": calls}
+                           for name, (seconds, calls) in self.stages.items()},
+                "counters": dict(self.counters),
+                "rejected": dict(self.rejected.most_common()),
+                "peak_bytes": self._peak_bytes}
+
+    def write_summary(self, path: str):
+        """
+        Save the summary as JSON.
+        args:
+            path(str): The path of the JSON file.
+        returns:
+            None
+        """
+        import json
+        with open(path, "w") as output:
+            json.dump(self.summary(), output, indent=2)
+
+    def write_profile(self, path: str):
+        """
+        Save the cProfile statistics for pstats or a profile viewer.
+        args:
+            path(str): The path of the statistics file.
+        returns:
+            None
+        raises:
+            ValueError: When the run was not profiled.
+        """
+        if self._profiler is None:
+            raise ValueError("Profiling was not enabled.")
+        self._profiler.dump_stats(path)
+
+
+_DISABLED = DisabledInstrumentation()
+_active = _DISABLED
+
+
+def active():
+    """
+    The instrumentation hooks should report to.
+    returns:
+        The running Instrumentation, or a DisabledInstrumentation.
+    """
+    return _active
+
+
+def enable(profile: bool = False, trace_memory: bool = False) -> Instrumentation:
+    """
+    Start an instrumentation run, replacing any run already in progress.
+    args:
+        profile(bool): Whether to run cProfile during the run.
+        trace_memory(bool): Whether to trace the peak memory of the run.
+    returns:
+        The running Instrumentation.
+    """
+    global _active
+    if _active.enabled:
+        disable()
+    _active = Instrumentation(profile, trace_memory)
+    _active.start()
+    return _active
+
+
+def disable():
+    """
+    Stop the instrumentation run in progress.
+    returns:
+        The Instrumentation that was running, or None when none was.
+    """
+    global _active
+    if not _active.enabled:
+        return None
+    run = _active
+    _active = _DISABLED
+    run.stop()
+    return run
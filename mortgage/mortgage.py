@@ -6,10 +6,48 @@ Usage: Create an instance of the Mortgage class to manage mortgage records and
 calculate payments.
 """
 
-from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, VALID_AMORTIZATION
+from collections import namedtuple
+from functools import lru_cache
+
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, VALID_AMORTIZATION, RATE_TABLES
+
+# The number of distinct loan terms kept in the process-wide payment cache.
+PAYMENT_CACHE_SIZE = 65536
+
+# One row of an amortization schedule.
+SchedulePeriod = namedtuple("SchedulePeriod", ["period", "payment", "interest", "principal", "balance"])
+
+
+@lru_cache(maxsize=PAYMENT_CACHE_SIZE)
+def _cached_payment(loan_amount: float, factor: float) -> float:
+    # Payments shared by every Mortgage with the same terms. Keying on the
+    # factor keeps entries from different rate table versions apart.
+    return round(loan_amount * factor, 2)
+
+
+def payment_cache_info():
+    """
+    The statistics of the process-wide payment cache.
+    returns:
+        A named tuple (hits, misses, maxsize, currsize).
+    """
+    return _cached_payment.cache_info()
+
+
+def clear_payment_cache():
+    """
+    Empty the process-wide payment cache and reset its statistics.
+    returns:
+        None
+    """
+    _cached_payment.cache_clear()
+
 
 class Mortgage:
    # A class used to manage mortgage options.
+   # __slots__ keeps each instance free of a per-instance __dict__.
+    __slots__ = ("_loan_amount", "_rate", "_frequency", "_amortization", "_payment", "_rate_table")
+
     def __init__(self, loan_amount: float, rate: MortgageRate, frequency: MortgageFrequency, Amortization: int):
         """
         Initialize a new mortgage object with a loan amount, rate, frequency and amortization.
@@ -41,6 +79,33 @@ class Mortgage:
             self._amortization = Amortization
         else:
             raise ValueError("Amortization provided is invalid.")
+        self._payment = None
+        self._rate_table = None
+
+    # Build a mortgage from terms that are already known to be valid.
+    @classmethod
+    def from_validated(cls, loan_amount: float, rate: MortgageRate, frequency: MortgageFrequency,
+                       amortization: int) -> "Mortgage":
+        """
+        Create a mortgage without validating its terms, for loaders that have
+        already validated them (see batch.build_mortgages for whole columns).
+        Invalid terms are not detected and give wrong results later.
+        args:
+            loan_amount(float): A positive loan amount.
+            rate(MortgageRate): The rate.
+            frequency(MortgageFrequency): The payment frequency.
+            amortization(int): A period from VALID_AMORTIZATION.
+        returns:
+            A new Mortgage.
+        """
+        mortgage = cls.__new__(cls)
+        mortgage._loan_amount = loan_amount
+        mortgage._rate = rate
+        mortgage._frequency = frequency
+        mortgage._amortization = amortization
+        mortgage._payment = None
+        mortgage._rate_table = None
+        return mortgage
         
      # Accessors for Loan Amount
     @property
@@ -66,6 +131,7 @@ class Mortgage:
         """
         if amount > 0:
             self._loan_amount = amount
+            self._payment = None
         else:
             raise ValueError("Loan amount must be positive.")
     
@@ -92,6 +158,7 @@ class Mortgage:
         """
         if  isinstance(value, MortgageRate):
             self._rate = value
+            self._payment = None
         else:
             raise ValueError("Rate provided is invalid.")
         
@@ -119,6 +186,7 @@ class Mortgage:
         """  
         if isinstance(value, MortgageFrequency):
             self._frequency = value
+            self._payment = None
         else:
             raise ValueError("Frequency provided is invalid.")
     
@@ -146,23 +214,93 @@ class Mortgage:
         """
         if value in VALID_AMORTIZATION:
             self._amortization = value
+            self._payment = None
         else:
             raise ValueError("Amortization provided is invalid.")
         
+    #Accessors for Rate Version
+    @property
+    def rate_version(self) -> int:
+        """
+        The version of the rate table that priced the latest payment.
+        returns:
+            The version as an int, or None before the first payment.
+        """
+        return self._rate_table.version if self._rate_table is not None else None
+
     # Calculate the mortgage payment.
     def calculate_payment(self) -> float:
         """
-        Calculate the mortgage payment.
+        Calculate the mortgage payment with the current rate table.
+        The payment is cached on the instance until a mutator changes the terms
+        or a new rate table version is published.
         returns:
             The mortgage payment as a float.
         """
-        i = self._rate.value / self._frequency.value
+        payment = self._payment
+        table = RATE_TABLES.current
+        if payment is None or table is not self._rate_table:
+            factor = table.factors[(self._rate, self._frequency, self._amortization)]
+            payment = self._payment = _cached_payment(self._loan_amount, factor)
+            self._rate_table = table
+        return payment
+
+    def calculate_payment_cents(self) -> int:
+        """
+        Calculate the mortgage payment exactly, in integer cents, with the
+        current rate table and the rounding rule of mortgage.cents.
+        returns:
+            The mortgage payment in cents as an int.
+        """
+        from mortgage.cents import price_cents, to_cents
+        return price_cents(to_cents(self._loan_amount), self._rate, self._frequency, self._amortization)
+
+    # Generate the amortization schedule.
+    def schedule(self):
+        """
+        Generate the amortization schedule lazily, one period at a time, so
+        memory use does not depend on the number of periods. Every period pays
+        calculate_payment() except the last, which clears the remaining balance.
+        Interest and principal are not rounded.
+        returns:
+            A generator of SchedulePeriod tuples (period, payment, interest,
+            principal, balance), where balance is the balance after the payment.
+        """
+        payment = self.calculate_payment()
+        i = self._rate_table.rates[self._rate] / self._frequency.value
         n = self._amortization * self._frequency.value
-        loan_amount = self._loan_amount
+        balance = self._loan_amount
+        for period in range(1, n + 1):
+            interest = balance * i
+            if period == n:
+                payment = balance + interest
+                yield SchedulePeriod(period, payment, interest, balance, 0.0)
+            else:
+                principal = payment - interest
+                balance -= principal
+                yield SchedulePeriod(period, payment, interest, principal, balance)
 
-        payment = loan_amount * (i * (1 + i) ** n) / ((1 + i) ** n - 1)
-        payment = round(payment, 2)
-        return payment
+    # Calculate the balance after a period.
+    def balance_at(self, period: int) -> float:
+        """
+        Calculate the balance after a given period in closed form, without
+        generating the earlier periods of the schedule.
+        args:
+            period(int): The number of payments made, from 0 to the last period.
+        returns:
+            The remaining balance as a float.
+        raises:
+            ValueError: When the period is outside the amortization.
+        """
+        n = self._amortization * self._frequency.value
+        if not 0 <= period <= n:
+            raise ValueError("Period provided is invalid.")
+        if period == n:
+            return 0.0
+        payment = self.calculate_payment()
+        i = self._rate_table.rates[self._rate] / self._frequency.value
+        growth = (1 + i) ** period
+        return self._loan_amount * growth - payment * (growth - 1) / i
     
     # __str__ representation for mortgage payments.
     def __str__(self) -> str:
@@ -171,10 +309,11 @@ class Mortgage:
         returns:
             The mortgage amount, Rate, Amorization and frequency  as a string.
         """
+        payment = self.calculate_payment()
         return (f"Mortage Amount: ${self._loan_amount:,.2f}"
-                + f"\nRate: {self._rate.value:.2%}"
+                + f"\nRate: {self._rate_table.rates[self._rate]:.2%}"
                 + f"\nAmortization: {self._amortization}"
-                + f"\nFrequency: {self._frequency.name} -- Calculated Payment: ${self.calculate_payment():,.2f}")
+                + f"\nFrequency: {self._frequency.name} -- Calculated Payment: ${payment:,.2f}")
     
     # __repr__ representation for mortgage payments.
     def __repr__(self) -> str:
@@ -183,7 +322,8 @@ class Mortgage:
         returns:
             The mortgage as a string.
         """
-        return (f"{self._loan_amount:,.2f},{self._rate.value},{self._amortization},{self._frequency.value}")
+        table = self._rate_table if self._rate_table is not None else RATE_TABLES.current
+        return (f"{self._loan_amount:,.2f},{table.rates[self._rate]},{self._amortization},{self._frequency.value}")
     
 
 
@@ -0,0 +1,178 @@
+"""
+Description: Prices a mortgage file on several cores by splitting it into
+newline-aligned byte ranges and handing each range to a worker process.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Iterate over price_file(path, workers) and write each piece of report
+text in turn. The pieces arrive in original line order and join up to exactly
+the report a single-process run produces. map_blocks runs any block function
+over a pool, or in this process for one worker.
+"""
+
+import os
+from collections import deque
+from multiprocessing import Pool
+
+from mortgage import instrumentation
+from mortgage.batch import calculate_payments
+from mortgage.cents import calculate_payments_exact
+from mortgage.pixell_lookup import RATE_TABLES
+from mortgage.reader import read_range
+from mortgage.report import RENDERERS
+
+DEFAULT_RANGE_SIZE = 8 * 1024 * 1024
+_COUNT_BLOCK_SIZE = 1024 * 1024
+# The ranges handed out per worker ahead of the one being written, so a slow
+# output stream cannot make the parent hold the rendered text of the whole file.
+RANGES_PER_WORKER = 2
+
+
+def split_ranges(path: str, range_size: int = DEFAULT_RANGE_SIZE) -> list:
+    """
+    Split a file into byte ranges of roughly range_size bytes that start and end
+    on line boundaries, numbering the first line of each range.
+    args:
+        path(str): The path of the mortgage file.
+        range_size(int): The target number of bytes in each range.
+    returns:
+        A list of (start, end, first_line) tuples covering the whole file.
+    raises:
+        ValueError: When the range size is not positive.
+        FileNotFoundError: When the file does not exist.
+    """
+    if range_size <= 0:
+        raise ValueError("Range size must be positive.")
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    first_line = 1
+    with open(path, "rb") as input:
+        while start < size:
+            input.seek(min(start + range_size, size))
+            # Finish the line the target offset falls in.
+            input.readline()
+            end = min(input.tell(), size)
+            ranges.append((start, end, first_line))
+            # Counting newlines runs at memory speed, far ahead of parsing.
+            input.seek(start)
+            remaining = end - start
+            while remaining:
+                block = input.read(min(remaining, _COUNT_BLOCK_SIZE))
+                first_line += block.count(b"\n")
+                remaining -= len(block)
+            start = end
+    return ranges
+
+
+def price_range(path: str, start: int, end: int, first_line: int = 1, format: str = "text",
+                rate_table=None, exact: bool = False, measure: bool = False):
+    """
+    Parse, price and render the lines in one byte range of a mortgage file.
+    args:
+        path(str): The path of the mortgage file.
+        start(int): The byte offset of the first line in the range.
+        end(int): The byte offset just past the last line in the range.
+        first_line(int): The line number of the first line in the range.
+        format(str): The report format, a key of report.RENDERERS.
+        rate_table(RateTable): The rate table snapshot, the current one when None.
+        exact(bool): Price in exact integer cents with cents.calculate_payments_exact.
+        measure(bool): Measure the range with its own instrumentation run.
+    returns:
+        The report text for the range, or with measure a tuple (text,
+        measurements) for Instrumentation.merge.
+    """
+    render = RENDERERS[format]
+    calculate = calculate_payments_exact if exact else calculate_payments
+    if rate_table is None:
+        rate_table = RATE_TABLES.current
+    run = instrumentation.enable() if measure else instrumentation.active()
+    pieces = []
+    try:
+        for chunk in read_range(path, start, end, first_line=first_line):
+            payments, errors = calculate(chunk.amounts, chunk.rate_codes,
+                                         chunk.frequency_codes, chunk.amortizations, rate_table)
+            with run.stage("render"):
+                pieces.append(render(chunk, payments, errors, rate_table))
+    finally:
+        if measure:
+            instrumentation.disable()
+    if measure:
+        return "".join(pieces), run.measurements()
+    return "".join(pieces)
+
+
+def _price_task(task: tuple):
+    # Unpack a (path, start, end, first_line, format, rate_table, exact,
+    # measure) task for the pool.
+    return price_range(*task)
+
+
+def _run_pool(tasks: list, workers: int, measure: bool = False):
+    # Keep the pool open only while the results are being consumed, with at
+    # most RANGES_PER_WORKER ranges per worker submitted and not yet consumed.
+    # Measured ranges are merged into the parent's instrumentation run.
+    window = RANGES_PER_WORKER * (workers or os.cpu_count() or 1)
+    tasks = iter(tasks)
+    with Pool(workers) as pool:
+        pending = deque(pool.apply_async(_price_task, (task,)) for _, task in zip(range(window), tasks))
+        while pending:
+            text = pending.popleft().get()
+            for task in tasks:
+                pending.append(pool.apply_async(_price_task, (task,)))
+                break
+            if measure:
+                text, measurements = text
+                instrumentation.active().merge(measurements)
+            yield text
+
+
+def map_blocks(function, blocks, workers: int, initializer=None, initargs: tuple = ()):
+    """
+    Apply a function to every block, in this process for one worker or across
+    a pool of worker processes otherwise.
+    args:
+        function: A picklable function of one block.
+        blocks: An iterable of picklable blocks.
+        workers(int): The number of worker processes, one per CPU when None.
+        initializer: A function run once in each process before its first block.
+        initargs(tuple): The arguments of the initializer.
+    returns:
+        A generator of the results, in block order.
+    """
+    if workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from map(function, blocks)
+    else:
+        with Pool(workers, initializer=initializer, initargs=initargs) as pool:
+            yield from pool.imap(function, blocks)
+
+
+def price_file(path: str, workers: int = None, range_size: int = DEFAULT_RANGE_SIZE,
+               format: str = "text", exact: bool = False):
+    """
+    Price a mortgage file with a pool of worker processes. Every range is
+    priced with the rate table that is current when this is called. While an
+    instrumentation run is active, each worker measures its ranges and the
+    measurements are merged into the run as the pieces are consumed.
+    args:
+        path(str): The path of the mortgage file.
+        workers(int): The number of worker processes, one per CPU when None.
+        range_size(int): The target number of bytes handed to a worker at a time.
+        format(str): The report format, a key of report.RENDERERS.
+        exact(bool): Price in exact integer cents with cents.calculate_payments_exact.
+    returns:
+        A generator of report text, one piece per range, in original line order.
+    raises:
+        ValueError: When the worker count is not positive or the format is invalid.
+        FileNotFoundError: When the file does not exist.
+    """
+    if workers is not None and workers <= 0:
+        raise ValueError("Worker count must be positive.")
+    if format not in RENDERERS:
+        raise ValueError("Report format provided is invalid.")
+    rate_table = RATE_TABLES.current
+    measure = instrumentation.active().enabled
+    tasks = [(path, start, end, first_line, format, rate_table, exact, measure)
+             for start, end, first_line in split_ranges(path, range_size)]
+    return _run_pool(tasks, workers, measure)
@@ -7,9 +7,18 @@ Date: 11/11/2023
 Usage: The enumerations and list in this file may be used when working 
 with mortgages to ensure only valid rates, frequencies and amortization 
 periods are used.
+The rates in MortgageRate are the built-in defaults. The rates used for pricing
+come from RATE_TABLES, a versioned store that can load new rates from a file
+(one NAME,value line per rate, such as FIXED_5,0.0500) while the process runs.
+Readers take RATE_TABLES.current once and price with that immutable snapshot,
+whose factors hold the payment per dollar borrowed for every combination of
+rate, frequency and amortization.
 """
 
 
+import _thread
+import os
+from collections import namedtuple
 from enum import Enum
 
 VALID_AMORTIZATION = [5, 10, 15, 20, 25, 30]
@@ -43,3 +52,192 @@ class MortgageFrequency(Enum):
     BI_WEEKLY = 26
     WEEKLY = 52
 
+# Positional codes used by the column-oriented APIs: the code of a member is
+# its index in these tuples.
+RATES_BY_CODE = tuple(MortgageRate)
+FREQUENCIES_BY_CODE = tuple(MortgageFrequency)
+
+# Every (rate code, frequency code, amortization) group, in group index order,
+# and the index of each group. A book has at most len(GROUPS) distinct terms.
+GROUPS = tuple((rate_code, frequency_code, amortization)
+               for rate_code in range(len(RATES_BY_CODE))
+               for frequency_code in range(len(FREQUENCIES_BY_CODE))
+               for amortization in VALID_AMORTIZATION)
+GROUP_INDEX = {group: index for index, group in enumerate(GROUPS)}
+
+# Annuity factors i * (1 + i) ** n / ((1 + i) ** n - 1), keyed by
+# (MortgageRate, MortgageFrequency, amortization) and by the matching codes.
+# A payment is the loan amount multiplied by its factor.
+def _add_rate_factors(factors: dict, factors_by_code: dict, rate_code: int, value: float):
+    # Fill in the factors of one rate for every frequency and amortization.
+    rate = RATES_BY_CODE[rate_code]
+    for frequency_code, frequency in enumerate(FREQUENCIES_BY_CODE):
+        i = value / frequency.value
+        for amortization in VALID_AMORTIZATION:
+            n = amortization * frequency.value
+            factor = i * (1 + i) ** n / ((1 + i) ** n - 1)
+            factors[(rate, frequency, amortization)] = factor
+            factors_by_code[(rate_code, frequency_code, amortization)] = factor
+
+
+class RateTable(namedtuple("RateTable", ["version", "rates", "rates_by_code", "factors", "factors_by_code"])):
+    """
+    An immutable snapshot of the rate table. The dictionaries must not be
+    modified; a change of rates produces a new snapshot with a new version.
+    values:
+        version: The version number, starting at 1 for the built-in rates.
+        rates: The annual rate for each MortgageRate.
+        rates_by_code: The annual rates in rate code order.
+        factors: The annuity factors keyed by (MortgageRate, MortgageFrequency, amortization).
+        factors_by_code: The annuity factors keyed by (rate code, frequency code, amortization).
+    """
+    __slots__ = ()
+
+    def with_rates(self, rates: dict) -> "RateTable":
+        """
+        Build the next version of the table. Only the factors of rates whose
+        value changed are recalculated; the others are copied across.
+        args:
+            rates(dict): The annual rate for every MortgageRate.
+        returns:
+            A new RateTable with the next version number.
+        """
+        factors = dict(self.factors)
+        factors_by_code = dict(self.factors_by_code)
+        for rate_code, rate in enumerate(RATES_BY_CODE):
+            if rates[rate] != self.rates[rate]:
+                _add_rate_factors(factors, factors_by_code, rate_code, rates[rate])
+        return RateTable(self.version + 1, dict(rates), tuple(rates[rate] for rate in RATES_BY_CODE),
+                         factors, factors_by_code)
+
+
+def read_rate_file(path: str) -> dict:
+    """
+    Read a rate file. Each line holds a MortgageRate name and its annual rate,
+    such as FIXED_5,0.0500; blank lines and lines starting with # are ignored.
+    args:
+        path(str): The path of the rate file.
+    returns:
+        A dictionary with the annual rate for every MortgageRate.
+    raises:
+        FileNotFoundError: When the file does not exist.
+        ValueError: When a line is malformed, a rate is unknown, repeated,
+            not positive or missing.
+    """
+    rates = {}
+    with open(path, "r") as input:
+        for line_number, line in enumerate(input, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split(",")
+            if len(fields) != 2:
+                raise ValueError(f"Rate table line {line_number} is invalid.")
+            name, value = fields[0].strip(), fields[1].strip()
+            if name not in MortgageRate.__members__ or MortgageRate[name] in rates:
+                raise ValueError(f"Rate table line {line_number} is invalid.")
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError(f"Rate table line {line_number} is invalid.")
+            if not 0 < value < 1:
+                raise ValueError(f"Rate table line {line_number} is invalid.")
+            rates[MortgageRate[name]] = value
+    for rate in RATES_BY_CODE:
+        if rate not in rates:
+            raise ValueError(f"Rate table is missing {rate.name}.")
+    return rates
+
+
+class RateTableStore:
+    """
+    Holds the current rate table and every earlier version. Writers are
+    serialized with a lock; readers never lock, they read the current
+    attribute once and keep using that snapshot.
+    attributes:
+        current: The RateTable used for new pricing.
+    """
+    def __init__(self):
+        """
+        Initialize a store holding the built-in rates as version 1.
+        """
+        rates = {rate: rate.value for rate in RATES_BY_CODE}
+        factors = {}
+        factors_by_code = {}
+        for rate_code, rate in enumerate(RATES_BY_CODE):
+            _add_rate_factors(factors, factors_by_code, rate_code, rate.value)
+        self.current = RateTable(1, rates, tuple(rates[rate] for rate in RATES_BY_CODE),
+                                 factors, factors_by_code)
+        self._history = {1: self.current}
+        # The lock type behind threading.Lock, without the cost of importing
+        # threading on the single-loan path.
+        self._lock = _thread.allocate_lock()
+        self._path = None
+        self._mtime = None
+
+    def get(self, version: int) -> RateTable:
+        """
+        Look up a rate table by version, to reproduce earlier pricing.
+        args:
+            version(int): The version number.
+        returns:
+            The RateTable with that version.
+        raises:
+            ValueError: When the version is unknown.
+        """
+        try:
+            return self._history[version]
+        except KeyError:
+            raise ValueError("Rate table version is unknown.")
+
+    def update(self, rates: dict) -> RateTable:
+        """
+        Publish new rates as the next version. Nothing changes when the rates
+        are the same as the current ones.
+        args:
+            rates(dict): The annual rate for every MortgageRate.
+        returns:
+            The current RateTable after the update.
+        """
+        with self._lock:
+            if rates != self.current.rates:
+                table = self.current.with_rates(rates)
+                self._history[table.version] = table
+                # A single attribute assignment: readers see the old or the new
+                # snapshot, never a mix.
+                self.current = table
+            return self.current
+
+    def load(self, path: str) -> RateTable:
+        """
+        Load rates from a rate file and remember the file for reload().
+        args:
+            path(str): The path of the rate file.
+        returns:
+            The current RateTable after loading.
+        raises:
+            FileNotFoundError: When the file does not exist.
+            ValueError: When the file is not a valid rate file.
+        """
+        mtime = os.stat(path).st_mtime_ns
+        table = self.update(read_rate_file(path))
+        self._path = path
+        self._mtime = mtime
+        return table
+
+    def reload(self) -> bool:
+        """
+        Load the remembered rate file again if it changed since it was read.
+        returns:
+            True when the file was read again.
+        raises:
+            ValueError: When the changed file is not a valid rate file; the
+                current table is kept.
+        """
+        if self._path is None or os.stat(self._path).st_mtime_ns == self._mtime:
+            return False
+        self.load(self._path)
+        return True
+
+
+RATE_TABLES = RateTableStore()
@@ -0,0 +1,317 @@
+"""
+Description: A columnar container for large books of mortgages.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Add loans to a MortgagePortfolio (one at a time or a reader chunk at a
+time). Loans are stored as packed typed arrays; indexing the portfolio returns a
+MortgageView, a Mortgage that reads and writes its terms in the columns.
+The portfolio keeps every loan's payment up to date. Loans are indexed by
+(rate code, frequency code, amortization) group, so a rate change reprices
+only the groups on that rate, and an edit made through a view's mutators
+reprices only that loan and adjusts the group totals.
+"""
+
+import math
+from array import array
+
+from mortgage.batch import calculate_payments
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION, RATE_TABLES
+
+_RATE_CODES = {rate: code for code, rate in enumerate(RATES_BY_CODE)}
+_FREQUENCY_CODES = {frequency: code for code, frequency in enumerate(FREQUENCIES_BY_CODE)}
+
+
+class MortgageView(Mortgage):
+    """
+    A Mortgage whose terms live in a row of a MortgagePortfolio.
+    The Mortgage accessors, mutators and calculations work unchanged: the
+    private attributes they use are redirected to the portfolio's columns, so a
+    change made through a mutator is a change to the portfolio, which reprices
+    the loan. The payment is the portfolio's payment for the row.
+    """
+    __slots__ = ("_portfolio", "_index")
+
+    def __init__(self, portfolio: "MortgagePortfolio", index: int):
+        """
+        Initialize a view of one row of a portfolio.
+        args:
+            portfolio(MortgagePortfolio): The portfolio holding the loan.
+            index(int): The row of the loan.
+        """
+        self._portfolio = portfolio
+        self._index = index
+        self._rate_table = None
+
+    # Column-backed replacements for the slots Mortgage reads and writes.
+    @property
+    def _loan_amount(self) -> float:
+        return self._portfolio.amounts[self._index]
+
+    @_loan_amount.setter
+    def _loan_amount(self, value: float):
+        self._portfolio._update(self._index, "amounts", value)
+
+    @property
+    def _rate(self):
+        return RATES_BY_CODE[self._portfolio.rate_codes[self._index]]
+
+    @_rate.setter
+    def _rate(self, value):
+        self._portfolio._update(self._index, "rate_codes", _RATE_CODES[value])
+
+    @property
+    def _frequency(self):
+        return FREQUENCIES_BY_CODE[self._portfolio.frequency_codes[self._index]]
+
+    @_frequency.setter
+    def _frequency(self, value):
+        self._portfolio._update(self._index, "frequency_codes", _FREQUENCY_CODES[value])
+
+    @property
+    def _amortization(self) -> int:
+        return self._portfolio.amortizations[self._index]
+
+    @_amortization.setter
+    def _amortization(self, value: int):
+        self._portfolio._update(self._index, "amortizations", value)
+
+    # The columns can change underneath a view, so a view never caches its payment.
+    @property
+    def _payment(self):
+        return None
+
+    @_payment.setter
+    def _payment(self, value):
+        pass
+
+    def calculate_payment(self) -> float:
+        """
+        The payment the portfolio holds for this loan.
+        returns:
+            The mortgage payment as a float.
+        """
+        portfolio = self._portfolio
+        self._rate_table = portfolio.rate_table
+        return portfolio.payments[self._index]
+
+
+class MortgagePortfolio:
+    """
+    A book of mortgages stored column by column: a float64 loan amount and
+    uint8 rate code, frequency code and amortization per loan, with a float64
+    payment per loan priced with rate_table. Change loans through views (or
+    add and extend) so the payments, groups and totals stay up to date.
+    """
+    def __init__(self, rate_table=None):
+        """
+        Initialize an empty portfolio.
+        args:
+            rate_table(RateTable): The rate table to price with, the current one when None.
+        """
+        self.amounts = array("d")
+        self.rate_codes = array("B")
+        self.frequency_codes = array("B")
+        self.amortizations = array("B")
+        self.payments = array("d")
+        self.rate_table = rate_table if rate_table is not None else RATE_TABLES.current
+        # The rows of every group, the position of each row within its group's
+        # array, and the sum of each group's payments.
+        self._groups = {(rate_code, frequency_code, amortization): array("Q")
+                        for rate_code in range(len(RATES_BY_CODE))
+                        for frequency_code in range(len(FREQUENCIES_BY_CODE))
+                        for amortization in VALID_AMORTIZATION}
+        self._positions = array("Q")
+        self._group_payments = dict.fromkeys(self._groups, 0.0)
+
+    def __len__(self) -> int:
+        """
+        The number of loans in the portfolio.
+        returns:
+            The number of loans as an int.
+        """
+        return len(self.amounts)
+
+    def __getitem__(self, index: int) -> MortgageView:
+        """
+        A view of one loan.
+        args:
+            index(int): The row of the loan; negative rows count from the end.
+        returns:
+            A MortgageView of the loan.
+        raises:
+            IndexError: When the row is out of range.
+        """
+        if index < 0:
+            index += len(self.amounts)
+        if not 0 <= index < len(self.amounts):
+            raise IndexError("Portfolio index out of range.")
+        return MortgageView(self, index)
+
+    def __iter__(self):
+        """
+        Iterate over views of every loan in row order.
+        returns:
+            A generator of MortgageView objects.
+        """
+        for index in range(len(self.amounts)):
+            yield MortgageView(self, index)
+
+    def add(self, mortgage: Mortgage) -> int:
+        """
+        Add a copy of a mortgage's terms to the portfolio.
+        args:
+            mortgage(Mortgage): The mortgage to add.
+        returns:
+            The row of the new loan.
+        """
+        self.extend([mortgage.loan_amount], [_RATE_CODES[mortgage.rate]],
+                    [_FREQUENCY_CODES[mortgage.frequency]], [mortgage.amortization])
+        return len(self.amounts) - 1
+
+    def extend(self, amounts, rate_codes, frequency_codes, amortizations):
+        """
+        Add columns of loans that have already been validated, such as the
+        columns of a reader MortgageChunk, pricing them as a batch.
+        args:
+            amounts: A sequence of loan amounts.
+            rate_codes: A sequence of MortgageRate codes.
+            frequency_codes: A sequence of MortgageFrequency codes.
+            amortizations: A sequence of amortization periods.
+        raises:
+            ValueError: When the columns are not all the same length, or a
+                loan is invalid; nothing is added then.
+        """
+        payments, errors = calculate_payments(amounts, rate_codes, frequency_codes, amortizations,
+                                              self.rate_table)
+        for error in errors:
+            if error is not None:
+                raise ValueError(error)
+        groups = self._groups
+        positions = self._positions
+        group_payments = self._group_payments
+        row = len(self.amounts)
+        for key, payment in zip(zip(rate_codes, frequency_codes, amortizations), payments):
+            rows = groups[key]
+            positions.append(len(rows))
+            rows.append(row)
+            group_payments[key] += payment
+            row += 1
+        self.amounts.extend(amounts)
+        self.rate_codes.extend(rate_codes)
+        self.frequency_codes.extend(frequency_codes)
+        self.amortizations.extend(amortizations)
+        self.payments.extend(payments)
+
+    def remove(self, index: int):
+        """
+        Remove one loan. The last loan moves into its row, so views of the
+        last row must not be used afterwards.
+        args:
+            index(int): The row of the loan; negative rows count from the end.
+        raises:
+            IndexError: When the row is out of range.
+        """
+        if index < 0:
+            index += len(self.amounts)
+        if not 0 <= index < len(self.amounts):
+            raise IndexError("Portfolio index out of range.")
+        key = (self.rate_codes[index], self.frequency_codes[index], self.amortizations[index])
+        rows = self._groups[key]
+        position = self._positions[index]
+        moved = rows.pop()
+        if moved != index:
+            rows[position] = moved
+            self._positions[moved] = position
+        self._group_payments[key] -= self.payments[index]
+        last = len(self.amounts) - 1
+        if index != last:
+            last_key = (self.rate_codes[last], self.frequency_codes[last], self.amortizations[last])
+            self._groups[last_key][self._positions[last]] = index
+            self._positions[index] = self._positions[last]
+            for column in (self.amounts, self.rate_codes, self.frequency_codes, self.amortizations,
+                           self.payments):
+                column[index] = column[last]
+        for column in (self.amounts, self.rate_codes, self.frequency_codes, self.amortizations,
+                       self.payments, self._positions):
+            column.pop()
+
+    @property
+    def rate_version(self) -> int:
+        """
+        The version of the rate table the payments were priced with.
+        returns:
+            The version as an int.
+        """
+        return self.rate_table.version
+
+    def group(self, rate_code: int, frequency_code: int, amortization: int) -> array:
+        """
+        The rows of every loan with the same terms.
+        args:
+            rate_code(int): The MortgageRate code.
+            frequency_code(int): The MortgageFrequency code.
+            amortization(int): The amortization period in years.
+        returns:
+            An array of rows in no particular order; it must not be modified.
+        """
+        return self._groups[(rate_code, frequency_code, amortization)]
+
+    def monthly_cash_flow(self) -> dict:
+        """
+        The total payments per month on each rate, with bi-weekly and weekly
+        payments scaled to a month.
+        returns:
+            A dictionary of MortgageRate to the monthly total as a float.
+        """
+        totals = dict.fromkeys(RATES_BY_CODE, 0.0)
+        for (rate_code, frequency_code, _), total in self._group_payments.items():
+            totals[RATES_BY_CODE[rate_code]] += total * FREQUENCIES_BY_CODE[frequency_code].value / 12
+        return totals
+
+    def reprice(self, rate_table=None) -> int:
+        """
+        Switch to another rate table, repricing only the loans on rates whose
+        value changed.
+        args:
+            rate_table(RateTable): The rate table to price with, the current one when None.
+        returns:
+            The number of loans repriced.
+        """
+        if rate_table is None:
+            rate_table = RATE_TABLES.current
+        previous = self.rate_table
+        self.rate_table = rate_table
+        amounts = self.amounts
+        payments = self.payments
+        repriced = 0
+        for key, rows in self._groups.items():
+            if rate_table.rates_by_code[key[0]] == previous.rates_by_code[key[0]] or not rows:
+                continue
+            factor = rate_table.factors_by_code[key]
+            for row in rows:
+                payments[row] = round(amounts[row] * factor, 2)
+            self._group_payments[key] = math.fsum(payments[row] for row in rows)
+            repriced += len(rows)
+        return repriced
+
+    def _update(self, row: int, column: str, value):
+        # Change one term of one loan, move it to its new group when the group
+        # changes, and reprice it.
+        old_key = (self.rate_codes[row], self.frequency_codes[row], self.amortizations[row])
+        getattr(self, column)[row] = value
+        key = (self.rate_codes[row], self.frequency_codes[row], self.amortizations[row])
+        if key != old_key:
+            rows = self._groups[old_key]
+            position = self._positions[row]
+            last = rows.pop()
+            if last != row:
+                rows[position] = last
+                self._positions[last] = position
+            rows = self._groups[key]
+            self._positions[row] = len(rows)
+            rows.append(row)
+        payment = round(self.amounts[row] * self.rate_table.factors_by_code[key], 2)
+        self._group_payments[old_key] -= self.payments[row]
+        self._group_payments[key] += payment
+        self.payments[row] = payment
@@ -0,0 +1,452 @@
+"""
+Description: An indexed query layer over a columnar mortgage portfolio.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Fill an IndexedPortfolio like a MortgagePortfolio (add, extend, remove,
+edits through views and reprice), then call aggregate for the loan count, loan
+amount total and payment total of the loans matching a filter, optionally
+grouped by rate, frequency and amortization, or select for the matching rows
+as a bitmap. Filters take a MortgageRate, MortgageFrequency or amortization
+period (or a collection of them) and an inclusive loan amount range.
+Indexes:
+    bitmaps: one per rate, frequency and amortization value, with bit r set
+        when row r has that value, kept in segments of 65536 rows so a change
+        rewrites one small segment instead of the whole bitmap.
+    amount index: the loan amounts of each (rate, frequency, amortization)
+        group in sorted order, split into blocks that carry their loan amount
+        and payment totals.
+The indexes change with every add, edit, removal and reprice, so the totals
+are always current. An aggregate adds up the totals of whole blocks and scans
+only the block at each end of an amount range: its cost depends on the number
+of groups and blocks it touches, not on the number of loans.
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from itertools import chain, product
+
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION
+from mortgage.portfolio import MortgagePortfolio, _RATE_CODES, _FREQUENCY_CODES
+
+# The aggregate of a set of loans.
+Totals = namedtuple("Totals", ["count", "loan_amount", "payment"])
+
+GROUP_BY_COLUMNS = ("rate", "frequency", "amortization")
+
+# Loans per amount index block; a block is split when it doubles.
+BLOCK_SIZE = 1024
+SEGMENT_BITS = 16
+_SEGMENT_MASK = (1 << SEGMENT_BITS) - 1
+_FULL_SEGMENT = (1 << (1 << SEGMENT_BITS)) - 1
+
+# Translation tables turning a column's bytes into the binary digits of one
+# value's bitmap, b"1" where the byte holds the value and b"0" elsewhere.
+_DIGITS = {value: bytes(48 + (byte == value) for byte in range(256)) for value in range(256)}
+
+
+class _SortedAmounts:
+    # The loan amounts, rows and payments of one group in loan amount order,
+    # in blocks with the largest amount and the totals of each block.
+    __slots__ = ("amounts", "rows", "payments", "maxes", "amount_sums", "payment_sums")
+
+    def __init__(self):
+        self.amounts = []
+        self.rows = []
+        self.payments = []
+        self.maxes = []
+        self.amount_sums = []
+        self.payment_sums = []
+
+    def build(self, amounts: array, rows: array, payments: array):
+        # Replace the contents with columns already sorted by amount.
+        self.__init__()
+        for start in range(0, len(amounts), BLOCK_SIZE):
+            end = start + BLOCK_SIZE
+            self.amounts.append(amounts[start:end])
+            self.rows.append(rows[start:end])
+            self.payments.append(payments[start:end])
+            self.maxes.append(amounts[end - 1] if end <= len(amounts) else amounts[-1])
+            self.amount_sums.append(math.fsum(self.amounts[-1]))
+            self.payment_sums.append(math.fsum(self.payments[-1]))
+
+    def _refresh(self, block: int):
+        # Recalculate a block's largest amount and totals after a change.
+        self.maxes[block] = self.amounts[block][-1]
+        self.amount_sums[block] = math.fsum(self.amounts[block])
+        self.payment_sums[block] = math.fsum(self.payments[block])
+
+    def insert(self, amount: float, row: int, payment: float):
+        # Add one loan, splitting its block when it grows too large.
+        if not self.amounts:
+            self.build(array("d", [amount]), array("Q", [row]), array("d", [payment]))
+            return
+        block = min(bisect_left(self.maxes, amount), len(self.maxes) - 1)
+        amounts = self.amounts[block]
+        position = bisect_right(amounts, amount)
+        amounts.insert(position, amount)
+        self.rows[block].insert(position, row)
+        self.payments[block].insert(position, payment)
+        if len(amounts) > 2 * BLOCK_SIZE:
+            for column in (self.amounts, self.rows, self.payments):
+                column.insert(block + 1, column[block][BLOCK_SIZE:])
+                del column[block][BLOCK_SIZE:]
+            self.maxes.insert(block + 1, 0.0)
+            self.amount_sums.insert(block + 1, 0.0)
+            self.payment_sums.insert(block + 1, 0.0)
+            self._refresh(block + 1)
+        self._refresh(block)
+
+    def _find(self, amount: float, row: int) -> tuple:
+        # The (block, position) of a loan, scanning the loans with its amount.
+        block = bisect_left(self.maxes, amount)
+        while block < len(self.maxes):
+            amounts = self.amounts[block]
+            rows = self.rows[block]
+            position = bisect_left(amounts, amount)
+            while position < len(amounts) and amounts[position] == amount:
+                if rows[position] == row:
+                    return block, position
+                position += 1
+            if position < len(amounts):
+                break
+            block += 1
+        raise KeyError(row)
+
+    def remove(self, amount: float, row: int):
+        # Remove one loan, dropping its block when it empties.
+        block, position = self._find(amount, row)
+        for column in (self.amounts, self.rows, self.payments):
+            del column[block][position]
+        if self.amounts[block]:
+            self._refresh(block)
+        else:
+            for column in (self.amounts, self.rows, self.payments, self.maxes, self.amount_sums,
+                           self.payment_sums):
+                del column[block]
+
+    def relabel(self, amount: float, row: int, new_row: int):
+        # Record that a loan moved to another row.
+        block, position = self._find(amount, row)
+        self.rows[block][position] = new_row
+
+    def reprice(self, payments: array):
+        # Reload every payment from the portfolio's payment column.
+        for block, rows in enumerate(self.rows):
+            self.payments[block] = array("d", map(payments.__getitem__, rows))
+            self.payment_sums[block] = math.fsum(self.payments[block])
+
+    def _bounds(self, low: float, high: float) -> tuple:
+        # The first block holding amounts in [low, high] and the first block
+        # past it whose largest amount is above high; every block in between
+        # lies wholly inside the range.
+        return bisect_left(self.maxes, low), bisect_right(self.maxes, high)
+
+    def _span(self, low: float, high: float):
+        # Yield (block, start, end) for every block holding amounts in [low, high].
+        first, last = self._bounds(low, high)
+        if first >= len(self.maxes):
+            return
+        amounts = self.amounts[first]
+        yield first, bisect_left(amounts, low), bisect_right(amounts, high)
+        if last > first:
+            for block in range(first + 1, last):
+                yield block, 0, len(self.amounts[block])
+            if last < len(self.maxes):
+                yield last, 0, bisect_right(self.amounts[last], high)
+
+    def totals(self, low: float, high: float) -> tuple:
+        # The (count, loan amount parts, payment parts) of the amounts in
+        # [low, high], as the totals of whole blocks and the sums of partial ones.
+        first, last = self._bounds(low, high)
+        if first >= len(self.maxes):
+            return 0, [], []
+        count = 0
+        amount_parts = []
+        payment_parts = []
+        partial = [first]
+        if last > first:
+            count += sum(map(len, self.amounts[first + 1:last]))
+            amount_parts.extend(self.amount_sums[first + 1:last])
+            payment_parts.extend(self.payment_sums[first + 1:last])
+            if last < len(self.maxes):
+                partial.append(last)
+        for block in partial:
+            amounts = self.amounts[block]
+            start = bisect_left(amounts, low)
+            end = bisect_right(amounts, high)
+            if end - start == len(amounts):
+                count += end - start
+                amount_parts.append(self.amount_sums[block])
+                payment_parts.append(self.payment_sums[block])
+            elif end > start:
+                count += end - start
+                amount_parts.append(math.fsum(amounts[start:end]))
+                payment_parts.append(math.fsum(self.payments[block][start:end]))
+        return count, amount_parts, payment_parts
+
+    def rows_between(self, low: float, high: float):
+        # The rows of the amounts in [low, high].
+        return chain.from_iterable(self.rows[block][start:end] for block, start, end in self._span(low, high))
+
+
+def _set_bit(segments: list, row: int):
+    # Set one row's bit in a segmented bitmap.
+    segment = row >> SEGMENT_BITS
+    if segment >= len(segments):
+        segments.extend([0] * (segment + 1 - len(segments)))
+    segments[segment] |= 1 << (row & _SEGMENT_MASK)
+
+
+def _clear_bit(segments: list, row: int):
+    # Clear one row's bit in a segmented bitmap.
+    segments[row >> SEGMENT_BITS] &= ~(1 << (row & _SEGMENT_MASK))
+
+
+def _codes(values, codes: dict, message: str) -> list:
+    # The codes of a filter value or collection of values, all codes when None.
+    if values is None:
+        return sorted(set(codes.values()))
+    if not isinstance(values, (list, tuple, set, frozenset)):
+        values = [values]
+    try:
+        return sorted({codes[value] for value in values})
+    except (KeyError, TypeError):
+        raise ValueError(message)
+
+
+class IndexedPortfolio(MortgagePortfolio):
+    """
+    A MortgagePortfolio that keeps bitmap and loan amount indexes up to date
+    and answers filtered and grouped aggregates from them.
+    """
+    def __init__(self, rate_table=None):
+        """
+        Initialize an empty indexed portfolio.
+        args:
+            rate_table(RateTable): The rate table to price with, the current one when None.
+        """
+        super().__init__(rate_table)
+        # The segments of each value's bitmap, keyed by portfolio column name.
+        self._bitmaps = {"rate_codes": {code: [] for code in range(len(RATES_BY_CODE))},
+                         "frequency_codes": {code: [] for code in range(len(FREQUENCIES_BY_CODE))},
+                         "amortizations": {amortization: [] for amortization in VALID_AMORTIZATION}}
+        self._amount_index = {key: _SortedAmounts() for key in self._groups}
+
+    def extend(self, amounts, rate_codes, frequency_codes, amortizations):
+        """
+        Add columns of validated loans and index them. A group that grows by
+        at least a quarter has its amount index rebuilt with one sort; smaller
+        additions are inserted loan by loan.
+        args:
+            amounts: A sequence of loan amounts.
+            rate_codes: A sequence of MortgageRate codes.
+            frequency_codes: A sequence of MortgageFrequency codes.
+            amortizations: A sequence of amortization periods.
+        raises:
+            ValueError: When the columns are not all the same length, or a
+                loan is invalid; nothing is added then.
+        """
+        start = len(self.amounts)
+        super().extend(amounts, rate_codes, frequency_codes, amortizations)
+        end = len(self.amounts)
+        if end == start:
+            return
+        for column, bitmaps in self._bitmaps.items():
+            values = getattr(self, column)
+            for segment in range(start >> SEGMENT_BITS, ((end - 1) >> SEGMENT_BITS) + 1):
+                low = max(start, segment << SEGMENT_BITS)
+                high = min(end, (segment + 1) << SEGMENT_BITS)
+                data = values[low:high].tobytes()
+                offset = low & _SEGMENT_MASK
+                for value, segments in bitmaps.items():
+                    if segment >= len(segments):
+                        segments.extend([0] * (segment + 1 - len(segments)))
+                    # The first row is the lowest bit, so the digits are reversed.
+                    segments[segment] |= int(data.translate(_DIGITS[value])[::-1], 2) << offset
+        loan_amounts = self.amounts
+        payments = self.payments
+        for key, rows in self._groups.items():
+            added = len(rows)
+            while added and rows[added - 1] >= start:
+                added -= 1
+            new = rows[added:]
+            if not new:
+                continue
+            index = self._amount_index[key]
+            if 4 * len(new) >= added:
+                order = sorted(chain(chain.from_iterable(index.rows), new), key=loan_amounts.__getitem__)
+                index.build(array("d", map(loan_amounts.__getitem__, order)), array("Q", order),
+                            array("d", map(payments.__getitem__, order)))
+            else:
+                for row in new:
+                    index.insert(loan_amounts[row], row, payments[row])
+
+    def remove(self, index: int):
+        """
+        Remove one loan and drop it from the indexes. The last loan moves into
+        its row, so views of the last row must not be used afterwards.
+        args:
+            index(int): The row of the loan; negative rows count from the end.
+        raises:
+            IndexError: When the row is out of range.
+        """
+        if index < 0:
+            index += len(self.amounts)
+        last = len(self.amounts) - 1
+        if not 0 <= index <= last:
+            raise IndexError("Portfolio index out of range.")
+        removed = self._row_terms(index)
+        moved = self._row_terms(last)
+        super().remove(index)
+        self._amount_index[removed[1:]].remove(removed[0], index)
+        self._unset_bits(index, removed)
+        if index != last:
+            self._amount_index[moved[1:]].relabel(moved[0], last, index)
+            self._unset_bits(last, moved)
+            self._set_bits(index, moved)
+
+    def reprice(self, rate_table=None) -> int:
+        """
+        Switch to another rate table, repricing only the loans on rates whose
+        value changed and reloading their payments into the amount index.
+        args:
+            rate_table(RateTable): The rate table to price with, the current one when None.
+        returns:
+            The number of loans repriced.
+        """
+        previous = self.rate_table
+        repriced = super().reprice(rate_table)
+        for key, index in self._amount_index.items():
+            if self.rate_table.rates_by_code[key[0]] != previous.rates_by_code[key[0]]:
+                index.reprice(self.payments)
+        return repriced
+
+    def _update(self, row: int, column: str, value):
+        # Change one term of one loan through MortgagePortfolio, then move it
+        # in the amount index and the bitmaps.
+        old = self._row_terms(row)
+        super()._update(row, column, value)
+        new = self._row_terms(row)
+        self._amount_index[old[1:]].remove(old[0], row)
+        self._amount_index[new[1:]].insert(new[0], row, self.payments[row])
+        if old[1:] != new[1:]:
+            self._unset_bits(row, old)
+            self._set_bits(row, new)
+
+    def _row_terms(self, row: int) -> tuple:
+        # The (amount, rate code, frequency code, amortization) of a row.
+        return self.amounts[row], self.rate_codes[row], self.frequency_codes[row], self.amortizations[row]
+
+    def _set_bits(self, row: int, terms: tuple):
+        # Set a row's bit in the bitmap of each of its values.
+        for bitmaps, value in zip(self._bitmaps.values(), terms[1:]):
+            _set_bit(bitmaps[value], row)
+
+    def _unset_bits(self, row: int, terms: tuple):
+        # Clear a row's bit in the bitmap of each of its values.
+        for bitmaps, value in zip(self._bitmaps.values(), terms[1:]):
+            _clear_bit(bitmaps[value], row)
+
+    def _filter_codes(self, rate, frequency, amortization) -> tuple:
+        # The codes matching each filter, raising the Mortgage messages.
+        return (_codes(rate, _RATE_CODES, "Rate provided is invalid."),
+                _codes(frequency, _FREQUENCY_CODES, "Frequency provided is invalid."),
+                _codes(amortization, {amortization: amortization for amortization in VALID_AMORTIZATION},
+                       "Amortization provided is invalid."))
+
+    def aggregate(self, rate=None, frequency=None, amortization=None, min_amount: float = None,
+                  max_amount: float = None, group_by=()) -> dict:
+        """
+        Total the loans that match a filter, from the pre-aggregated indexes.
+        args:
+            rate: A MortgageRate or a collection of them, every rate when None.
+            frequency: A MortgageFrequency or a collection of them, every frequency when None.
+            amortization: An amortization period or a collection of them, every period when None.
+            min_amount(float): The smallest loan amount included, no limit when None.
+            max_amount(float): The largest loan amount included, no limit when None.
+            group_by: A sequence of columns from GROUP_BY_COLUMNS to group the totals by.
+        returns:
+            A dictionary of group to Totals. A group is a tuple holding the
+            MortgageRate, MortgageFrequency and amortization period of the
+            group_by columns, in the order given; groups without loans are left
+            out. Without group_by the dictionary holds one key, ().
+        raises:
+            ValueError: When a filter value or group_by column is invalid.
+        """
+        if any(column not in GROUP_BY_COLUMNS for column in group_by):
+            raise ValueError("Group by column is invalid.")
+        low = -math.inf if min_amount is None else min_amount
+        high = math.inf if max_amount is None else max_amount
+        positions = [GROUP_BY_COLUMNS.index(column) for column in group_by]
+        parts = {}
+        for rate_code, frequency_code, amortization_value in product(
+                *self._filter_codes(rate, frequency, amortization)):
+            count, amounts, payments = self._amount_index[(rate_code, frequency_code, amortization_value)].totals(
+                low, high)
+            if not count:
+                continue
+            terms = (RATES_BY_CODE[rate_code], FREQUENCIES_BY_CODE[frequency_code], amortization_value)
+            group = parts.setdefault(tuple(terms[position] for position in positions), [0, [], []])
+            group[0] += count
+            group[1].extend(amounts)
+            group[2].extend(payments)
+        totals = {group: Totals(count, math.fsum(amounts), math.fsum(payments))
+                  for group, (count, amounts, payments) in parts.items()}
+        if not group_by and not totals:
+            totals[()] = Totals(0, 0.0, 0.0)
+        return totals
+
+    def count(self, rate=None, frequency=None, amortization=None, min_amount: float = None,
+              max_amount: float = None) -> int:
+        """
+        Count the loans that match a filter.
+        args:
+            The filters of aggregate.
+        returns:
+            The number of loans as an int.
+        raises:
+            ValueError: When a filter value is invalid.
+        """
+        return self.aggregate(rate, frequency, amortization, min_amount, max_amount)[()].count
+
+    def select(self, rate=None, frequency=None, amortization=None, min_amount: float = None,
+               max_amount: float = None) -> int:
+        """
+        Find the rows of the loans that match a filter. Without an amount
+        range the value bitmaps are combined segment by segment; with one,
+        the rows come from the amount index of each matching group.
+        args:
+            The filters of aggregate.
+        returns:
+            A bitmap as an int, with bit r set when row r matches; combine
+            bitmaps with & and |, and count rows with int.bit_count.
+        raises:
+            ValueError: When a filter value is invalid.
+        """
+        codes = self._filter_codes(rate, frequency, amortization)
+        if min_amount is not None or max_amount is not None:
+            low = -math.inf if min_amount is None else min_amount
+            high = math.inf if max_amount is None else max_amount
+            bitmap = bytearray((len(self.amounts) + 7) >> 3)
+            for key in product(*codes):
+                for row in self._amount_index[key].rows_between(low, high):
+                    bitmap[row >> 3] |= 1 << (row & 7)
+            return int.from_bytes(bitmap, "little")
+        segment_count = (len(self.amounts) + _SEGMENT_MASK) >> SEGMENT_BITS
+        result = [_FULL_SEGMENT] * segment_count
+        for bitmaps, values in zip(self._bitmaps.values(), codes):
+            if len(values) == len(bitmaps):
+                continue
+            combined = [0] * segment_count
+            for value in values:
+                for segment, bits in enumerate(bitmaps[value][:segment_count]):
+                    combined[segment] |= bits
+            result = [left & right for left, right in zip(result, combined)]
+        # Keep only the bits of rows that exist.
+        if segment_count and len(self.amounts) & _SEGMENT_MASK:
+            result[-1] &= (1 << (len(self.amounts) & _SEGMENT_MASK)) - 1
+        return int.from_bytes(b"".join(bits.to_bytes(1 << (SEGMENT_BITS - 3), "little") for bits in result),
+                              "little")
+
@@ -0,0 +1,198 @@
+"""
+Description: A streaming reader that parses PiXELL River mortgage files into
+column arrays, one fixed-size chunk at a time.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Iterate over read_chunks(path) (or parse_lines(file) for an open file)
+and pass the columns of each MortgageChunk to the batch payment engine. Memory
+use is bounded by the chunk size, not by the size of the file.
+"""
+
+import io
+from array import array
+
+from mortgage import instrumentation
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, VALID_AMORTIZATION
+
+DEFAULT_CHUNK_SIZE = 65536
+EXCEPTION = "EXCEPTION"
+NAN = float("nan")
+
+_RATE_CODES = {rate.name: code for code, rate in enumerate(MortgageRate)}
+_FREQUENCY_CODES = {frequency.name: code for code, frequency in enumerate(MortgageFrequency)}
+_VALID_AMORTIZATION = frozenset(VALID_AMORTIZATION)
+
+
+class MortgageChunk:
+    """
+    A block of consecutive input lines. Rows that parse into a valid mortgage are
+    stored column by column; rows that do not are recorded in rejected.
+    attributes:
+        line_numbers: The 1-based input line number of each valid row.
+        amounts: The loan amount of each valid row.
+        rate_codes: The MortgageRate code of each valid row.
+        frequency_codes: The MortgageFrequency code of each valid row.
+        amortizations: The amortization period of each valid row.
+        expected: The expected payment of each valid row, NaN for EXCEPTION
+            or a malformed value.
+        malformed_expected: A dictionary of line number to the text of each
+            expected payment that is neither a number nor EXCEPTION.
+        rejected: A list of (line_number, data, message) tuples.
+    """
+    def __init__(self):
+        self.line_numbers = array("Q")
+        self.amounts = array("d")
+        self.rate_codes = array("B")
+        self.frequency_codes = array("B")
+        self.amortizations = array("B")
+        self.expected = array("d")
+        self.malformed_expected = {}
+        self.rejected = []
+
+    def __len__(self) -> int:
+        """
+        The number of input lines held in the chunk.
+        returns:
+            The count of valid and rejected rows.
+        """
+        return len(self.line_numbers) + len(self.rejected)
+
+
+def parse_expected(text: str) -> float:
+    """
+    Parse the expected payment column of a row.
+    args:
+        text(str): The text of the column.
+    returns:
+        The expected payment, or NaN when the text is EXCEPTION.
+    raises:
+        ValueError: When the text is neither a number nor EXCEPTION.
+    """
+    try:
+        value = float(text)
+    except ValueError:
+        if text.strip() == EXCEPTION:
+            return NAN
+        raise
+    if value != value:
+        raise ValueError(f"Expected payment is malformed: {text.strip()!r}")
+    return value
+
+
+def _parse_row(data: str) -> tuple:
+    """
+    Parse and validate one input line. Checks run in the same order as the
+    client program and Mortgage.__init__ so the same message is produced.
+    returns:
+        A tuple (amount, rate_code, amortization, frequency_code, expected),
+        where expected is the text of the expected payment column, or an
+        empty string when the row has none.
+    raises:
+        ValueError: When a value is invalid.
+        KeyError: When the rate or frequency is not a known name.
+        IndexError: When the row has too few columns.
+    """
+    items = data.split(",")
+    amount = float(items[0])
+    rate_code = _RATE_CODES.get(items[1])
+    if rate_code is None:
+        MortgageRate[items[1]]
+    amortization = int(items[2])
+    frequency_code = _FREQUENCY_CODES.get(items[3])
+    if frequency_code is None:
+        MortgageFrequency[items[3]]
+    if not amount > 0:
+        raise ValueError("Loan amount must be positive.")
+    if amortization not in _VALID_AMORTIZATION:
+        raise ValueError("Amortization provided is invalid.")
+    return amount, rate_code, amortization, frequency_code, items[-1] if len(items) >= 5 else ""
+
+
+def parse_lines(lines, chunk_size: int = DEFAULT_CHUNK_SIZE, first_line: int = 1):
+    """
+    Parse an iterable of input lines into chunks of column arrays.
+    args:
+        lines: An iterable of text lines, such as an open file.
+        chunk_size(int): The number of lines held in each chunk.
+        first_line(int): The line number of the first line.
+    returns:
+        A generator of MortgageChunk objects.
+    raises:
+        ValueError: When the chunk size is not positive.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    run = instrumentation.active()
+    for chunk in run.timed("parse", _parse_chunks(lines, chunk_size, first_line)):
+        if run.enabled:
+            run.count("rows_parsed", len(chunk))
+            run.count_rejects(message for _, _, message in chunk.rejected)
+        yield chunk
+
+
+def _parse_chunks(lines, chunk_size: int, first_line: int):
+    # The parsing loop of parse_lines.
+    chunk = MortgageChunk()
+    count = 0
+    for line_number, data in enumerate(lines, first_line):
+        try:
+            amount, rate_code, amortization, frequency_code, expected = _parse_row(data)
+        except Exception as e:
+            chunk.rejected.append((line_number, data.strip(), str(e)))
+        else:
+            try:
+                expected = parse_expected(expected)
+            except ValueError:
+                chunk.malformed_expected[line_number] = expected.strip()
+                expected = NAN
+            chunk.line_numbers.append(line_number)
+            chunk.amounts.append(amount)
+            chunk.rate_codes.append(rate_code)
+            chunk.amortizations.append(amortization)
+            chunk.frequency_codes.append(frequency_code)
+            chunk.expected.append(expected)
+        count += 1
+        if count == chunk_size:
+            yield chunk
+            chunk = MortgageChunk()
+            count = 0
+    if count:
+        yield chunk
+
+
+def read_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Stream a mortgage file in chunks of column arrays.
+    args:
+        path(str): The path of the mortgage file.
+        chunk_size(int): The number of lines held in each chunk.
+    returns:
+        A generator of MortgageChunk objects.
+    raises:
+        FileNotFoundError: When the file does not exist.
+    """
+    with open(path, "r") as input:
+        yield from parse_lines(input, chunk_size)
+
+
+def read_range(path: str, start: int, end: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               first_line: int = 1):
+    """
+    Stream the lines stored between two byte offsets of a mortgage file.
+    Both offsets must fall at the start of a line (see parallel.split_ranges).
+    args:
+        path(str): The path of the mortgage file.
+        start(int): The byte offset of the first line in the range.
+        end(int): The byte offset just past the last line in the range.
+        chunk_size(int): The number of lines held in each chunk.
+        first_line(int): The line number of the first line in the range.
+    returns:
+        A generator of MortgageChunk objects.
+    raises:
+        FileNotFoundError: When the file does not exist.
+    """
+    with open(path, "rb") as input:
+        input.seek(start)
+        data = input.read(end - start)
+    # Decode through a text wrapper so newlines are handled as in read_chunks.
+    yield from parse_lines(io.TextIOWrapper(io.BytesIO(data)), chunk_size, first_line)
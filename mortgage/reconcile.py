@@ -0,0 +1,176 @@
+"""
+Description: Reconciles the expected payments in a mortgage file against the
+payments calculated by the batch engine.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Call reconcile(path) (or reconcile_chunks with chunks from any reader)
+and print the returned ReconciliationReport. The file is streamed once, chunk
+by chunk; only the counts and the first mismatches are kept in memory.
+"""
+
+import math
+
+from mortgage.batch import calculate_payments
+from mortgage.reader import DEFAULT_CHUNK_SIZE, EXCEPTION, parse_expected, read_chunks
+
+DEFAULT_TOLERANCE = 0.01
+DEFAULT_MISMATCH_LIMIT = 1000
+
+# Absorbs binary float noise when a difference sits exactly on the tolerance.
+_EPSILON = 1e-9
+
+
+class ReconciliationReport:
+    """
+    The outcome of reconciling a mortgage file.
+    attributes:
+        rows: The number of input lines.
+        matched: Rows whose payment is within the tolerance of the expected payment.
+        mismatched: Rows whose payment differs from the expected payment.
+        confirmed_exceptions: EXCEPTION rows that failed validation.
+        missing_exceptions: EXCEPTION rows that priced without an error.
+        unexpected_exceptions: Rows with an expected payment that failed validation.
+        malformed_expected: Rows whose expected payment is neither a number nor EXCEPTION.
+        mismatches: The first (line_number, expected, calculated) discrepancies,
+            where expected is a payment, EXCEPTION or a description of a
+            malformed value and calculated is a payment or an error message.
+    """
+    def __init__(self, mismatch_limit: int = DEFAULT_MISMATCH_LIMIT):
+        """
+        Initialize an empty report.
+        args:
+            mismatch_limit(int): The number of discrepancies kept in detail.
+        """
+        self.rows = 0
+        self.matched = 0
+        self.mismatched = 0
+        self.confirmed_exceptions = 0
+        self.missing_exceptions = 0
+        self.unexpected_exceptions = 0
+        self.malformed_expected = 0
+        self.mismatches = []
+        self._mismatch_limit = mismatch_limit
+
+    @property
+    def discrepancies(self) -> int:
+        """
+        The number of rows that did not reconcile.
+        returns:
+            The count as an int.
+        """
+        return self.mismatched + self.missing_exceptions + self.unexpected_exceptions + self.malformed_expected
+
+    def is_clean(self) -> bool:
+        """
+        Whether every row reconciled.
+        returns:
+            True when there are no discrepancies.
+        """
+        return self.discrepancies == 0
+
+    def add_mismatch(self, line_number: int, expected, calculated):
+        """
+        Keep the detail of a discrepancy while under the mismatch limit.
+        returns:
+            None
+        """
+        if len(self.mismatches) < self._mismatch_limit:
+            self.mismatches.append((line_number, expected, calculated))
+
+    def __str__(self) -> str:
+        """
+        The compact mismatch report followed by the summary counts.
+        returns:
+            The report as a string.
+        """
+        lines = []
+        for line_number, expected, calculated in self.mismatches:
+            expected = f"${expected:,.2f}" if isinstance(expected, float) else expected
+            calculated = f"${calculated:,.2f}" if isinstance(calculated, float) else calculated
+            lines.append(f"Line {line_number}: expected {expected}, calculated {calculated}")
+        if self.discrepancies > len(self.mismatches):
+            lines.append(f"... {self.discrepancies - len(self.mismatches):,} more discrepancies")
+        lines.append(f"Rows: {self.rows:,}"
+                     + f"\nMatched: {self.matched:,}"
+                     + f"\nMismatched payments: {self.mismatched:,}"
+                     + f"\nConfirmed exceptions: {self.confirmed_exceptions:,}"
+                     + f"\nMissing exceptions: {self.missing_exceptions:,}"
+                     + f"\nUnexpected exceptions: {self.unexpected_exceptions:,}"
+                     + f"\nMalformed expected payments: {self.malformed_expected:,}")
+        return "\n".join(lines)
+
+
+def _malformed(text: str) -> str:
+    # The description of an expected payment that is neither a number nor EXCEPTION.
+    return f"malformed value {text!r}" if text else "no value"
+
+
+def reconcile_chunks(chunks, tolerance: float = DEFAULT_TOLERANCE,
+                     mismatch_limit: int = DEFAULT_MISMATCH_LIMIT) -> ReconciliationReport:
+    """
+    Reconcile parsed chunks of a mortgage file.
+    args:
+        chunks: An iterable of MortgageChunk objects.
+        tolerance(float): The largest difference counted as a match.
+        mismatch_limit(int): The number of discrepancies kept in detail.
+    returns:
+        A ReconciliationReport.
+    """
+    report = ReconciliationReport(mismatch_limit)
+    limit = tolerance + _EPSILON
+    for chunk in chunks:
+        report.rows += len(chunk)
+        payments, errors = calculate_payments(chunk.amounts, chunk.rate_codes,
+                                              chunk.frequency_codes, chunk.amortizations)
+        malformed = chunk.malformed_expected
+        for line_number, expected, payment, error in zip(chunk.line_numbers, chunk.expected,
+                                                         payments, errors):
+            if malformed and line_number in malformed:
+                report.malformed_expected += 1
+                report.add_mismatch(line_number, _malformed(malformed[line_number]),
+                                    payment if error is None else error)
+            elif error is not None:
+                if math.isnan(expected):
+                    report.confirmed_exceptions += 1
+                else:
+                    report.unexpected_exceptions += 1
+                    report.add_mismatch(line_number, expected, error)
+            elif math.isnan(expected):
+                report.missing_exceptions += 1
+                report.add_mismatch(line_number, EXCEPTION, payment)
+            elif abs(payment - expected) <= limit:
+                report.matched += 1
+            else:
+                report.mismatched += 1
+                report.add_mismatch(line_number, expected, payment)
+        for line_number, data, message in chunk.rejected:
+            text = data.rsplit(",", 1)[-1].strip() if data.count(",") >= 4 else ""
+            try:
+                expected = parse_expected(text)
+            except ValueError:
+                report.malformed_expected += 1
+                report.add_mismatch(line_number, _malformed(text), message)
+                continue
+            if math.isnan(expected):
+                report.confirmed_exceptions += 1
+            else:
+                report.unexpected_exceptions += 1
+                report.add_mismatch(line_number, expected, message)
+    return report
+
+
+def reconcile(path: str, tolerance: float = DEFAULT_TOLERANCE, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              mismatch_limit: int = DEFAULT_MISMATCH_LIMIT) -> ReconciliationReport:
+    """
+    Reconcile a mortgage file in one streaming pass.
+    args:
+        path(str): The path of the mortgage file.
+        tolerance(float): The largest difference counted as a match.
+        chunk_size(int): The number of lines parsed at a time.
+        mismatch_limit(int): The number of discrepancies kept in detail.
+    returns:
+        A ReconciliationReport.
+    raises:
+        FileNotFoundError: When the file does not exist.
+    """
+    return reconcile_chunks(read_chunks(path, chunk_size), tolerance, mismatch_limit)
@@ -0,0 +1,209 @@
+"""
+Description: Renders priced mortgage chunks as report text and writes reports
+in large buffered blocks.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Call a renderer (render_text, render_csv or render_jsonl) with a
+MortgageChunk and the payments calculated for it to get the report text for the
+whole chunk in original line order, or hand chunks to a ReportWriter, which
+buffers the rendered text and writes it to its stream in bulk.
+Formats:
+    text: the client program's human-readable report, one record per line of
+          input, each followed by a separator line.
+    csv: one row per priced loan in the Mortgage __repr__ style (amount, rate,
+         amortization, frequency) followed by the payment. The amount keeps its
+         thousands separators and is quoted.
+    jsonl: one JSON object per line of input; rejected lines carry an error.
+           JSON has no infinity, so a loan whose amount is not finite is
+           written as an error record.
+"""
+
+import json
+import math
+
+from mortgage import instrumentation
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, RATE_TABLES
+
+SEPARATOR = "**************************************************"
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+def render_text(chunk, payments, errors, rate_table=None) -> str:
+    """
+    Render a chunk exactly as printing each Mortgage object would.
+    Every record, valid or rejected, is followed by a separator line.
+    args:
+        chunk(MortgageChunk): The parsed rows.
+        payments: The payment calculated for each valid row.
+        errors: The batch error message (or None) for each valid row.
+        rate_table(RateTable): The snapshot that priced the chunk, the current one when None.
+    returns:
+        The report text for the chunk.
+    """
+    # Rates and frequencies are formatted once per chunk, not once per loan.
+    rates = (rate_table if rate_table is not None else RATE_TABLES.current).rates_by_code
+    rate_text = [f"{rate:.2%}" for rate in rates]
+    frequency_text = [frequency.name for frequency in FREQUENCIES_BY_CODE]
+    records = []
+    for line_number, amount, rate_code, amortization, frequency_code, payment, error in zip(
+            chunk.line_numbers, chunk.amounts, chunk.rate_codes, chunk.amortizations,
+            chunk.frequency_codes, payments, errors):
+        if error is None:
+            text = (f"Mortage Amount: ${amount:,.2f}"
+                    f"\nRate: {rate_text[rate_code]}"
+                    f"\nAmortization: {amortization}"
+                    f"\nFrequency: {frequency_text[frequency_code]}"
+                    f" -- Calculated Payment: ${payment:,.2f}")
+        else:
+            text = f"Line {line_number} caused Exception: {error}"
+        records.append((line_number, text))
+    if chunk.rejected:
+        for line_number, data, message in chunk.rejected:
+            records.append((line_number, f"Data: {data} caused Exception: {message}"))
+        records.sort()
+    return "".join([f"{text}\n{SEPARATOR}\n" for _, text in records])
+
+
+def render_csv(chunk, payments, errors, rate_table=None) -> str:
+    """
+    Render the priced loans of a chunk as CSV rows in the Mortgage __repr__
+    style followed by the payment. Rejected rows are left out.
+    args:
+        chunk(MortgageChunk): The parsed rows.
+        payments: The payment calculated for each valid row.
+        errors: The batch error message (or None) for each valid row.
+        rate_table(RateTable): The snapshot that priced the chunk, the current one when None.
+    returns:
+        The CSV text for the chunk.
+    """
+    rates = (rate_table if rate_table is not None else RATE_TABLES.current).rates_by_code
+    rate_text = [str(rate) for rate in rates]
+    frequency_text = [str(frequency.value) for frequency in FREQUENCIES_BY_CODE]
+    return "".join([f'"{amount:,.2f}",{rate_text[rate_code]},{amortization},'
+                    f"{frequency_text[frequency_code]},{payment:.2f}\n"
+                    for amount, rate_code, amortization, frequency_code, payment, error in zip(
+                        chunk.amounts, chunk.rate_codes, chunk.amortizations,
+                        chunk.frequency_codes, payments, errors)
+                    if error is None])
+
+
+def render_jsonl(chunk, payments, errors, rate_table=None) -> str:
+    """
+    Render a chunk as JSON Lines, one object per input line in line order.
+    Loans with an amount that is not finite are written as errors.
+    args:
+        chunk(MortgageChunk): The parsed rows.
+        payments: The payment calculated for each valid row.
+        errors: The batch error message (or None) for each valid row.
+        rate_table(RateTable): The snapshot that priced the chunk, the current one when None.
+    returns:
+        The JSON Lines text for the chunk.
+    """
+    rate_text = [json.dumps(rate.name) for rate in RATES_BY_CODE]
+    frequency_text = [json.dumps(frequency.name) for frequency in FREQUENCIES_BY_CODE]
+    records = []
+    for line_number, amount, rate_code, amortization, frequency_code, payment, error in zip(
+            chunk.line_numbers, chunk.amounts, chunk.rate_codes, chunk.amortizations,
+            chunk.frequency_codes, payments, errors):
+        if error is None and not math.isfinite(amount):
+            error = "Loan amount must be a finite number."
+        if error is None:
+            text = (f'{{"line": {line_number}, "loan_amount": {amount!r}, '
+                    f'"rate": {rate_text[rate_code]}, "amortization": {amortization}, '
+                    f'"frequency": {frequency_text[frequency_code]}, "payment": {payment!r}}}')
+        else:
+            text = f'{{"line": {line_number}, "error": {json.dumps(error)}}}'
+        records.append((line_number, text))
+    if chunk.rejected:
+        for line_number, data, message in chunk.rejected:
+            records.append((line_number, f'{{"line": {line_number}, "data": {json.dumps(data)}, '
+                                         f'"error": {json.dumps(message)}}}'))
+        records.sort()
+    return "".join([f"{text}\n" for _, text in records])
+
+
+RENDERERS = {"text": render_text, "csv": render_csv, "jsonl": render_jsonl}
+PREAMBLES = {"text": SEPARATOR + "\n", "csv": "", "jsonl": ""}
+
+
+class ReportWriter:
+    """
+    Writes a report to a text stream in large blocks. Rendered text is
+    collected in memory and written with one call whenever the buffer holds
+    buffer_size characters, and when the writer is flushed or closed.
+    """
+    def __init__(self, stream, format: str = "text", buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Initialize a report writer.
+        args:
+            stream: The text stream to write to, such as sys.stdout or an open file.
+            format(str): The report format: text, csv or jsonl.
+            buffer_size(int): The number of characters collected before a write.
+        raises:
+            ValueError: When the format is not supported.
+        """
+        if format not in RENDERERS:
+            raise ValueError("Report format provided is invalid.")
+        self._stream = stream
+        self._format = format
+        self._render = RENDERERS[format]
+        self._buffer_size = buffer_size
+        self._pieces = []
+        self._buffered = 0
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def write_preamble(self):
+        """
+        Write the text that opens a report in this format.
+        returns:
+            None
+        """
+        self.write(PREAMBLES[self._format])
+
+    def write_chunk(self, chunk, payments, errors, rate_table=None):
+        """
+        Render a priced chunk and add it to the report.
+        args:
+            chunk(MortgageChunk): The parsed rows.
+            payments: The payment calculated for each valid row.
+            errors: The batch error message (or None) for each valid row.
+            rate_table(RateTable): The snapshot that priced the chunk, the current one when None.
+        returns:
+            None
+        """
+        with instrumentation.active().stage("render"):
+            text = self._render(chunk, payments, errors, rate_table)
+        self.write(text)
+
+    def write(self, text: str):
+        """
+        Add text that is already rendered in this writer's format.
+        args:
+            text(str): The report text.
+        returns:
+            None
+        """
+        self._pieces.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write everything buffered to the stream and flush the stream.
+        returns:
+            None
+        """
+        run = instrumentation.active()
+        with run.stage("flush"):
+            if self._pieces:
+                self._stream.write("".join(self._pieces))
+                self._pieces = []
+                run.count("characters_written", self._buffered)
+                self._buffered = 0
+            self._stream.flush()
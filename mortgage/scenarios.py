@@ -0,0 +1,243 @@
+"""
+Description: Prices a mortgage book under many rate scenarios at once.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Build a list of scenarios (parallel_shifts gives parallel shifts of
+every rate), then call price_scenarios for the payment of every loan under
+every scenario, block by block, or aggregate_scenarios for the monthly cash
+flow of the whole book under each scenario.
+    python -m mortgage.scenarios PATH [--low -300] [--high 300] [--step 25] [--workers N]
+A scenario is one shock per MortgageRate, in rate code order, added to the
+current rates (0.01 is +100bp); a single number shifts every rate. A book has
+at most 108 (rate, frequency, amortization) groups, so each scenario needs
+only 108 annuity factors: loans are mapped to their group once per block and
+every scenario reuses that mapping.
+"""
+
+import argparse
+import math
+import sys
+from array import array
+from itertools import repeat
+from operator import mul
+
+from mortgage.batch import group_indexes, sum_by_group
+from mortgage.parallel import map_blocks
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, RATE_TABLES, GROUPS
+
+DEFAULT_BLOCK_SIZE = 65536
+
+# The scenario factors held by each worker process, set by _init_worker.
+_worker_factors = None
+
+
+def parallel_shifts(low_bp: int = -300, high_bp: int = 300, step_bp: int = 25) -> list:
+    """
+    Build scenarios that shift every rate by the same amount.
+    args:
+        low_bp(int): The smallest shift in basis points.
+        high_bp(int): The largest shift in basis points.
+        step_bp(int): The distance between shifts in basis points.
+    returns:
+        A list of scenarios, each a tuple of one shock per rate.
+    raises:
+        ValueError: When the step is not positive.
+    """
+    if step_bp <= 0:
+        raise ValueError("Scenario step must be positive.")
+    return [(shift / 10000,) * len(RATES_BY_CODE) for shift in range(low_bp, high_bp + 1, step_bp)]
+
+
+def scenario_factors(scenarios, rate_table=None) -> list:
+    """
+    Calculate the annuity factor of every group under every scenario. A
+    shocked rate at or below zero is priced as an interest-free loan.
+    args:
+        scenarios: A sequence of scenarios; each is a number or one shock per rate.
+        rate_table(RateTable): The rates to shock, the current table when None.
+    returns:
+        A list with, per scenario, a list of factors in GROUPS order.
+    raises:
+        ValueError: When a scenario does not have one shock per rate.
+    """
+    if rate_table is None:
+        rate_table = RATE_TABLES.current
+    tables = []
+    for scenario in scenarios:
+        if isinstance(scenario, (int, float)):
+            scenario = (scenario,) * len(RATES_BY_CODE)
+        if len(scenario) != len(RATES_BY_CODE):
+            raise ValueError("Scenario shocks provided are invalid.")
+        factors = []
+        for rate_code, frequency_code, amortization in GROUPS:
+            frequency = FREQUENCIES_BY_CODE[frequency_code].value
+            i = (rate_table.rates_by_code[rate_code] + scenario[rate_code]) / frequency
+            n = amortization * frequency
+            factors.append(i * (1 + i) ** n / ((1 + i) ** n - 1) if i > 0 else 1 / n)
+        tables.append(factors)
+    return tables
+
+
+def _price_block(amounts, groups, factors: list) -> list:
+    # The payments of one block of loans under every scenario.
+    two = repeat(2)
+    return [array("d", map(round, map(mul, amounts, map(table.__getitem__, groups)), two))
+            for table in factors]
+
+
+def _init_worker(factors: list):
+    # Keep the scenario factors in the worker so blocks are sent without them.
+    global _worker_factors
+    _worker_factors = factors
+
+
+def _price_task(task: tuple) -> list:
+    # Price an (amounts, groups) block with the worker's scenario factors.
+    return _price_block(task[0], task[1], _worker_factors)
+
+
+def _sum_task(task: tuple) -> list:
+    # Sum an (amounts, groups) block by group.
+    return sum_by_group(*task)
+
+
+def _blocks(loan_amounts, rate_codes, frequency_codes, amortizations, block_size: int):
+    # Split the columns into (amounts, groups) blocks, validating each block.
+    for start in range(0, len(loan_amounts), block_size):
+        end = start + block_size
+        amounts = array("d", loan_amounts[start:end])
+        yield amounts, group_indexes(amounts, rate_codes[start:end], frequency_codes[start:end],
+                                     amortizations[start:end])
+
+
+def _check(loan_amounts, rate_codes, frequency_codes, amortizations, block_size: int, workers: int):
+    # Validate the arguments shared by the scenario functions.
+    if not len(loan_amounts) == len(rate_codes) == len(frequency_codes) == len(amortizations):
+        raise ValueError("Columns must all be the same length.")
+    if block_size <= 0:
+        raise ValueError("Block size must be positive.")
+    if workers is not None and workers <= 0:
+        raise ValueError("Worker count must be positive.")
+
+
+def price_scenarios(loan_amounts, rate_codes, frequency_codes, amortizations, scenarios,
+                    block_size: int = DEFAULT_BLOCK_SIZE, workers: int = 1, rate_table=None):
+    """
+    Price every loan under every scenario, one block of loans at a time, so
+    memory is bounded by block_size times the number of scenarios.
+    args:
+        loan_amounts: A sequence of loan amounts.
+        rate_codes: A sequence of MortgageRate codes.
+        frequency_codes: A sequence of MortgageFrequency codes.
+        amortizations: A sequence of amortization periods in years.
+        scenarios: A sequence of scenarios; each is a number or one shock per rate.
+        block_size(int): The number of loans priced at a time.
+        workers(int): The number of worker processes, one per CPU when None.
+        rate_table(RateTable): The rates to shock, the current table when None.
+    returns:
+        A generator of (start, payments) tuples in loan order, where start is
+        the row of the block's first loan and payments[scenario][row - start]
+        is a payment rounded to the cent.
+    raises:
+        ValueError: When the arguments are invalid; a block with an invalid
+            loan raises the Mortgage message of its first invalid loan.
+    """
+    _check(loan_amounts, rate_codes, frequency_codes, amortizations, block_size, workers)
+    factors = scenario_factors(scenarios, rate_table)
+    blocks = _blocks(loan_amounts, rate_codes, frequency_codes, amortizations, block_size)
+    results = map_blocks(_price_task, blocks, workers, _init_worker, (factors,))
+    return zip(range(0, len(loan_amounts), block_size), results)
+
+
+def scenario_matrix(loan_amounts, rate_codes, frequency_codes, amortizations, scenarios,
+                    block_size: int = DEFAULT_BLOCK_SIZE, workers: int = 1, rate_table=None) -> list:
+    """
+    Price every loan under every scenario and keep the whole matrix. Use
+    price_scenarios or aggregate_scenarios when the matrix would not fit in memory.
+    args:
+        The same as price_scenarios.
+    returns:
+        A list with, per scenario, an array of every loan's payment.
+    raises:
+        ValueError: When the arguments are invalid.
+    """
+    matrix = [array("d") for _ in scenarios]
+    for _, payments in price_scenarios(loan_amounts, rate_codes, frequency_codes, amortizations,
+                                       scenarios, block_size, workers, rate_table):
+        for column, block in zip(matrix, payments):
+            column.extend(block)
+    return matrix
+
+
+def aggregate_scenarios(loan_amounts, rate_codes, frequency_codes, amortizations, scenarios,
+                        block_size: int = DEFAULT_BLOCK_SIZE, workers: int = 1, rate_table=None) -> array:
+    """
+    Calculate the monthly cash flow of the whole book under every scenario
+    without building the payment matrix. The loans are read once to total the
+    loan amounts of each group; each scenario then costs one factor per group.
+    Payments are not rounded to the cent, so totals can differ from the sum of
+    price_scenarios payments by up to half a cent per loan.
+    args:
+        The same as price_scenarios.
+    returns:
+        An array with the monthly cash flow of each scenario, with bi-weekly and
+        weekly payments scaled to a month.
+    raises:
+        ValueError: When the arguments are invalid.
+    """
+    _check(loan_amounts, rate_codes, frequency_codes, amortizations, block_size, workers)
+    factors = scenario_factors(scenarios, rate_table)
+    totals = [0.0] * len(GROUPS)
+    blocks = _blocks(loan_amounts, rate_codes, frequency_codes, amortizations, block_size)
+    for block_totals in map_blocks(_sum_task, blocks, workers):
+        totals = [total + block_total for total, block_total in zip(totals, block_totals)]
+    monthly = [total * FREQUENCIES_BY_CODE[frequency_code].value / 12
+               for total, (_, frequency_code, _) in zip(totals, GROUPS)]
+    return array("d", (math.fsum(map(mul, monthly, table)) for table in factors))
+
+
+def main(argv=None) -> int:
+    """
+    Print the monthly cash flow of a mortgage file under parallel rate shifts.
+    args:
+        argv(list): The command line arguments, sys.argv[1:] when None.
+    returns:
+        The exit status.
+    """
+    from mortgage.cli import positive_int
+    from mortgage.columnar import ColumnarBook, is_columnar
+    from mortgage.reader import read_chunks
+
+    parser = argparse.ArgumentParser(description="Price a mortgage book under parallel rate shifts.")
+    parser.add_argument("path", help="the text mortgage file or columnar book")
+    parser.add_argument("--low", type=int, default=-300, help="the smallest shift in basis points")
+    parser.add_argument("--high", type=int, default=300, help="the largest shift in basis points")
+    parser.add_argument("--step", type=positive_int, default=25,
+                        help="the distance between shifts in basis points")
+    parser.add_argument("--workers", type=positive_int, default=1, help="the number of worker processes")
+    args = parser.parse_args(argv)
+
+    shifts = list(range(args.low, args.high + 1, args.step))
+    scenarios = parallel_shifts(args.low, args.high, args.step)
+    try:
+        if is_columnar(args.path):
+            with ColumnarBook(args.path) as book:
+                totals = aggregate_scenarios(book.amounts, book.rate_codes, book.frequency_codes,
+                                             book.amortizations, scenarios, workers=args.workers)
+        else:
+            columns = (array("d"), array("B"), array("B"), array("B"))
+            for chunk in read_chunks(args.path):
+                for column, values in zip(columns, (chunk.amounts, chunk.rate_codes, chunk.frequency_codes,
+                                                    chunk.amortizations)):
+                    column.extend(values)
+            totals = aggregate_scenarios(*columns, scenarios, workers=args.workers)
+    except FileNotFoundError as e:
+        print(f"File not found: {e}")
+        return 1
+    for shift, total in zip(shifts, totals):
+        print(f"{shift:+5d}bp  ${total:,.2f} per month")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Description: An asyncio pricing service that keeps the mortgage pricer loaded
+and answers JSON Lines requests over a local TCP or Unix socket.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: python -m mortgage.service [--host 127.0.0.1] [--port 8765] [--unix PATH]
+           [--rates FILE]
+Each request is one JSON object per line:
+    {"id": 1, "loan_amount": 100000, "rate": "FIXED_5", "frequency": "MONTHLY", "amortization": 25}
+and is answered with one line holding the same id and either a payment or an
+error: {"id": 1, "payment": 584.59}. Requests that arrive within the batch
+window are priced together in one call to the batch engine. At most
+max_in_flight requests are accepted at once; beyond that the service stops
+reading from its connections until responses have been sent. With --rates the
+rate file is checked every reload interval and a changed file is published as
+a new rate table version without interrupting pricing.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+
+from mortgage.batch import calculate_payments
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, RATE_TABLES
+
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 4096
+DEFAULT_MAX_IN_FLIGHT = 10000
+DEFAULT_RELOAD_INTERVAL = 1.0
+
+_RATE_CODES = {rate.name: code for code, rate in enumerate(MortgageRate)}
+_FREQUENCY_CODES = {frequency.name: code for code, frequency in enumerate(MortgageFrequency)}
+
+
+def _decode_request(line: bytes) -> dict:
+    """
+    Decode one request line.
+    returns:
+        The request as a dictionary.
+    raises:
+        ValueError: When the line is not a JSON object.
+    """
+    try:
+        request = json.loads(line)
+    except ValueError:
+        raise ValueError("Request is not valid JSON.")
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object.")
+    return request
+
+
+def _parse_request(request: dict) -> tuple:
+    """
+    Validate one decoded request and turn it into batch columns.
+    returns:
+        A tuple (amount, rate_code, frequency_code, amortization).
+    raises:
+        ValueError: When the request is not a valid pricing request.
+    """
+    amount = request.get("loan_amount")
+    amortization = request.get("amortization")
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        raise ValueError("Loan amount must be positive.")
+    try:
+        amount = float(amount)
+    except OverflowError:
+        amount = math.inf
+    if not math.isfinite(amount):
+        raise ValueError("Loan amount must be a finite number.")
+    if isinstance(amortization, bool) or not isinstance(amortization, int):
+        raise ValueError("Amortization provided is invalid.")
+    # Unknown names become out-of-range codes, which the batch engine reports
+    # with the Mortgage error messages.
+    return (amount, _RATE_CODES.get(request.get("rate"), -1),
+            _FREQUENCY_CODES.get(request.get("frequency"), -1), amortization)
+
+
+class PricingService:
+    """
+    Prices mortgage requests in small batches collected over a short window.
+    attributes:
+        requests: The number of requests priced.
+        batches: The number of batches priced.
+    """
+    def __init__(self, batch_window: float = DEFAULT_BATCH_WINDOW, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        """
+        Initialize a pricing service.
+        args:
+            batch_window(float): The seconds to wait for more requests after the
+                first request of a batch arrives.
+            max_batch(int): The largest number of requests priced in one batch.
+            max_in_flight(int): The largest number of requests accepted and not
+                yet answered.
+        """
+        self.requests = 0
+        self.batches = 0
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._max_in_flight = max_in_flight
+        self._queue = None
+        self._in_flight = None
+        self._batcher = None
+
+    def _ensure_started(self):
+        # Create the queue, semaphore and batcher inside the running event loop.
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._in_flight = asyncio.Semaphore(self._max_in_flight)
+            self._batcher = asyncio.get_running_loop().create_task(self._run_batches())
+
+    async def price(self, amount, rate_code: int, frequency_code: int, amortization: int) -> float:
+        """
+        Price one loan as part of the next batch.
+        args:
+            amount: The loan amount.
+            rate_code(int): The MortgageRate code.
+            frequency_code(int): The MortgageFrequency code.
+            amortization(int): The amortization period in years.
+        returns:
+            The payment as a float.
+        raises:
+            ValueError: When the loan terms are invalid.
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((amount, rate_code, frequency_code, amortization, future))
+        return await future
+
+    async def _run_batches(self):
+        # Collect requests for one window (or until the batch is full), then
+        # price them all with a single call to the batch engine.
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._batch_window
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                self._price_batch(batch)
+            except Exception:
+                # Price the requests one at a time so only the request that
+                # cannot be priced fails, and the batcher keeps running.
+                for request in batch:
+                    try:
+                        self._price_batch([request])
+                    except Exception:
+                        if not request[-1].done():
+                            request[-1].set_exception(ValueError("Request could not be priced."))
+            self.requests += len(batch)
+            self.batches += 1
+
+    @staticmethod
+    def _price_batch(batch: list):
+        # Price a list of (amount, rate_code, frequency_code, amortization,
+        # future) requests and settle their futures.
+        amounts, rate_codes, frequency_codes, amortizations, futures = zip(*batch)
+        payments, errors = calculate_payments(amounts, rate_codes, frequency_codes, amortizations)
+        for future, payment, error in zip(futures, payments, errors):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(payment)
+            else:
+                future.set_exception(ValueError(error))
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        # Price one request line, write its response and release its slot.
+        request_id = None
+        try:
+            try:
+                request = _decode_request(line)
+                # Read the id first so every answer to a JSON object carries it.
+                request_id = request.get("id")
+                amount, rate_code, frequency_code, amortization = _parse_request(request)
+                response = {"id": request_id,
+                            "payment": await self.price(amount, rate_code, frequency_code, amortization)}
+            except ValueError as e:
+                response = {"id": request_id, "error": str(e)}
+            if not writer.is_closing():
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._in_flight.release()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve the requests of one connection until the client closes it.
+        Responses are written as they complete and carry the request id.
+        args:
+            reader(StreamReader): The connection's reader.
+            writer(StreamWriter): The connection's writer.
+        """
+        self._ensure_started()
+        pending = set()
+        try:
+            while True:
+                # Waiting for a slot before reading applies backpressure: the
+                # client's writes stall once the service is at capacity.
+                await self._in_flight.acquire()
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    # A reset connection, or a line longer than the stream limit.
+                    line = b""
+                if not line:
+                    self._in_flight.release()
+                    break
+                if not line.strip():
+                    self._in_flight.release()
+                    continue
+                task = asyncio.get_running_loop().create_task(self._respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: str = None):
+        """
+        Start listening on a TCP port, or on a Unix socket when path is given.
+        args:
+            host(str): The TCP host.
+            port(int): The TCP port; 0 picks a free port.
+            path(str): The Unix socket path.
+        returns:
+            The asyncio Server.
+        """
+        self._ensure_started()
+        if path:
+            return await asyncio.start_unix_server(self.handle_connection, path=path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def close(self):
+        """
+        Stop the batcher task.
+        returns:
+            None
+        """
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+
+async def watch_rates(interval: float = DEFAULT_RELOAD_INTERVAL):
+    """
+    Reload the rate file loaded into RATE_TABLES whenever it changes. A file
+    that fails to load is skipped and the current rate table is kept.
+    args:
+        interval(float): The seconds between checks.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            RATE_TABLES.reload()
+        except (OSError, ValueError):
+            pass
+
+
+async def serve(host: str, port: int, path: str = None, batch_window: float = DEFAULT_BATCH_WINDOW,
+                max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, rates: str = None,
+                reload_interval: float = DEFAULT_RELOAD_INTERVAL):
+    """
+    Run a pricing service until it is interrupted.
+    args:
+        host(str): The TCP host.
+        port(int): The TCP port.
+        path(str): The Unix socket path, used instead of TCP when given.
+        batch_window(float): The seconds spent collecting each batch.
+        max_in_flight(int): The largest number of requests accepted at once.
+        rates(str): The rate file to price with and watch for changes.
+        reload_interval(float): The seconds between checks of the rate file.
+    """
+    if rates:
+        RATE_TABLES.load(rates)
+        # Keep a reference so the watcher task is not garbage collected.
+        watcher = asyncio.get_running_loop().create_task(watch_rates(reload_interval))
+    service = PricingService(batch_window, max_in_flight=max_in_flight)
+    server = await service.start(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve mortgage pricing requests.")
+    parser.add_argument("--host", default="127.0.0.1", help="the TCP host")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="the TCP port")
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW,
+                        help="the seconds spent collecting each batch")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="the largest number of requests accepted at once")
+    parser.add_argument("--rates", help="the rate file to price with, reloaded when it changes")
+    parser.add_argument("--reload-interval", type=float, default=DEFAULT_RELOAD_INTERVAL,
+                        help="the seconds between checks of the rate file")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.batch_window, args.max_in_flight,
+                          args.rates, args.reload_interval))
+    except KeyboardInterrupt:
+        pass
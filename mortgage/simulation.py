@@ -0,0 +1,330 @@
+"""
+Description: A Monte Carlo simulator of the cash flows of a mortgage book under
+random prepayment and variable rate paths.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Pass the columns of a book (a portfolio or reader chunks) to simulate
+for the mean monthly cash flow, its deviation, the expected life of the book
+and the present value and life of every path; Simulation.percentiles gives
+percentiles of a path measure.
+    python -m mortgage.simulation PATH [--paths 1000] [--seed 0] [--workers N]
+Every loan starts from its current terms: the rate in the rate table, its
+annuity payment and its full amortization. Each path draws:
+    a rate shock: a random walk of the market rates, which the VARIABLE_*
+        rates follow. Variable loans reset their rate and payment to the
+        shocked rate every reset_months, over their remaining periods.
+    a prepayment rate: the annual cpr, scaled by random noise, plus a
+        refinancing incentive for fixed loans when the market rates fall.
+Prepayments leave loans unchanged apart from their number, so every fixed
+loan behaves like its (rate, frequency, amortization) group scaled by its
+loan amount, and the fixed groups share one survival factor per path. The
+fixed book is therefore projected once, and each path only scales it; the
+variable groups are projected per path, with every path of a block
+advanced together. Payments are not rounded to the cent, and each payment
+counts in the month it falls in.
+Paths are simulated in blocks, each with its own random stream seeded from
+the seed and the block number, so results do not depend on the number of
+worker processes. Blocks are merged into running statistics as they finish:
+memory is bounded by the block size and the horizon, plus two numbers per
+path.
+"""
+
+import argparse
+import math
+import random
+import sys
+from array import array
+from collections import namedtuple
+from itertools import repeat
+from operator import add, mul, sub
+
+from mortgage.batch import group_indexes, sum_by_group
+from mortgage.parallel import map_blocks
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, RATE_TABLES, GROUPS
+
+DEFAULT_PATHS = 1000
+DEFAULT_BLOCK_SIZE = 100
+
+# The behaviour of rates and borrowers. Rates and volatilities are annual.
+Assumptions = namedtuple("Assumptions", ["cpr", "prepayment_volatility", "refinance_sensitivity",
+                                         "rate_volatility", "reset_months", "discount_rate"],
+                         defaults=(0.06, 0.25, 2.0, 0.01, 12, 0.05))
+
+_VARIABLE_CODES = frozenset(code for code, rate in enumerate(RATES_BY_CODE) if rate.name.startswith("VARIABLE"))
+
+
+class Simulation(namedtuple("Simulation", ["paths", "mean_cash_flow", "cash_flow_deviation", "expected_life",
+                                           "present_values", "lives"])):
+    """
+    The statistics of a simulation.
+    values:
+        paths: The number of paths simulated.
+        mean_cash_flow: An array of the mean cash flow of each month.
+        cash_flow_deviation: An array of the standard deviation of each month's cash flow.
+        expected_life: The mean over paths of the book's weighted average life, in years.
+        present_values: An array of each path's cash flows discounted at the discount rate.
+        lives: An array of each path's weighted average life, in years.
+    """
+    __slots__ = ()
+
+    def percentiles(self, measure: str = "present_values", points=(5, 50, 95)) -> dict:
+        """
+        Percentiles of a path measure, interpolating between paths.
+        args:
+            measure(str): "present_values" or "lives".
+            points: The percentiles to calculate, from 0 to 100.
+        returns:
+            A dictionary of percentile to value.
+        """
+        values = sorted(getattr(self, measure))
+        result = {}
+        for point in points:
+            position = (len(values) - 1) * point / 100
+            low = math.floor(position)
+            high = min(low + 1, len(values) - 1)
+            result[point] = values[low] + (values[high] - values[low]) * (position - low)
+        return result
+
+
+def _annuity(i: float, n: int) -> float:
+    # The payment per dollar of a loan repaid over n periods at rate i.
+    return i * (1 + i) ** n / ((1 + i) ** n - 1) if i > 0 else 1 / n
+
+
+def _step(i: float, k: int) -> tuple:
+    # The growth of a balance and of a payment stream over k periods at rate i:
+    # after k payments of p, a balance b is b * growth - p * accrual.
+    growth = (1 + i) ** k
+    return growth, (growth - 1) / i if i > 0 else k
+
+
+def _periods_in_month(frequency: int, month: int) -> int:
+    # The number of payments falling in a month of the loan's life.
+    return (month + 1) * frequency // 12 - month * frequency // 12
+
+
+def _fixed_projection(groups: list, horizon: int) -> tuple:
+    # The scheduled cash flow and the balance left after each month of every
+    # fixed group together, for loans that do not prepay.
+    cash = [0.0] * horizon
+    balances = [0.0] * horizon
+    for rate_code, frequency, amortization, pool, rate, factor in groups:
+        if rate_code in _VARIABLE_CODES:
+            continue
+        i = rate / frequency
+        remaining = amortization * frequency
+        balance = pool
+        payment = pool * factor
+        for month in range(amortization * 12):
+            k = min(_periods_in_month(frequency, month), remaining)
+            growth, accrual = _step(i, k)
+            balance = balance * growth - payment * accrual
+            remaining -= k
+            if not remaining:
+                # The last payment clears what rounding has left.
+                cash[month] += payment * k + balance
+                balance = 0.0
+            else:
+                cash[month] += payment * k
+            balances[month] += balance
+    return cash, balances
+
+
+def _variable_projection(groups: list, horizon: int, shocks: list, reset_months: int, count: int) -> tuple:
+    # The scheduled cash flow and the balance left after each month of every
+    # variable group together, per path, for loans that do not prepay.
+    cash = [[0.0] * count for _ in range(horizon)]
+    balances = [[0.0] * count for _ in range(horizon)]
+    for rate_code, frequency, amortization, pool, rate, factor in groups:
+        if rate_code not in _VARIABLE_CODES:
+            continue
+        remaining = amortization * frequency
+        balance = [pool] * count
+        payment = [pool * factor] * count
+        rates = [rate / frequency] * count
+        steps = {}
+        for month in range(amortization * 12):
+            if month and not month % reset_months:
+                rates = [max(rate + shock, 0.0) / frequency for shock in shocks[month]]
+                payment = list(map(mul, balance, map(_annuity, rates, repeat(remaining))))
+                steps = {}
+            k = min(_periods_in_month(frequency, month), remaining)
+            if k not in steps:
+                steps[k] = tuple(map(list, zip(*map(_step, rates, repeat(k)))))
+            growth, accrual = steps[k]
+            balance = list(map(sub, map(mul, balance, growth), map(mul, payment, accrual)))
+            remaining -= k
+            paid = map(mul, payment, repeat(k))
+            if not remaining:
+                paid = map(add, paid, balance)
+                balance = [0.0] * count
+            cash[month] = list(map(add, cash[month], paid))
+            balances[month] = list(map(add, balances[month], balance))
+    return cash, balances
+
+
+def _simulate_block(task: tuple) -> tuple:
+    # Simulate one block of paths with its own random stream, returning the
+    # path count, the mean and sum of squared deviations of each month's cash
+    # flow, and each path's present value and life.
+    block, count, seed, groups, horizon, fixed, assumptions = task
+    generator = random.Random(f"{seed}:{block}")
+    gauss = generator.gauss
+    cpr, prepayment_volatility, refinance_sensitivity, rate_volatility, reset_months, discount_rate = assumptions
+    monthly_volatility = rate_volatility / math.sqrt(12)
+
+    # The market rate shock of every path in every month, starting at zero.
+    shocks = [[0.0] * count]
+    for _ in range(horizon - 1):
+        shocks.append([shock + monthly_volatility * gauss() for shock in shocks[-1]])
+    variable_cash, variable_balances = _variable_projection(groups, horizon, shocks, reset_months, count)
+    fixed_cash, fixed_balances = fixed
+    book = math.fsum(group[3] for group in groups)
+
+    fixed_survival = [1.0] * count
+    variable_survival = [1.0] * count
+    previous = [book] * count
+    present_values = [0.0] * count
+    lives = [0.0] * count
+    means = []
+    squares = []
+    for month in range(horizon):
+        noise = [math.exp(prepayment_volatility * gauss() - prepayment_volatility ** 2 / 2) for _ in range(count)]
+        fixed_prepaid = [1 - (1 - min(max(cpr * scale + refinance_sensitivity * max(-shock, 0.0), 0.0), 1.0))
+                         ** (1 / 12) for scale, shock in zip(noise, shocks[month])]
+        variable_prepaid = [1 - (1 - min(cpr * scale, 1.0)) ** (1 / 12) for scale in noise]
+        # Loans that survived last month pay their schedule, then a fraction of
+        # the balance they have left is prepaid.
+        cash = [fixed_alive * (fixed_cash[month] + fixed_rate * fixed_balances[month])
+                + variable_alive * (paid + variable_rate * balance)
+                for fixed_alive, fixed_rate, variable_alive, variable_rate, paid, balance in zip(
+                    fixed_survival, fixed_prepaid, variable_survival, variable_prepaid,
+                    variable_cash[month], variable_balances[month])]
+        fixed_survival = [alive * (1 - rate) for alive, rate in zip(fixed_survival, fixed_prepaid)]
+        variable_survival = [alive * (1 - rate) for alive, rate in zip(variable_survival, variable_prepaid)]
+        outstanding = [fixed_alive * fixed_balances[month] + variable_alive * balance
+                       for fixed_alive, variable_alive, balance in zip(fixed_survival, variable_survival,
+                                                                       variable_balances[month])]
+        years = (month + 1) / 12
+        lives = [life + years * (before - after) for life, before, after in zip(lives, previous, outstanding)]
+        previous = outstanding
+        discount = (1 + discount_rate / 12) ** -(month + 1)
+        present_values = [value + discount * flow for value, flow in zip(present_values, cash)]
+        mean = math.fsum(cash) / count
+        means.append(mean)
+        squares.append(math.fsum((flow - mean) ** 2 for flow in cash))
+    return count, means, squares, present_values, [life / book for life in lives]
+
+
+def simulate(loan_amounts, rate_codes, frequency_codes, amortizations, paths: int = DEFAULT_PATHS,
+             seed=0, assumptions: Assumptions = Assumptions(), block_size: int = DEFAULT_BLOCK_SIZE,
+             workers: int = 1, rate_table=None) -> Simulation:
+    """
+    Simulate the monthly cash flows of a book over its whole life.
+    args:
+        loan_amounts: A sequence of loan amounts.
+        rate_codes: A sequence of MortgageRate codes.
+        frequency_codes: A sequence of MortgageFrequency codes.
+        amortizations: A sequence of amortization periods in years.
+        paths(int): The number of paths.
+        seed: The seed of the random streams; the same seed and block size
+            give the same results.
+        assumptions(Assumptions): The prepayment and rate behaviour.
+        block_size(int): The number of paths simulated together.
+        workers(int): The number of worker processes, one per CPU when None.
+        rate_table(RateTable): The starting rates, the current table when None.
+    returns:
+        A Simulation, with one month per month of the longest amortization.
+    raises:
+        ValueError: When the arguments are invalid, or with the Mortgage
+            message of the first invalid loan.
+    """
+    if not len(loan_amounts) == len(rate_codes) == len(frequency_codes) == len(amortizations):
+        raise ValueError("Columns must all be the same length.")
+    if not len(loan_amounts):
+        raise ValueError("Book must hold at least one loan.")
+    if paths <= 0:
+        raise ValueError("Path count must be positive.")
+    if block_size <= 0:
+        raise ValueError("Block size must be positive.")
+    if workers is not None and workers <= 0:
+        raise ValueError("Worker count must be positive.")
+    if rate_table is None:
+        rate_table = RATE_TABLES.current
+    pools = sum_by_group(loan_amounts, group_indexes(array("d", loan_amounts), rate_codes, frequency_codes,
+                                                     amortizations))
+    groups = [(rate_code, FREQUENCIES_BY_CODE[frequency_code].value, amortization, pool,
+               rate_table.rates_by_code[rate_code], rate_table.factors_by_code[(rate_code, frequency_code,
+                                                                                amortization)])
+              for (rate_code, frequency_code, amortization), pool in zip(GROUPS, pools) if pool]
+    horizon = 12 * max(group[2] for group in groups)
+    fixed = _fixed_projection(groups, horizon)
+    tasks = [(block, min(block_size, paths - start), seed, groups, horizon, fixed, tuple(assumptions))
+             for block, start in enumerate(range(0, paths, block_size))]
+
+    count = 0
+    means = [0.0] * horizon
+    squares = [0.0] * horizon
+    present_values = array("d")
+    lives = array("d")
+    for block_count, block_means, block_squares, block_values, block_lives in map_blocks(
+            _simulate_block, tasks, workers):
+        # Merge the block into the running mean and squared deviations.
+        total = count + block_count
+        for month in range(horizon):
+            delta = block_means[month] - means[month]
+            means[month] += delta * block_count / total
+            squares[month] += block_squares[month] + delta * delta * count * block_count / total
+        count = total
+        present_values.extend(block_values)
+        lives.extend(block_lives)
+    deviations = array("d", (math.sqrt(square / count) for square in squares))
+    return Simulation(count, array("d", means), deviations, math.fsum(lives) / count, present_values, lives)
+
+
+def main(argv=None) -> int:
+    """
+    Print the expected life, present value percentiles and yearly mean cash
+    flows of a mortgage file.
+    args:
+        argv(list): The command line arguments, sys.argv[1:] when None.
+    returns:
+        The exit status.
+    """
+    from mortgage.cli import positive_int
+    from mortgage.columnar import ColumnarBook, is_columnar
+    from mortgage.reader import read_chunks
+
+    parser = argparse.ArgumentParser(description="Simulate the cash flows of a mortgage file.")
+    parser.add_argument("path", help="the text mortgage file or columnar book to simulate")
+    parser.add_argument("--paths", type=positive_int, default=DEFAULT_PATHS, help="the number of paths")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the random streams")
+    parser.add_argument("--workers", type=positive_int, default=1, help="the number of worker processes")
+    args = parser.parse_args(argv)
+
+    try:
+        if is_columnar(args.path):
+            with ColumnarBook(args.path) as book:
+                result = simulate(book.amounts, book.rate_codes, book.frequency_codes, book.amortizations,
+                                  paths=args.paths, seed=args.seed, workers=args.workers)
+        else:
+            columns = (array("d"), array("B"), array("B"), array("B"))
+            for chunk in read_chunks(args.path):
+                for column, values in zip(columns, (chunk.amounts, chunk.rate_codes, chunk.frequency_codes,
+                                                    chunk.amortizations)):
+                    column.extend(values)
+            result = simulate(*columns, paths=args.paths, seed=args.seed, workers=args.workers)
+    except FileNotFoundError as e:
+        print(f"File not found: {e}")
+        return 1
+    print(f"Expected life: {result.expected_life:.2f} years")
+    for point, value in result.percentiles().items():
+        print(f"Present value P{point}: ${value:,.2f}")
+    for month in range(0, len(result.mean_cash_flow), 12):
+        print(f"Month {month + 1:3d}: ${result.mean_cash_flow[month]:,.2f} "
+              f"(+/- ${result.cash_flow_deviation[month]:,.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
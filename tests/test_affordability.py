@@ -0,0 +1,123 @@
+"""
+Description: A class used to test the affordability solver.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test the largest loans
+and plan rankings against calculate_payment.
+"""
+import os
+import random
+import subprocess
+import sys
+import unittest
+from mortgage.affordability import maximum_loans, rank_plans, cheapest_plans
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import MortgageFrequency, RATES_BY_CODE, FREQUENCIES_BY_CODE, RATE_TABLES, GROUPS
+
+def payment(loan_amount: float, plan: int) -> float:
+    # The payment calculate_payment gives for a loan on one plan.
+    rate_code, frequency_code, amortization = GROUPS[plan]
+    return Mortgage(loan_amount, RATES_BY_CODE[rate_code], FREQUENCIES_BY_CODE[frequency_code],
+                    amortization).calculate_payment()
+
+def plan_budget(budget: float, plan: int, budget_frequency=MortgageFrequency.MONTHLY) -> float:
+    # The share of a budget one payment of a plan may spend.
+    return budget * (budget_frequency.value / FREQUENCIES_BY_CODE[GROUPS[plan][1]].value)
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+class AffordabilityTests(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(7)
+        self.budgets = [round(generator.uniform(50, 9000), 2) for _ in range(20)] + [584.59, 0.01]
+
+    def test_maximum_loans_agree_with_calculate_payment(self):
+        #Test that the largest loan fits the budget and a cent more does not, on every plan.
+        #Act
+        loans = maximum_loans(self.budgets)
+        #Assert
+        self.assertEqual(len(GROUPS), len(loans))
+        for plan, column in enumerate(loans):
+            for budget, loan in zip(self.budgets, column):
+                if loan > 0:
+                    self.assertLessEqual(payment(loan, plan), plan_budget(budget, plan))
+                self.assertGreater(payment((round(loan * 100) + 1) / 100, plan), plan_budget(budget, plan))
+
+    def test_maximum_loan_of_known_payment(self):
+        #Test that a budget equal to a known payment allows at least that loan.
+        #Arrange
+        plan = GROUPS.index((0, 0, 25))
+        #Act
+        loan = maximum_loans([584.59])[plan][0]
+        #Assert
+        self.assertGreaterEqual(loan, 100000)
+        self.assertEqual(584.59, payment(loan, plan))
+
+    def test_maximum_loans_use_rate_table(self):
+        #Test that a rate table snapshot is used for the factors.
+        #Arrange
+        table = RATE_TABLES.current.with_rates({rate: value + 0.01
+                                                for rate, value in RATE_TABLES.current.rates.items()})
+        #Act
+        current = maximum_loans([1000.0])
+        shocked = maximum_loans([1000.0], table)
+        #Assert
+        self.assertTrue(all(high[0] > low[0] for high, low in zip(current, shocked)))
+
+    def test_rank_plans_matches_sorted_payments(self):
+        #Test that the ranking holds exactly the affordable plans, by yearly payments.
+        #Arrange
+        generator = random.Random(3)
+        amounts = [round(generator.uniform(50000, 900000), 2) for _ in self.budgets]
+        #Act
+        ranked = rank_plans(amounts, self.budgets, block_size=7)
+        cheapest = cheapest_plans(amounts, self.budgets, block_size=7)
+        #Assert
+        for amount, budget, plans, best in zip(amounts, self.budgets, ranked, cheapest):
+            payments = [payment(amount, plan) for plan in range(len(GROUPS))]
+            affordable = {plan for plan in range(len(GROUPS)) if payments[plan] <= plan_budget(budget, plan)}
+            self.assertEqual(affordable, set(plans))
+            yearly = [payments[plan] * FREQUENCIES_BY_CODE[GROUPS[plan][1]].value for plan in plans]
+            self.assertEqual(sorted(yearly), yearly)
+            self.assertEqual(plans[0] if plans else -1, best)
+
+    def test_budget_is_spread_over_each_plan_frequency(self):
+        #Test that a monthly budget allows weekly plans the same yearly spend, not the same payment.
+        #Act
+        cheapest = cheapest_plans([100000], [500])
+        weekly = rank_plans([100000], [500], budget_frequency=MortgageFrequency.WEEKLY)
+        loans = maximum_loans([520], budget_frequency=MortgageFrequency.WEEKLY)
+        weekly_plan = GROUPS.index((0, 2, 25))
+        monthly_plan = GROUPS.index((0, 0, 25))
+        #Assert
+        self.assertEqual(-1, cheapest[0])
+        self.assertIn(GROUPS.index((0, 2, 30)), weekly[0])
+        self.assertIn(GROUPS.index((0, 0, 30)), weekly[0])
+        self.assertLessEqual(payment(loans[weekly_plan][0], weekly_plan), 520)
+        self.assertGreater(payment(loans[weekly_plan][0] + 0.01, weekly_plan), 520)
+        self.assertLessEqual(payment(loans[monthly_plan][0], monthly_plan), 520 * 52 / 12)
+        self.assertAlmostEqual(1, loans[monthly_plan][0] / loans[weekly_plan][0], delta=0.01)
+
+    def test_invalid_columns(self):
+        #Test that invalid budgets, loan amounts and columns are rejected.
+        #Act and Assert
+        for call, message in [(lambda: maximum_loans([100, 0]), "Payment budget must be positive."),
+                              (lambda: rank_plans([-5], [100]), "Loan amount must be positive."),
+                              (lambda: rank_plans([5, 6], [100]), "Columns must all be the same length."),
+                              (lambda: cheapest_plans([5], [float("nan")]), "Payment budget must be positive."),
+                              (lambda: maximum_loans([float("inf")]), "Payment budget must be a finite number."),
+                              (lambda: rank_plans([float("inf")], [100]), "Loan amount must be a finite number."),
+                              (lambda: maximum_loans([100], budget_frequency="MONTHLY"),
+                               "Frequency provided is invalid.")]:
+            with self.assertRaises(ValueError) as context:
+                call()
+            self.assertEqual(message, str(context.exception))
+
+    def test_import_does_not_load_scenarios(self):
+        #Test that importing the solver does not load the scenario engine or its pools.
+        #Act
+        result = subprocess.run([sys.executable, "-c", "import sys, mortgage.affordability; "
+                                 "print(sorted({'mortgage.scenarios', 'multiprocessing', 'argparse'} & "
+                                 "set(sys.modules)))"], cwd=ROOT, capture_output=True, text=True, check=True)
+        #Assert
+        self.assertEqual("[]", result.stdout.strip())
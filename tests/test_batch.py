@@ -0,0 +1,104 @@
+"""
+Description: A class used to test the batch payment engine.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test the column-oriented batch functions.
+"""
+import math
+import unittest
+from mortgage.batch import calculate_payments, calculate_balances, calculate_schedules, build_mortgages
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import (RATES_BY_CODE, FREQUENCIES_BY_CODE, VALID_AMORTIZATION,
+                                    MortgageRate, MortgageFrequency)
+
+class BatchTests(unittest.TestCase):
+    def test_payments_match_calculate_payment(self):
+        #Test that every combination of terms prices to the same cent as Mortgage.
+        #Arrange
+        amounts, rate_codes, frequency_codes, amortizations = [], [], [], []
+        for rate_code in range(len(RATES_BY_CODE)):
+            for frequency_code in range(len(FREQUENCIES_BY_CODE)):
+                for amortization in VALID_AMORTIZATION:
+                    amounts.append(682912.43 + rate_code + amortization)
+                    rate_codes.append(rate_code)
+                    frequency_codes.append(frequency_code)
+                    amortizations.append(amortization)
+        expected = [Mortgage(amount, RATES_BY_CODE[rate_code], FREQUENCIES_BY_CODE[frequency_code],
+                             amortization).calculate_payment()
+                    for amount, rate_code, frequency_code, amortization
+                    in zip(amounts, rate_codes, frequency_codes, amortizations)]
+        #Act
+        payments, errors = calculate_payments(amounts, rate_codes, frequency_codes, amortizations)
+        #Assert
+        self.assertEqual(expected, list(payments))
+        self.assertEqual([None] * len(amounts), errors)
+
+    def test_invalid_rows_are_reported(self):
+        #Test that invalid rows are flagged without stopping the batch.
+        #Arrange
+        amounts = [100, -100, 100, 100, 100]
+        rate_codes = [0, 0, 99, 0, 0]
+        frequency_codes = [0, 0, 0, 99, 0]
+        amortizations = [25, 25, 25, 25, 22]
+        expected = [None, "Loan amount must be positive.", "Rate provided is invalid.",
+                    "Frequency provided is invalid.", "Amortization provided is invalid."]
+        #Act
+        payments, errors = calculate_payments(amounts, rate_codes, frequency_codes, amortizations)
+        #Assert
+        self.assertEqual(expected, errors)
+        self.assertFalse(math.isnan(payments[0]))
+        self.assertTrue(all(math.isnan(payment) for payment in payments[1:]))
+
+    def test_mismatched_columns(self):
+        #Test that a ValueError is raised when the columns differ in length.
+        #Arrange
+        expected = "Columns must all be the same length."
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            calculate_payments([100, 200], [0], [0], [25])
+        self.assertEqual(expected, str(context.exception))
+
+    def test_schedules_match_mortgage_schedule(self):
+        #Test that the column schedules match Mortgage.schedule loan by loan.
+        #Arrange
+        first = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 5)
+        second = Mortgage(100000, MortgageRate.VARIABLE_3, MortgageFrequency.BI_WEEKLY, 10)
+        expected = [(0,) + tuple(row) for row in first.schedule()] + [(2,) + tuple(row) for row in second.schedule()]
+        #Act
+        columns = calculate_schedules([682912.43, -1, 100000], [2, 0, 4], [0, 0, 1], [5, 25, 10])
+        #Assert
+        self.assertEqual(expected, list(zip(*columns)))
+
+    def test_balances_match_balance_at(self):
+        #Test that the column balances match Mortgage.balance_at.
+        #Arrange
+        mortgage = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 30)
+        #Act
+        balances = calculate_balances([682912.43, 100], [2, 0], [0, 0], [30, 5], 120)
+        #Assert
+        self.assertEqual(mortgage.balance_at(120), balances[0])
+        self.assertTrue(math.isnan(balances[1]))
+
+    def test_build_mortgages_matches_constructor(self):
+        #Test that bulk-built mortgages match mortgages built one at a time.
+        #Arrange
+        expected = [Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.WEEKLY, 30),
+                    Mortgage(100, MortgageRate.VARIABLE_5, MortgageFrequency.MONTHLY, 5)]
+        #Act
+        mortgages = build_mortgages([682912.43, 100], [2, 3], [2, 0], [30, 5])
+        #Assert
+        self.assertEqual([type(mortgage) for mortgage in expected], [type(mortgage) for mortgage in mortgages])
+        self.assertEqual([str(mortgage) for mortgage in expected], [str(mortgage) for mortgage in mortgages])
+
+    def test_build_mortgages_reports_first_invalid_row(self):
+        #Test that bulk construction raises the Mortgage message of the first invalid row.
+        #Arrange
+        cases = [([100, float("nan")], [0, 0], [0, 0], [25, 25], "Loan amount must be positive."),
+                 ([100, 100], [0, 6], [0, 0], [25, 25], "Rate provided is invalid."),
+                 ([100, 100], [0, 0], [3, 0], [25, 22], "Frequency provided is invalid."),
+                 ([100, 100], [0, 0], [0, 0], [25, 22], "Amortization provided is invalid.")]
+        for amounts, rate_codes, frequency_codes, amortizations, expected in cases:
+            #Act and Assert
+            with self.assertRaises(ValueError) as context:
+                build_mortgages(amounts, rate_codes, frequency_codes, amortizations)
+            self.assertEqual(expected, str(context.exception))
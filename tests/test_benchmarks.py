@@ -0,0 +1,41 @@
+"""
+Description: A class used to test the benchmark suite helpers.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test the synthetic data
+generator and the baseline comparison.
+"""
+import unittest
+from benchmarks.suite import compare
+from benchmarks.synthetic import generate_rows
+from mortgage.reader import parse_lines
+
+class BenchmarkTests(unittest.TestCase):
+    def test_synthetic_rows_parse(self):
+        #Test that generated rows use the mortgage file format and price as expected.
+        #Arrange
+        lines = [line for block in generate_rows(1000, seed=1, bad_fraction=0) for line in block]
+        #Act
+        chunk = next(parse_lines(lines))
+        #Assert
+        self.assertEqual(1000, len(chunk.amounts))
+        self.assertEqual([], chunk.rejected)
+
+    def test_synthetic_bad_rows_are_rejected(self):
+        #Test that every generated bad row is rejected by the reader.
+        #Arrange
+        lines = [line for block in generate_rows(100, seed=1, bad_fraction=1) for line in block]
+        #Act
+        chunk = next(parse_lines(lines))
+        #Assert
+        self.assertEqual(100, len(chunk.rejected))
+
+    def test_compare_flags_slowdown(self):
+        #Test that only stages slower than the threshold are reported.
+        #Arrange
+        baseline = {"stages": {"parse": {"loans_per_sec": 1000}, "client": {"loans_per_sec": 1000}}}
+        results = {"stages": {"parse": {"loans_per_sec": 800}, "client": {"loans_per_sec": 950}}}
+        #Act
+        regressions = compare(results, baseline, 0.10)
+        #Assert
+        self.assertEqual(["parse"], [stage for stage, *_ in regressions])
@@ -0,0 +1,149 @@
+"""
+Description: A class used to test exact pricing in integer cents.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test the rounding rule,
+the agreement of the scalar, batch and parallel paths, and the error messages.
+"""
+import contextlib
+import io
+import math
+import os
+import random
+import unittest
+from mortgage.batch import calculate_payments
+from mortgage.cents import (to_cents, to_cents_column, format_cents, price_cents, calculate_payments_cents,
+                            calculate_payments_exact)
+from mortgage.cli import main
+from mortgage.mortgage import Mortgage
+from mortgage.parallel import price_file
+from mortgage.pixell_lookup import (MortgageRate, MortgageFrequency, RATES_BY_CODE, FREQUENCIES_BY_CODE,
+                                     VALID_AMORTIZATION)
+from mortgage.reader import read_chunks
+from mortgage.report import render_text
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "pixell_river_mortgages.txt")
+
+class CentsTests(unittest.TestCase):
+    def test_known_payment(self):
+        #Test that the known payment is priced exactly.
+        #Arrange
+        mortgage = Mortgage(100000, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25)
+        #Act
+        payment = mortgage.calculate_payment_cents()
+        #Assert
+        self.assertEqual(58459, payment)
+        self.assertEqual("584.59", format_cents(payment))
+
+    def test_to_cents_rounds_half_up(self):
+        #Test that amounts round half up from their decimal form, not their binary value.
+        #Act and Assert
+        self.assertEqual(10001, to_cents(100.005))
+        self.assertEqual(101, to_cents(1.005))
+        self.assertEqual(100, to_cents(1.004))
+        self.assertEqual(12345, to_cents("123.45"))
+        self.assertEqual(500, to_cents(5))
+
+    def test_scalar_and_batch_agree(self):
+        #Test that price_cents, Mortgage.calculate_payment_cents and the batch give identical cents.
+        #Arrange
+        generator = random.Random(3)
+        rows = [(round(generator.uniform(1, 2000000), generator.randint(0, 3)),
+                 generator.randrange(len(RATES_BY_CODE)), generator.randrange(len(FREQUENCIES_BY_CODE)),
+                 generator.choice(VALID_AMORTIZATION))
+                for _ in range(2000)]
+        amounts, rate_codes, frequency_codes, amortizations = map(list, zip(*rows))
+        #Act
+        payments, errors = calculate_payments_cents(to_cents_column(amounts), rate_codes, frequency_codes,
+                                                    amortizations)
+        #Assert
+        self.assertEqual(len(rows), errors.count(None))
+        for (amount, rate_code, frequency_code, amortization), payment in zip(rows, payments):
+            rate, frequency = RATES_BY_CODE[rate_code], FREQUENCIES_BY_CODE[frequency_code]
+            self.assertEqual(payment, price_cents(to_cents(amount), rate, frequency, amortization))
+            self.assertEqual(payment, Mortgage(amount, rate, frequency, amortization).calculate_payment_cents())
+
+    def test_exact_agrees_with_float_payments_on_data_file(self):
+        #Test that exact pricing gives the float payments for every loan in the data file.
+        for chunk in read_chunks(DATA_FILE):
+            #Act
+            expected = calculate_payments(chunk.amounts, chunk.rate_codes, chunk.frequency_codes,
+                                          chunk.amortizations)
+            actual = calculate_payments_exact(chunk.amounts, chunk.rate_codes, chunk.frequency_codes,
+                                              chunk.amortizations)
+            #Assert
+            self.assertEqual(expected[1], actual[1])
+            for payment, exact, error in zip(expected[0], actual[0], expected[1]):
+                if error is None:
+                    self.assertEqual(payment, exact)
+
+    def test_parallel_exact_matches_single_process(self):
+        #Test that worker processes produce the exact single-process report.
+        #Arrange
+        expected = "".join(render_text(chunk, *calculate_payments_exact(chunk.amounts, chunk.rate_codes,
+                                                                        chunk.frequency_codes,
+                                                                        chunk.amortizations))
+                           for chunk in read_chunks(DATA_FILE))
+        #Act
+        actual = "".join(price_file(DATA_FILE, 2, range_size=100, exact=True))
+        #Assert
+        self.assertEqual(expected, actual)
+
+    def test_invalid_rows_report_mortgage_errors(self):
+        #Test that invalid rows get the Mortgage error messages and do not stop the batch.
+        #Act
+        payments, errors = calculate_payments_cents([10000000, 0, 10000000, 10000000, 10000000],
+                                                    [0, 0, 9, 0, 0], [0, 0, 0, 9, 0], [25, 25, 25, 25, 31])
+        #Assert
+        self.assertEqual([None, "Loan amount must be positive.", "Rate provided is invalid.",
+                          "Frequency provided is invalid.", "Amortization provided is invalid."], errors)
+        self.assertEqual(58459, payments[0])
+        self.assertEqual(0, payments[1])
+
+    def test_price_cents_raises_mortgage_errors(self):
+        #Test that price_cents and to_cents raise ValueError with the Mortgage messages.
+        #Act and Assert
+        with self.assertRaisesRegex(ValueError, "Loan amount must be positive."):
+            price_cents(-1, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25)
+        with self.assertRaisesRegex(ValueError, "Rate provided is invalid."):
+            price_cents(100, "FIXED_5", MortgageFrequency.MONTHLY, 25)
+        with self.assertRaisesRegex(ValueError, "Amortization provided is invalid."):
+            price_cents(100, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 40)
+
+    def test_to_cents_messages_match_the_failure(self):
+        #Test that to_cents reports what went wrong with an amount.
+        #Act and Assert
+        for amount in (float("nan"), float("inf"), "Infinity"):
+            with self.assertRaisesRegex(ValueError, "Loan amount must be a finite number."):
+                to_cents(amount)
+        with self.assertRaisesRegex(ValueError, "Loan amount must be a number."):
+            to_cents("abc")
+        with self.assertRaisesRegex(ValueError, "Loan amount is too large."):
+            to_cents_column([1e20])
+
+    def test_exact_batch_reports_unconvertible_rows(self):
+        #Test that amounts that cannot be priced in cents become row errors and do not stop the batch.
+        #Arrange
+        amounts = [100000, 1e20, float("inf"), float("nan"), 100000]
+        #Act
+        payments, errors = calculate_payments_exact(amounts, [0, 2, 0, 0, 0], [0] * 5, [25, 10, 25, 25, 25])
+        #Assert
+        self.assertEqual([None, "Loan amount is too large.", "Loan amount must be a finite number.",
+                          "Loan amount must be positive.", None], errors)
+        self.assertEqual(584.59, payments[0])
+        self.assertEqual(584.59, payments[4])
+        self.assertTrue(math.isnan(payments[1]))
+
+    def test_price_exact_reports_infinite_amount(self):
+        #Test that the exact price command names the problem with an infinite amount.
+        #Arrange
+        error = io.StringIO()
+        #Act
+        with contextlib.redirect_stderr(error):
+            status = main(["price", "1e400", "FIXED_1", "10", "MONTHLY", "--exact"])
+        #Assert
+        self.assertEqual(1, status)
+        self.assertEqual("Loan amount must be a finite number.\n", error.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
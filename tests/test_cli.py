@@ -0,0 +1,121 @@
+"""
+Description: A class used to test the command line entry point.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test the CLI modes and
+the import cost of the single-loan path.
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from mortgage.cli import main, price
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRICE_ARGUMENTS = ["price", "100000", "FIXED_5", "25", "MONTHLY"]
+# The modules the single-loan path may import from this repository, and the
+# import time it may spend on them, in microseconds of -X importtime output.
+PRICE_MODULES = {"mortgage", "mortgage.cli", "mortgage.mortgage", "mortgage.pixell_lookup"}
+IMPORT_BUDGET_US = 60000
+
+def import_times(arguments: list) -> dict:
+    # Run main.py with -X importtime and return the cumulative microseconds of
+    # every module it imported.
+    result = subprocess.run([sys.executable, "-X", "importtime", "main.py"] + arguments, cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = (int(cumulative), len(name) - len(name.lstrip()))
+    return times
+
+class CliTests(unittest.TestCase):
+    def test_price(self):
+        #Test that a single loan is priced from its file fields.
+        #Act
+        payment = price("100000", "FIXED_5", "25", "MONTHLY")
+        #Assert
+        self.assertEqual(584.59, payment)
+
+    def test_price_invalid_fields(self):
+        #Test that invalid fields raise the Mortgage error messages.
+        #Arrange
+        cases = [(("-1", "FIXED_5", "25", "MONTHLY"), "Loan amount must be positive."),
+                 (("100", "FIXED_55", "25", "MONTHLY"), "Rate provided is invalid."),
+                 (("100", "FIXED_5", "25", "DAILY"), "Frequency provided is invalid."),
+                 (("100", "FIXED_5", "22", "MONTHLY"), "Amortization provided is invalid.")]
+        for fields, expected in cases:
+            #Act and Assert
+            with self.assertRaises(ValueError) as context:
+                price(*fields)
+            self.assertEqual(expected, str(context.exception))
+
+    def test_price_command_output(self):
+        #Test that the price mode prints the payment and exits with 0.
+        #Arrange
+        output = io.StringIO()
+        #Act
+        with contextlib.redirect_stdout(output):
+            status = main(PRICE_ARGUMENTS)
+        #Assert
+        self.assertEqual(0, status)
+        self.assertEqual("584.59\n", output.getvalue())
+
+    def test_report_mode_is_default(self):
+        #Test that the original client interface and the report mode write the same report.
+        #Arrange
+        path = os.path.join(ROOT, "data", "pixell_river_mortgages.txt")
+        with tempfile.TemporaryDirectory() as directory:
+            first = os.path.join(directory, "first.csv")
+            second = os.path.join(directory, "second.csv")
+            #Act
+            main([path, "--format", "csv", "--output", first])
+            main(["report", path, "--format", "csv", "--output", second])
+            with open(first, "r") as input:
+                expected = input.read()
+            with open(second, "r") as input:
+                actual = input.read()
+        #Assert
+        self.assertEqual(16, len(expected.splitlines()))
+        self.assertEqual(expected, actual)
+
+    def test_report_rejects_non_positive_workers(self):
+        #Test that the report mode exits with a usage error for worker counts below one.
+        for workers in ("0", "-3"):
+            #Act and Assert
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as context:
+                main(["--workers", workers])
+            self.assertEqual(2, context.exception.code)
+
+    def test_unloadable_rate_files_are_reported(self):
+        #Test that missing and malformed rate files give an error on stderr and a non-zero status.
+        #Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            malformed = os.path.join(directory, "rates.txt")
+            with open(malformed, "w") as file:
+                file.write("not a rate table\n")
+            for rates in (os.path.join(directory, "missing.txt"), malformed):
+                for argv in (["--rates", rates], ["price", "100000", "FIXED_5", "25", "MONTHLY", "--rates", rates]):
+                    error = io.StringIO()
+                    #Act
+                    with contextlib.redirect_stderr(error), contextlib.redirect_stdout(io.StringIO()):
+                        status = main(argv)
+                    #Assert
+                    self.assertEqual(1, status)
+                    self.assertTrue(error.getvalue().strip())
+
+    def test_price_path_imports(self):
+        #Test that the single-loan path imports only the Mortgage modules, within the time budget.
+        #Act
+        runs = [import_times(PRICE_ARGUMENTS) for _ in range(3)]
+        #Assert
+        for times in runs:
+            self.assertEqual(PRICE_MODULES, {name for name in times if name.split(".")[0] == "mortgage"})
+            self.assertNotIn("argparse", times)
+        spent = min(sum(cumulative for name, (cumulative, level) in times.items()
+                        if level == 1 and name.split(".")[0] == "mortgage") for times in runs)
+        self.assertLess(spent, IMPORT_BUDGET_US)
@@ -0,0 +1,84 @@
+"""
+Description: A class used to test the columnar mortgage book format.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test convert and ColumnarBook.
+"""
+import os
+import tempfile
+import unittest
+from mortgage.batch import calculate_payments
+from mortgage.columnar import ColumnarBook, convert, is_columnar
+from mortgage.reader import read_chunks
+from mortgage.report import render_text
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "pixell_river_mortgages.txt")
+
+class ColumnarTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.book_path = os.path.join(self.directory.name, "book.pxm")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_columns(self):
+        #Test that the book holds the same columns as the parsed text file.
+        #Arrange
+        chunk = next(read_chunks(DATA_FILE))
+        #Act
+        rows, rejected = convert(DATA_FILE, self.book_path)
+        #Assert
+        self.assertEqual((len(chunk.amounts), len(chunk.rejected)), (rows, rejected))
+        self.assertTrue(is_columnar(self.book_path))
+        self.assertFalse(is_columnar(DATA_FILE))
+        with ColumnarBook(self.book_path) as book:
+            self.assertEqual(rows, len(book))
+            self.assertEqual(list(chunk.amounts), list(book.amounts))
+            self.assertEqual(list(chunk.rate_codes), list(book.rate_codes))
+            self.assertEqual(list(chunk.amortizations), list(book.amortizations))
+            self.assertEqual(list(chunk.frequency_codes), list(book.frequency_codes))
+            self.assertEqual(list(chunk.line_numbers), list(book.line_numbers))
+            self.assertEqual(chunk.rejected, book.rejected)
+
+    def test_round_trip_malformed_expected(self):
+        #Test that malformed expected payments survive conversion and land in the right chunk.
+        #Arrange
+        text_path = os.path.join(self.directory.name, "book.txt")
+        with open(text_path, "w") as output:
+            output.write("100000,FIXED_5,25,MONTHLY,584.59\n" * 3 + "100000,FIXED_5,25,MONTHLY,55x3.45\n"
+                         + "0,FIXED_5,25,MONTHLY,EXCEPTION\n")
+        #Act
+        convert(text_path, self.book_path)
+        with ColumnarBook(self.book_path) as book:
+            malformed = [chunk.malformed_expected for chunk in book.chunks(2)]
+            rejected = book.rejected
+        #Assert
+        self.assertEqual([{}, {4: "55x3.45"}], malformed)
+        self.assertEqual([(5, "0,FIXED_5,25,MONTHLY,EXCEPTION", "Loan amount must be positive.")], rejected)
+
+    def test_chunks_render_like_text_file(self):
+        #Test that pricing the book's chunks gives the same report as the text file.
+        #Arrange
+        expected = "".join(render_text(chunk, *calculate_payments(chunk.amounts, chunk.rate_codes,
+                                                                  chunk.frequency_codes,
+                                                                  chunk.amortizations))
+                           for chunk in read_chunks(DATA_FILE))
+        convert(DATA_FILE, self.book_path)
+        #Act
+        with ColumnarBook(self.book_path) as book:
+            actual = "".join(render_text(chunk, *calculate_payments(chunk.amounts, chunk.rate_codes,
+                                                                    chunk.frequency_codes,
+                                                                    chunk.amortizations))
+                             for chunk in book.chunks(4))
+        #Assert
+        self.assertEqual(expected, actual)
+
+    def test_open_text_file(self):
+        #Test that a ValueError is raised when the file is not a columnar book.
+        #Arrange
+        expected = "File is not a columnar mortgage book."
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            ColumnarBook(DATA_FILE)
+        self.assertEqual(expected, str(context.exception))
@@ -0,0 +1,107 @@
+"""
+Description: A class used to test the pipeline instrumentation.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test the stage timers,
+counters and run summary.
+"""
+import json
+import os
+import tempfile
+import unittest
+from mortgage import instrumentation
+from mortgage.batch import calculate_payments
+from mortgage.parallel import price_file
+from mortgage.reader import parse_lines, read_chunks
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "pixell_river_mortgages.txt")
+
+class InstrumentationTests(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_disabled_by_default(self):
+        #Test that the hooks report to a disabled instrumentation when no run is active.
+        #Act
+        run = instrumentation.active()
+        #Assert
+        self.assertFalse(run.enabled)
+        self.assertIsNone(instrumentation.disable())
+
+    def test_pipeline_counters(self):
+        #Test that parsing and pricing record rows, rejects and priced loans.
+        #Arrange
+        lines = ["100000,FIXED_5,25,MONTHLY,584.59\n", "abc,FIXED_5,25,MONTHLY,EXCEPTION\n",
+                 "-1,FIXED_5,25,MONTHLY,EXCEPTION\n"]
+        run = instrumentation.enable()
+        #Act
+        for chunk in parse_lines(lines):
+            calculate_payments(chunk.amounts, chunk.rate_codes, chunk.frequency_codes, chunk.amortizations)
+        instrumentation.disable()
+        summary = run.summary()
+        #Assert
+        self.assertEqual({"rows_parsed": 3, "rows_rejected": 2, "loans_priced": 1}, summary["counters"])
+        self.assertEqual({"could not convert string to float: 'abc'": 1, "Loan amount must be positive.": 1},
+                         summary["rejected"])
+        self.assertEqual(1, summary["stages"]["parse"]["calls"])
+        self.assertEqual(1, summary["stages"]["price"]["calls"])
+        self.assertGreaterEqual(summary["seconds"], summary["stages"]["price"]["seconds"])
+
+    def test_worker_measurements_are_merged(self):
+        #Test that the counters of worker processes are merged into the parent's run.
+        #Arrange
+        expected = instrumentation.enable()
+        for chunk in read_chunks(DATA_FILE):
+            calculate_payments(chunk.amounts, chunk.rate_codes, chunk.frequency_codes, chunk.amortizations)
+        instrumentation.disable()
+        run = instrumentation.enable()
+        #Act
+        pieces = list(price_file(DATA_FILE, 2, range_size=100))
+        instrumentation.disable()
+        summary = run.summary()
+        #Assert
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(dict(expected.counters), summary["counters"])
+        self.assertEqual(dict(expected.rejected), summary["rejected"])
+        self.assertEqual(len(pieces), summary["stages"]["price"]["calls"])
+        self.assertIn("render", summary["stages"])
+
+    def test_nothing_recorded_after_disable(self):
+        #Test that a finished run stops collecting.
+        #Arrange
+        run = instrumentation.enable()
+        instrumentation.disable()
+        #Act
+        calculate_payments([100], [0], [0], [25])
+        #Assert
+        self.assertEqual({}, run.stages)
+        self.assertEqual({}, dict(run.counters))
+
+    def test_summary_and_profile_files(self):
+        #Test that the summary is saved as JSON and the profile as pstats data.
+        #Arrange
+        run = instrumentation.enable(profile=True, trace_memory=True)
+        calculate_payments([100], [0], [0], [25])
+        instrumentation.disable()
+        with tempfile.TemporaryDirectory() as directory:
+            summary_path = os.path.join(directory, "stats.json")
+            profile_path = os.path.join(directory, "run.prof")
+            #Act
+            run.write_summary(summary_path)
+            run.write_profile(profile_path)
+            with open(summary_path, "r") as input:
+                summary = json.load(input)
+            #Assert
+            self.assertGreater(os.path.getsize(profile_path), 0)
+        self.assertEqual(1, summary["counters"]["loans_priced"])
+        self.assertIsInstance(summary["peak_bytes"], int)
+
+    def test_profile_not_enabled(self):
+        #Test that saving a profile of an unprofiled run raises a ValueError.
+        #Arrange
+        run = instrumentation.enable()
+        instrumentation.disable()
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            run.write_profile(os.devnull)
+        self.assertEqual("Profiling was not enabled.", str(context.exception))
@@ -6,8 +6,8 @@ Usage: Use the tests encapsulated within this class to test the MortgagePayment
 """
 from unittest import TestCase
 import unittest
-from mortgage.mortgage import Mortgage
-from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, VALID_AMORTIZATION 
+from mortgage.mortgage import Mortgage, payment_cache_info, clear_payment_cache
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, VALID_AMORTIZATION, RATE_TABLES
 
 class MortageTests(unittest.TestCase):
     def test_init_invalid_loan_amount(self):
@@ -259,6 +259,105 @@ class MortageTests(unittest.TestCase):
         actual = repr(mortgage)
         #Assert
         self.assertEqual(expected, actual)
-    
 
+    def test_schedule_pays_off_loan(self):
+        #Test that the schedule has one row per period and ends with a zero balance.
+        #Arrange
+        loan_amount = 682912.43
+        mortgage = Mortgage(loan_amount, MortgageRate.FIXED_1, MortgageFrequency.WEEKLY, 30)
+        #Act
+        schedule = list(mortgage.schedule())
+        #Assert
+        self.assertEqual(30 * 52, len(schedule))
+        self.assertEqual(mortgage.calculate_payment(), schedule[0].payment)
+        self.assertEqual(0.0, schedule[-1].balance)
+        self.assertAlmostEqual(loan_amount, sum(row.principal for row in schedule), places=2)
+
+    def test_balance_at_matches_schedule(self):
+        #Test that the closed-form balance matches the generated schedule.
+        #Arrange
+        mortgage = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 30)
+        schedule = list(mortgage.schedule())
+        #Act and Assert
+        self.assertEqual(682912.43, mortgage.balance_at(0))
+        for period in (1, 120, 359, 360):
+            self.assertAlmostEqual(schedule[period - 1].balance, mortgage.balance_at(period), places=6)
+
+    def test_balance_at_invalid_period(self):
+        #Test that a ValueError is raised for a period outside the amortization.
+        #Arrange
+        mortgage = Mortgage(100, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 5)
+        expected = "Period provided is invalid."
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            mortgage.balance_at(61)
+        self.assertEqual(expected, str(context.exception))
 
+    def test_payment_recalculated_after_mutator(self):
+        #Test that changing the terms through a mutator invalidates the cached payment.
+        #Arrange
+        mortgage = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 30)
+        before = mortgage.calculate_payment()
+        expected = Mortgage(682912.43, MortgageRate.FIXED_5, MortgageFrequency.WEEKLY, 25).calculate_payment()
+        #Act
+        mortgage.rate = MortgageRate.FIXED_5
+        mortgage.frequency = MortgageFrequency.WEEKLY
+        mortgage.amortization = 25
+        #Assert
+        self.assertNotEqual(before, mortgage.calculate_payment())
+        self.assertEqual(expected, mortgage.calculate_payment())
+        mortgage.loan_amount = 100
+        self.assertEqual(Mortgage(100, MortgageRate.FIXED_5, MortgageFrequency.WEEKLY, 25).calculate_payment(),
+                         mortgage.calculate_payment())
+
+    def test_payment_cache_shared_between_mortgages(self):
+        #Test that mortgages with identical terms share the process-wide cache.
+        #Arrange
+        clear_payment_cache()
+        first = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 30)
+        second = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 30)
+        #Act
+        first.calculate_payment()
+        second.calculate_payment()
+        second.calculate_payment()
+        info = payment_cache_info()
+        #Assert
+        self.assertEqual(1, info.misses)
+        self.assertEqual(1, info.hits)
+
+    def test_payment_records_rate_version(self):
+        #Test that a new rate table reprices the mortgage and records its version.
+        #Arrange
+        mortgage = Mortgage(100000, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25)
+        original = RATE_TABLES.current
+        rates = dict(original.rates)
+        rates[MortgageRate.FIXED_5] = 0.0600
+        try:
+            before = mortgage.calculate_payment()
+            version = mortgage.rate_version
+            #Act
+            table = RATE_TABLES.update(rates)
+            after = mortgage.calculate_payment()
+            text = str(mortgage)
+        finally:
+            RATE_TABLES.update(original.rates)
+        #Assert
+        self.assertEqual(original.version, version)
+        self.assertEqual(table.version, mortgage.rate_version)
+        self.assertEqual(round(100000 * table.factors[(MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25)], 2),
+                         after)
+        self.assertNotEqual(before, after)
+        self.assertIn("Rate: 6.00%", text)
+        self.assertEqual(before, mortgage.calculate_payment())
+
+    def test_from_validated_matches_constructor(self):
+        #Test that a mortgage built from validated terms behaves like a constructed one.
+        #Arrange
+        expected = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.BI_WEEKLY, 30)
+        #Act
+        mortgage = Mortgage.from_validated(682912.43, MortgageRate.FIXED_1, MortgageFrequency.BI_WEEKLY, 30)
+        version = mortgage.rate_version
+        #Assert
+        self.assertIsNone(version)
+        self.assertEqual(str(expected), str(mortgage))
+        self.assertEqual(repr(expected), repr(mortgage))
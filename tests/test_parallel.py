@@ -0,0 +1,83 @@
+"""
+Description: A class used to test the parallel mortgage pricer.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test split_ranges and price_file.
+"""
+import os
+import unittest
+from mortgage.batch import calculate_payments
+from mortgage.parallel import split_ranges, price_file, _run_pool, RANGES_PER_WORKER
+from mortgage.pixell_lookup import RATE_TABLES
+from mortgage.reader import read_chunks
+from mortgage.report import render_text, render_jsonl
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "pixell_river_mortgages.txt")
+
+class ParallelTests(unittest.TestCase):
+    def test_ranges_are_newline_aligned(self):
+        #Test that every range ends on a line boundary and the ranges cover the file.
+        #Arrange
+        with open(DATA_FILE, "rb") as input:
+            data = input.read()
+        #Act
+        ranges = split_ranges(DATA_FILE, 100)
+        #Assert
+        self.assertEqual(0, ranges[0][0])
+        self.assertEqual(len(data), ranges[-1][1])
+        for (_, end, _), (start, _, first_line) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(b"\n", data[end - 1:end])
+            self.assertEqual(data[:start].count(b"\n") + 1, first_line)
+
+    def test_parallel_matches_single_process(self):
+        #Test that the parallel report is identical to the single-process report.
+        #Arrange
+        expected = "".join(render_text(chunk, *calculate_payments(chunk.amounts, chunk.rate_codes,
+                                                                  chunk.frequency_codes,
+                                                                  chunk.amortizations))
+                           for chunk in read_chunks(DATA_FILE))
+        #Act
+        actual = "".join(price_file(DATA_FILE, 2, range_size=100))
+        #Assert
+        self.assertEqual(expected, actual)
+
+    def test_invalid_worker_count(self):
+        #Test that a ValueError is raised when the worker count is not positive.
+        #Arrange
+        expected = "Worker count must be positive."
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            price_file(DATA_FILE, 0)
+        self.assertEqual(expected, str(context.exception))
+
+    def test_outstanding_ranges_are_bounded(self):
+        #Test that only a window of ranges per worker is submitted ahead of the consumer.
+        #Arrange
+        ranges = split_ranges(DATA_FILE, 100)
+        pulled = []
+        def tasks():
+            for start, end, first_line in ranges:
+                pulled.append(start)
+                yield (DATA_FILE, start, end, first_line, "text", RATE_TABLES.current, False)
+        #Act
+        pieces = _run_pool(tasks(), 1)
+        first = next(pieces)
+        submitted = len(pulled)
+        rest = list(pieces)
+        #Assert
+        self.assertGreater(len(ranges), RANGES_PER_WORKER + 1)
+        self.assertEqual(RANGES_PER_WORKER + 1, submitted)
+        self.assertEqual(len(ranges), 1 + len(rest))
+
+    def test_parallel_jsonl_keeps_line_numbers(self):
+        #Test that line numbers in a parallel JSON Lines report count from the start of the file.
+        #Arrange
+        expected = "".join(render_jsonl(chunk, *calculate_payments(chunk.amounts, chunk.rate_codes,
+                                                                   chunk.frequency_codes,
+                                                                   chunk.amortizations))
+                           for chunk in read_chunks(DATA_FILE))
+        #Act
+        actual = "".join(price_file(DATA_FILE, 2, range_size=100, format="jsonl"))
+        #Assert
+        self.assertEqual(expected, actual)
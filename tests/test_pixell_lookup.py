@@ -0,0 +1,122 @@
+"""
+Description: A class used to test the lookup tables in pixell_lookup.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test the annuity factor tables
+and the versioned rate table store.
+"""
+import os
+import tempfile
+import unittest
+from mortgage.pixell_lookup import (MortgageRate, MortgageFrequency, VALID_AMORTIZATION,
+                                    RateTableStore, read_rate_file)
+
+class PixellLookupTests(unittest.TestCase):
+    def test_annuity_factors_cover_every_combination(self):
+        #Test that there is a factor for every rate, frequency and amortization.
+        #Arrange
+        expected = len(MortgageRate) * len(MortgageFrequency) * len(VALID_AMORTIZATION)
+        #Act
+        table = RateTableStore().current
+        #Assert
+        self.assertEqual(expected, len(table.factors))
+        self.assertEqual(expected, len(table.factors_by_code))
+
+    def test_annuity_factor_matches_formula(self):
+        #Test that a factor matches the annuity formula.
+        #Arrange
+        i = MortgageRate.FIXED_1.value / 12
+        n = 30 * 12
+        expected = i * (1 + i) ** n / ((1 + i) ** n - 1)
+        table = RateTableStore().current
+        #Act
+        actual = table.factors[(MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 30)]
+        #Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(expected, table.factors_by_code[(2, 0, 30)])
+
+    def test_store_starts_with_built_in_rates(self):
+        #Test that a new store holds the built-in rates as version 1.
+        #Arrange and Act
+        table = RateTableStore().current
+        #Assert
+        self.assertEqual(1, table.version)
+        self.assertEqual(MortgageRate.FIXED_3.value, table.rates[MortgageRate.FIXED_3])
+        self.assertEqual(MortgageRate.FIXED_3.value, table.rates_by_code[1])
+
+    def test_update_rebuilds_only_changed_rates(self):
+        #Test that an update publishes a new version and recalculates only the changed rate.
+        #Arrange
+        store = RateTableStore()
+        before = store.current
+        rates = dict(before.rates)
+        rates[MortgageRate.FIXED_5] = 0.0450
+        #Act
+        after = store.update(rates)
+        #Assert
+        self.assertEqual(2, after.version)
+        self.assertIs(after, store.current)
+        self.assertIs(before, store.get(1))
+        self.assertEqual(0.0450, after.rates_by_code[0])
+        fixed_5 = (MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25)
+        fixed_3 = (MortgageRate.FIXED_3, MortgageFrequency.MONTHLY, 25)
+        self.assertLess(after.factors[fixed_5], before.factors[fixed_5])
+        self.assertIs(before.factors[fixed_3], after.factors[fixed_3])
+        self.assertEqual(after.factors[fixed_5], after.factors_by_code[(0, 0, 25)])
+
+    def test_update_with_same_rates_keeps_version(self):
+        #Test that publishing unchanged rates does not create a version.
+        #Arrange
+        store = RateTableStore()
+        #Act
+        table = store.update(dict(store.current.rates))
+        #Assert
+        self.assertEqual(1, table.version)
+
+    def test_load_and_reload_rate_file(self):
+        #Test that a rate file is loaded and reloaded only when it changes.
+        #Arrange
+        store = RateTableStore()
+        lines = [f"{rate.name},{rate.value}" for rate in MortgageRate]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rates.txt")
+            with open(path, "w") as output:
+                output.write("# rates\n" + "\n".join(lines[:-1] + ["VARIABLE_1,0.0700"]) + "\n")
+            #Act
+            loaded = store.load(path)
+            unchanged = store.reload()
+            with open(path, "w") as output:
+                output.write("\n".join(lines[:-1] + ["VARIABLE_1,0.0750"]))
+            os.utime(path, ns=(0, 1))
+            changed = store.reload()
+        #Assert
+        self.assertEqual(2, loaded.version)
+        self.assertFalse(unchanged)
+        self.assertTrue(changed)
+        self.assertEqual(3, store.current.version)
+        self.assertEqual(0.0750, store.current.rates[MortgageRate.VARIABLE_1])
+
+    def test_read_rate_file_invalid(self):
+        #Test that malformed, unknown and missing rates are rejected.
+        #Arrange
+        cases = [("FIXED_5,abc\n", "Rate table line 1 is invalid."),
+                 ("FIXED_55,0.05\n", "Rate table line 1 is invalid."),
+                 ("FIXED_5,0.05\nFIXED_5,0.05\n", "Rate table line 2 is invalid."),
+                 ("FIXED_5,-0.05\n", "Rate table line 1 is invalid."),
+                 ("FIXED_5,0.05\n", "Rate table is missing FIXED_3.")]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rates.txt")
+            for text, expected in cases:
+                with open(path, "w") as output:
+                    output.write(text)
+                #Act and Assert
+                with self.assertRaises(ValueError) as context:
+                    read_rate_file(path)
+                self.assertEqual(expected, str(context.exception))
+
+    def test_unknown_version(self):
+        #Test that looking up an unknown version raises a ValueError.
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            RateTableStore().get(2)
+        self.assertEqual("Rate table version is unknown.", str(context.exception))
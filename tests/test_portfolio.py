@@ -0,0 +1,150 @@
+"""
+Description: A class used to test the columnar MortgagePortfolio.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test MortgagePortfolio and MortgageView.
+"""
+import unittest
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, RATE_TABLES
+from mortgage.portfolio import MortgagePortfolio, MortgageView
+
+class PortfolioTests(unittest.TestCase):
+    def test_mortgage_has_no_dict(self):
+        #Test that Mortgage instances do not carry a per-instance __dict__.
+        #Arrange
+        mortgage = Mortgage(100, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25)
+        #Act and Assert
+        self.assertFalse(hasattr(mortgage, "__dict__"))
+
+    def test_view_matches_mortgage(self):
+        #Test that a view behaves like the mortgage that was added.
+        #Arrange
+        mortgage = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.WEEKLY, 30)
+        portfolio = MortgagePortfolio()
+        #Act
+        index = portfolio.add(mortgage)
+        view = portfolio[index]
+        #Assert
+        self.assertIsInstance(view, MortgageView)
+        self.assertEqual(str(mortgage), str(view))
+        self.assertEqual(repr(mortgage), repr(view))
+        self.assertEqual(mortgage.calculate_payment(), view.calculate_payment())
+
+    def test_view_mutator_updates_columns(self):
+        #Test that a change made through a view mutator is stored in the columns.
+        #Arrange
+        portfolio = MortgagePortfolio()
+        portfolio.add(Mortgage(100, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25))
+        view = portfolio[0]
+        #Act
+        view.loan_amount = 200
+        view.rate = MortgageRate.VARIABLE_1
+        view.frequency = MortgageFrequency.WEEKLY
+        view.amortization = 10
+        #Assert
+        self.assertEqual([200.0], list(portfolio.amounts))
+        self.assertEqual([5], list(portfolio.rate_codes))
+        self.assertEqual([2], list(portfolio.frequency_codes))
+        self.assertEqual([10], list(portfolio.amortizations))
+
+    def test_view_mutator_validates(self):
+        #Test that a view mutator keeps the Mortgage validation.
+        #Arrange
+        portfolio = MortgagePortfolio()
+        portfolio.add(Mortgage(100, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25))
+        expected = "Amortization provided is invalid."
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            portfolio[0].amortization = 22
+        self.assertEqual(expected, str(context.exception))
+        self.assertEqual([25], list(portfolio.amortizations))
+
+    def test_index_out_of_range(self):
+        #Test that an IndexError is raised for a row that does not exist.
+        #Arrange
+        portfolio = MortgagePortfolio()
+        #Act and Assert
+        with self.assertRaises(IndexError):
+            portfolio[0]
+
+    def test_view_edit_reprices_loan_and_group(self):
+        #Test that a view mutator reprices the loan and moves it to its new group.
+        #Arrange
+        portfolio = MortgagePortfolio()
+        portfolio.extend([100000, 200000, 300000], [0, 0, 0], [0, 0, 0], [25, 25, 25])
+        expected = Mortgage(150000, MortgageRate.FIXED_3, MortgageFrequency.MONTHLY, 25).calculate_payment()
+        #Act
+        view = portfolio[0]
+        view.loan_amount = 150000
+        view.rate = MortgageRate.FIXED_3
+        #Assert
+        self.assertEqual(expected, portfolio.payments[0])
+        self.assertEqual(expected, view.calculate_payment())
+        self.assertEqual([1, 2], sorted(portfolio.group(0, 0, 25)))
+        self.assertEqual([0], list(portfolio.group(1, 0, 25)))
+        self.assertAlmostEqual(expected, portfolio.monthly_cash_flow()[MortgageRate.FIXED_3])
+        self.assertAlmostEqual(portfolio.payments[1] + portfolio.payments[2],
+                               portfolio.monthly_cash_flow()[MortgageRate.FIXED_5])
+
+    def test_monthly_cash_flow_scales_frequency(self):
+        #Test that weekly payments are scaled to a month.
+        #Arrange
+        portfolio = MortgagePortfolio()
+        portfolio.add(Mortgage(100000, MortgageRate.FIXED_1, MortgageFrequency.WEEKLY, 10))
+        #Act
+        totals = portfolio.monthly_cash_flow()
+        #Assert
+        self.assertAlmostEqual(portfolio.payments[0] * 52 / 12, totals[MortgageRate.FIXED_1])
+        self.assertEqual(0.0, totals[MortgageRate.FIXED_5])
+
+    def test_reprice_only_changed_rate(self):
+        #Test that a rate change reprices only the loans on that rate.
+        #Arrange
+        portfolio = MortgagePortfolio()
+        portfolio.extend([100000, 100000, 100000], [0, 1, 0], [0, 0, 2], [25, 25, 5])
+        before = list(portfolio.payments)
+        original = RATE_TABLES.current
+        rates = dict(original.rates)
+        rates[MortgageRate.FIXED_5] = 0.0700
+        try:
+            #Act
+            repriced = portfolio.reprice(RATE_TABLES.update(rates))
+            expected = [Mortgage(100000, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25).calculate_payment(),
+                        before[1],
+                        Mortgage(100000, MortgageRate.FIXED_5, MortgageFrequency.WEEKLY, 5).calculate_payment()]
+        finally:
+            RATE_TABLES.update(original.rates)
+        #Assert
+        self.assertEqual(2, repriced)
+        self.assertEqual(expected, list(portfolio.payments))
+        self.assertNotEqual(before, expected)
+        self.assertEqual(portfolio.rate_table.version, portfolio.rate_version)
+
+    def test_extend_rejects_invalid_loan(self):
+        #Test that extend raises the Mortgage error and adds nothing for an invalid loan.
+        #Arrange
+        portfolio = MortgagePortfolio()
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            portfolio.extend([100000, 100000], [0, 0], [0, 0], [25, 22])
+        self.assertEqual("Amortization provided is invalid.", str(context.exception))
+        self.assertEqual(0, len(portfolio))
+
+    def test_remove_moves_last_loan(self):
+        #Test that removing a loan moves the last loan into its row and keeps the groups.
+        #Arrange
+        portfolio = MortgagePortfolio()
+        portfolio.extend([100000, 200000, 300000, 400000], [0, 1, 0, 1], [0, 0, 0, 0], [25, 25, 25, 25])
+        payment = portfolio.payments[3]
+        #Act
+        portfolio.remove(1)
+        portfolio.remove(-1)
+        #Assert
+        self.assertEqual([100000, 400000], list(portfolio.amounts))
+        self.assertEqual(payment, portfolio.payments[1])
+        self.assertEqual([0], list(portfolio.group(0, 0, 25)))
+        self.assertEqual([1], list(portfolio.group(1, 0, 25)))
+        self.assertAlmostEqual(payment, portfolio._group_payments[(1, 0, 25)])
+        with self.assertRaises(IndexError):
+            portfolio.remove(2)
@@ -0,0 +1,120 @@
+"""
+Description: A class used to test the indexed portfolio query layer.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test IndexedPortfolio
+aggregates and selections against a scan of the columns.
+"""
+import math
+import random
+import unittest
+from mortgage import query
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency, RATES_BY_CODE, FREQUENCIES_BY_CODE, RATE_TABLES
+from mortgage.query import IndexedPortfolio, Totals
+
+def scan(portfolio, rates=None, frequencies=None, amortizations=None, low=-math.inf, high=math.inf) -> tuple:
+    # The matching rows and their totals, found by reading every row.
+    rows = [row for row in range(len(portfolio))
+            if (rates is None or RATES_BY_CODE[portfolio.rate_codes[row]] in rates)
+            and (frequencies is None or FREQUENCIES_BY_CODE[portfolio.frequency_codes[row]] in frequencies)
+            and (amortizations is None or portfolio.amortizations[row] in amortizations)
+            and low <= portfolio.amounts[row] <= high]
+    return rows, Totals(len(rows), math.fsum(portfolio.amounts[row] for row in rows),
+                        math.fsum(portfolio.payments[row] for row in rows))
+
+class QueryTests(unittest.TestCase):
+    def setUp(self):
+        # Small blocks so a few hundred loans split and empty blocks.
+        self.block_size = query.BLOCK_SIZE
+        query.BLOCK_SIZE = 4
+        generator = random.Random(5)
+        self.portfolio = IndexedPortfolio()
+        count = 300
+        self.portfolio.extend([float(generator.choice([100000, 250000])) if row % 7 == 0
+                               else round(generator.uniform(50000, 900000), 2) for row in range(count)],
+                              [generator.randrange(6) for _ in range(count)],
+                              [generator.randrange(3) for _ in range(count)],
+                              [generator.choice([5, 25]) for _ in range(count)])
+        self.generator = generator
+
+    def tearDown(self):
+        query.BLOCK_SIZE = self.block_size
+
+    def assertMatchesScan(self, **filters):
+        # Check a filter's count, totals and selection against a scan.
+        low = filters.pop("low", None)
+        high = filters.pop("high", None)
+        rows, expected = scan(self.portfolio, filters.get("rate"), filters.get("frequency"),
+                              filters.get("amortization"),
+                              -math.inf if low is None else low, math.inf if high is None else high)
+        totals = self.portfolio.aggregate(min_amount=low, max_amount=high, **filters)[()]
+        self.assertEqual(expected.count, totals.count)
+        self.assertAlmostEqual(expected.loan_amount, totals.loan_amount, places=4)
+        self.assertAlmostEqual(expected.payment, totals.payment, places=4)
+        bitmap = self.portfolio.select(min_amount=low, max_amount=high, **filters)
+        self.assertEqual(sum(1 << row for row in rows), bitmap)
+
+    def check_queries(self):
+        # Run a spread of filters against a scan.
+        self.assertMatchesScan()
+        self.assertMatchesScan(rate=(MortgageRate.FIXED_5, MortgageRate.VARIABLE_1))
+        self.assertMatchesScan(frequency=(MortgageFrequency.WEEKLY,), amortization=(25,))
+        self.assertMatchesScan(low=100000, high=250000)
+        self.assertMatchesScan(rate=(MortgageRate.FIXED_3,), low=300000.5)
+        self.assertMatchesScan(amortization=(5,), high=100000)
+        self.assertMatchesScan(low=950000)
+
+    def test_queries_match_scan(self):
+        #Test that aggregates and selections match a scan of the columns.
+        #Act and Assert
+        self.check_queries()
+
+    def test_indexes_follow_changes(self):
+        #Test that the indexes stay correct through edits, additions, removals and a reprice.
+        #Arrange
+        generator = self.generator
+        original = RATE_TABLES.current
+        rates = dict(original.rates)
+        rates[MortgageRate.FIXED_3] += 0.01
+        try:
+            #Act
+            for _ in range(100):
+                view = self.portfolio[generator.randrange(len(self.portfolio))]
+                view.loan_amount = float(generator.choice([100000, 250000, 400000]))
+                view.rate = generator.choice(RATES_BY_CODE)
+                view.frequency = generator.choice(FREQUENCIES_BY_CODE)
+            for _ in range(120):
+                self.portfolio.remove(generator.randrange(-len(self.portfolio), len(self.portfolio)))
+            self.portfolio.add(Mortgage(100000, MortgageRate.FIXED_5, MortgageFrequency.MONTHLY, 25))
+            self.portfolio.extend([123456.78] * 30, [1] * 30, [0] * 30, [25] * 30)
+            self.portfolio.reprice(RATE_TABLES.update(rates))
+        finally:
+            RATE_TABLES.update(original.rates)
+        #Assert
+        self.check_queries()
+
+    def test_group_by(self):
+        #Test that grouped totals split the filtered totals by the group columns.
+        #Act
+        grouped = self.portfolio.aggregate(frequency=MortgageFrequency.MONTHLY, group_by=("amortization", "rate"))
+        #Assert
+        for (amortization, rate), totals in grouped.items():
+            _, expected = scan(self.portfolio, [rate], [MortgageFrequency.MONTHLY], [amortization])
+            self.assertEqual(expected.count, totals.count)
+            self.assertAlmostEqual(expected.payment, totals.payment, places=4)
+        self.assertEqual(self.portfolio.count(frequency=MortgageFrequency.MONTHLY),
+                         sum(totals.count for totals in grouped.values()))
+
+    def test_empty_and_invalid_filters(self):
+        #Test that an empty result has zero totals and invalid filters are rejected.
+        #Act
+        totals = self.portfolio.aggregate(min_amount=2000000)
+        #Assert
+        self.assertEqual({(): Totals(0, 0.0, 0.0)}, totals)
+        for filters, message in [({"rate": "FIXED_5"}, "Rate provided is invalid."),
+                                 ({"amortization": 22}, "Amortization provided is invalid."),
+                                 ({"group_by": ("balance",)}, "Group by column is invalid.")]:
+            with self.assertRaises(ValueError) as context:
+                self.portfolio.aggregate(**filters)
+            self.assertEqual(message, str(context.exception))
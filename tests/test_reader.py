@@ -0,0 +1,83 @@
+"""
+Description: A class used to test the streaming mortgage reader.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test parse_lines and read_chunks.
+"""
+import math
+import os
+import unittest
+from mortgage.reader import parse_lines, read_chunks
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "pixell_river_mortgages.txt")
+
+class ReaderTests(unittest.TestCase):
+    def test_valid_row_columns(self):
+        #Test that a valid row is parsed into the column arrays.
+        #Arrange
+        lines = ["500000,FIXED_1,10,MONTHLY,5523.45\n"]
+        #Act
+        chunk = next(parse_lines(lines))
+        #Assert
+        self.assertEqual([1], list(chunk.line_numbers))
+        self.assertEqual([500000.0], list(chunk.amounts))
+        self.assertEqual([2], list(chunk.rate_codes))
+        self.assertEqual([10], list(chunk.amortizations))
+        self.assertEqual([0], list(chunk.frequency_codes))
+        self.assertEqual([5523.45], list(chunk.expected))
+        self.assertEqual([], chunk.rejected)
+
+    def test_rejected_rows_keep_line_number(self):
+        #Test that bad rows are recorded with their line number and message.
+        #Arrange
+        lines = ["500000,FIXED_1,10,MONTHLY,5523.45\n",
+                 "One_Million, FIXED_5, 30, MONTHLY,EXCEPTION\n",
+                 "1000000,FIXED_33,30,BI_WEEKLY,2703.85,EXCEPTION\n",
+                 "125999.99,FIXED_5,22,WEEKLY,EXCEPTION\n"]
+        expected = [(2, "One_Million, FIXED_5, 30, MONTHLY,EXCEPTION",
+                     "could not convert string to float: 'One_Million'"),
+                    (3, "1000000,FIXED_33,30,BI_WEEKLY,2703.85,EXCEPTION", "'FIXED_33'"),
+                    (4, "125999.99,FIXED_5,22,WEEKLY,EXCEPTION", "Amortization provided is invalid.")]
+        #Act
+        chunk = next(parse_lines(lines))
+        #Assert
+        self.assertEqual(expected, chunk.rejected)
+        self.assertEqual(1, len(chunk.amounts))
+
+    def test_chunks_are_fixed_size(self):
+        #Test that the file is split into chunks of the requested size.
+        #Arrange
+        chunk_size = 5
+        #Act
+        chunks = list(read_chunks(DATA_FILE, chunk_size))
+        #Assert
+        self.assertEqual([5, 5, 5, 5, 3], [len(chunk) for chunk in chunks])
+        self.assertEqual(23, chunks[-1].rejected[-1][0])
+
+    def test_exception_expected_is_nan(self):
+        #Test that an EXCEPTION expected payment is stored as NaN.
+        #Arrange
+        lines = ["100,FIXED_5,25,MONTHLY,EXCEPTION\n"]
+        #Act
+        chunk = next(parse_lines(lines))
+        #Assert
+        self.assertTrue(math.isnan(chunk.expected[0]))
+
+    def test_malformed_expected_keeps_text(self):
+        #Test that an expected payment that is neither a number nor EXCEPTION is kept as written.
+        #Arrange
+        lines = ["100,FIXED_5,25,MONTHLY,55x3.45\n", "100,FIXED_5,25,MONTHLY,nan\n", "100,FIXED_5,25,MONTHLY,1.5\n"]
+        #Act
+        chunk = next(parse_lines(lines))
+        #Assert
+        self.assertEqual({1: "55x3.45", 2: "nan"}, chunk.malformed_expected)
+        self.assertEqual(1.5, chunk.expected[2])
+
+    def test_invalid_chunk_size(self):
+        #Test that a ValueError is raised when the chunk size is not positive.
+        #Arrange
+        expected = "Chunk size must be positive."
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            next(parse_lines([], 0))
+        self.assertEqual(expected, str(context.exception))
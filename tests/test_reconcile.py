@@ -0,0 +1,74 @@
+"""
+Description: A class used to test the reconciliation engine.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test reconcile and reconcile_chunks.
+"""
+import os
+import unittest
+from mortgage.reader import parse_lines
+from mortgage.reconcile import reconcile, reconcile_chunks
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "pixell_river_mortgages.txt")
+
+class ReconcileTests(unittest.TestCase):
+    def test_sample_file_reconciles(self):
+        #Test that every row of the sample file reconciles.
+        #Act
+        report = reconcile(DATA_FILE, chunk_size=5)
+        #Assert
+        self.assertTrue(report.is_clean())
+        self.assertEqual(23, report.rows)
+        self.assertEqual(16, report.matched)
+        self.assertEqual(7, report.confirmed_exceptions)
+
+    def test_discrepancies_are_reported(self):
+        #Test that each kind of discrepancy is counted and kept in detail.
+        #Arrange
+        lines = ["100000,FIXED_5,25,MONTHLY,581.00\n",
+                 "100,FIXED_5,25,MONTHLY,EXCEPTION\n",
+                 "0,FIXED_5,25,MONTHLY,1.00\n"]
+        #Act
+        report = reconcile_chunks(parse_lines(lines))
+        #Assert
+        self.assertFalse(report.is_clean())
+        self.assertEqual((1, 1, 1), (report.mismatched, report.missing_exceptions, report.unexpected_exceptions))
+        self.assertEqual([(1, 581.0, 584.59), (2, "EXCEPTION", 0.58), (3, 1.0, "Loan amount must be positive.")],
+                         report.mismatches)
+        self.assertIn("Line 1: expected $581.00, calculated $584.59", str(report))
+
+    def test_malformed_expected_is_its_own_discrepancy(self):
+        #Test that a malformed expected payment is reported with its text, not as a missing exception.
+        #Arrange
+        lines = ["100000,FIXED_5,25,MONTHLY,55x3.45\n",
+                 "0,FIXED_5,25,MONTHLY,1x\n",
+                 "100,FIXED_5,25,MONTHLY,EXCEPTION\n"]
+        #Act
+        report = reconcile_chunks(parse_lines(lines))
+        #Assert
+        self.assertEqual((2, 0, 0, 1), (report.malformed_expected, report.unexpected_exceptions,
+                                        report.confirmed_exceptions, report.missing_exceptions))
+        self.assertEqual(3, report.discrepancies)
+        self.assertIn("Line 1: expected malformed value '55x3.45', calculated $584.59", str(report))
+        self.assertIn("Line 2: expected malformed value '1x', calculated Loan amount must be positive.",
+                      str(report))
+
+    def test_tolerance(self):
+        #Test that a difference within the tolerance counts as a match.
+        #Arrange
+        lines = ["100000,FIXED_5,25,MONTHLY,584.60\n"]
+        #Act
+        report = reconcile_chunks(parse_lines(lines), tolerance=0.01)
+        #Assert
+        self.assertEqual(1, report.matched)
+
+    def test_mismatch_limit(self):
+        #Test that only the first discrepancies are kept in detail.
+        #Arrange
+        lines = ["100000,FIXED_5,25,MONTHLY,1.00\n"] * 5
+        #Act
+        report = reconcile_chunks(parse_lines(lines), mismatch_limit=2)
+        #Assert
+        self.assertEqual(5, report.mismatched)
+        self.assertEqual(2, len(report.mismatches))
+        self.assertIn("... 3 more discrepancies", str(report))
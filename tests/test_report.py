@@ -0,0 +1,93 @@
+"""
+Description: A class used to test the report renderers and ReportWriter.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test the report formats.
+"""
+import io
+import json
+import unittest
+from mortgage.batch import calculate_payments
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency
+from mortgage.reader import parse_lines
+from mortgage.report import SEPARATOR, ReportWriter, render_csv, render_jsonl, render_text
+
+LINES = ["682912.43,FIXED_1,30,MONTHLY,4046.23\n", "0,FIXED_1,10,MONTHLY,EXCEPTION\n"]
+
+class ReportTests(unittest.TestCase):
+    def setUp(self):
+        self.chunk = next(parse_lines(LINES))
+        self.payments, self.errors = calculate_payments(self.chunk.amounts, self.chunk.rate_codes,
+                                                        self.chunk.frequency_codes, self.chunk.amortizations)
+        self.mortgage = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 30)
+
+    def test_render_text_matches_mortgage_str(self):
+        #Test that the text format matches printing the Mortgage object.
+        #Arrange
+        expected = (f"{self.mortgage}\n{SEPARATOR}\n"
+                    + f"Data: 0,FIXED_1,10,MONTHLY,EXCEPTION caused Exception: Loan amount must be positive.\n{SEPARATOR}\n")
+        #Act
+        actual = render_text(self.chunk, self.payments, self.errors)
+        #Assert
+        self.assertEqual(expected, actual)
+
+    def test_render_csv_uses_repr_style(self):
+        #Test that a CSV row holds the quoted __repr__ fields followed by the payment.
+        #Arrange
+        amount, rate, amortization, frequency = repr(self.mortgage).rsplit(",", 3)
+        expected = f'"{amount}",{rate},{amortization},{frequency},{self.mortgage.calculate_payment():.2f}\n'
+        #Act
+        actual = render_csv(self.chunk, self.payments, self.errors)
+        #Assert
+        self.assertEqual(expected, actual)
+
+    def test_render_jsonl_objects(self):
+        #Test that every input line becomes one JSON object in line order.
+        #Arrange
+        expected = [{"line": 1, "loan_amount": 682912.43, "rate": "FIXED_1", "amortization": 30,
+                     "frequency": "MONTHLY", "payment": self.mortgage.calculate_payment()},
+                    {"line": 2, "data": "0,FIXED_1,10,MONTHLY,EXCEPTION",
+                     "error": "Loan amount must be positive."}]
+        #Act
+        actual = [json.loads(line) for line in render_jsonl(self.chunk, self.payments, self.errors).splitlines()]
+        #Assert
+        self.assertEqual(expected, actual)
+
+    def test_render_jsonl_non_finite_rows_are_errors(self):
+        #Test that loans JSON cannot hold become error records and every line stays valid JSON.
+        #Arrange
+        chunk = next(parse_lines(["inf,FIXED_5,25,MONTHLY,EXCEPTION\n", "-inf,FIXED_5,25,MONTHLY,EXCEPTION\n"]))
+        payments, errors = calculate_payments(chunk.amounts, chunk.rate_codes, chunk.frequency_codes,
+                                              chunk.amortizations)
+        expected = [{"line": 1, "error": "Loan amount must be a finite number."},
+                    {"line": 2, "data": "-inf,FIXED_5,25,MONTHLY,EXCEPTION",
+                     "error": "Loan amount must be positive."}]
+        #Act
+        actual = [json.loads(line) for line in render_jsonl(chunk, payments, errors).splitlines()]
+        #Assert
+        self.assertEqual(expected, actual)
+
+    def test_writer_buffers_until_full(self):
+        #Test that the writer only writes to the stream once its buffer is full.
+        #Arrange
+        stream = io.StringIO()
+        writer = ReportWriter(stream, "text", buffer_size=10000)
+        #Act
+        writer.write_preamble()
+        writer.write_chunk(self.chunk, self.payments, self.errors)
+        before = stream.getvalue()
+        writer.flush()
+        #Assert
+        self.assertEqual("", before)
+        self.assertEqual(SEPARATOR + "\n" + render_text(self.chunk, self.payments, self.errors),
+                         stream.getvalue())
+
+    def test_writer_invalid_format(self):
+        #Test that a ValueError is raised for an unknown report format.
+        #Arrange
+        expected = "Report format provided is invalid."
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            ReportWriter(io.StringIO(), "xml")
+        self.assertEqual(expected, str(context.exception))
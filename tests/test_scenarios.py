@@ -0,0 +1,101 @@
+"""
+Description: A class used to test the scenario engine.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test scenario pricing and aggregation.
+"""
+import contextlib
+import io
+import unittest
+from mortgage.batch import calculate_payments
+from mortgage.pixell_lookup import RATES_BY_CODE, FREQUENCIES_BY_CODE, RATE_TABLES
+from mortgage.scenarios import (main, parallel_shifts, scenario_factors, price_scenarios, scenario_matrix,
+                                aggregate_scenarios)
+
+class ScenarioTests(unittest.TestCase):
+    def setUp(self):
+        self.amounts = [682912.43, 100000, 250000.5, 1000000, 75000]
+        self.rate_codes = [2, 0, 5, 3, 1]
+        self.frequency_codes = [0, 1, 2, 0, 2]
+        self.amortizations = [30, 25, 5, 10, 15]
+
+    def test_parallel_shifts(self):
+        #Test that parallel shifts apply the same shock to every rate.
+        #Act
+        scenarios = parallel_shifts(-100, 100, 100)
+        #Assert
+        self.assertEqual([(-0.01,) * 6, (0.0,) * 6, (0.01,) * 6], scenarios)
+
+    def test_matrix_matches_batch_with_shocked_rates(self):
+        #Test that each scenario prices like the batch engine with the shocked rates.
+        #Arrange
+        scenarios = [0.0, 0.0125, (-0.02, 0.0, 0.01, 0.0, 0.0, 0.03)]
+        expected = []
+        for scenario in scenarios:
+            shocks = scenario if isinstance(scenario, tuple) else (scenario,) * len(RATES_BY_CODE)
+            table = RATE_TABLES.current.with_rates({rate: RATE_TABLES.current.rates[rate] + shock
+                                                    for rate, shock in zip(RATES_BY_CODE, shocks)})
+            expected.append(list(calculate_payments(self.amounts, self.rate_codes, self.frequency_codes,
+                                                    self.amortizations, table)[0]))
+        #Act
+        matrix = scenario_matrix(self.amounts, self.rate_codes, self.frequency_codes, self.amortizations,
+                                 scenarios, block_size=2)
+        #Assert
+        self.assertEqual(expected, [list(column) for column in matrix])
+
+    def test_blocks_start_rows(self):
+        #Test that blocks come out in loan order with their first row.
+        #Act
+        blocks = list(price_scenarios(self.amounts, self.rate_codes, self.frequency_codes,
+                                      self.amortizations, [0.0], block_size=2))
+        #Assert
+        self.assertEqual([0, 2, 4], [start for start, _ in blocks])
+        self.assertEqual([2, 2, 1], [len(payments[0]) for _, payments in blocks])
+
+    def test_aggregate_matches_matrix(self):
+        #Test that the monthly cash flow matches the matrix to within half a cent per loan.
+        #Arrange
+        scenarios = parallel_shifts(-300, 300, 150)
+        matrix = scenario_matrix(self.amounts, self.rate_codes, self.frequency_codes, self.amortizations,
+                                 scenarios)
+        expected = [sum(payment * FREQUENCIES_BY_CODE[frequency_code].value / 12
+                        for payment, frequency_code in zip(column, self.frequency_codes))
+                    for column in matrix]
+        #Act
+        totals = aggregate_scenarios(self.amounts, self.rate_codes, self.frequency_codes,
+                                     self.amortizations, scenarios, block_size=3)
+        #Assert
+        for total, value in zip(totals, expected):
+            self.assertAlmostEqual(value, total, delta=0.005 * len(self.amounts) * 52 / 12)
+
+    def test_zero_rate_is_interest_free(self):
+        #Test that a shock taking a rate to zero prices an interest-free loan.
+        #Arrange
+        scenario = [-RATE_TABLES.current.rates_by_code[0]] + [0.0] * 5
+        #Act
+        matrix = scenario_matrix([120000], [0], [0], [10], [scenario])
+        #Assert
+        self.assertEqual(1000.0, matrix[0][0])
+
+    def test_invalid_loan_and_scenario(self):
+        #Test that an invalid loan raises its Mortgage message and a short scenario is rejected.
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            scenario_matrix([100, 100], [0, 0], [0, 0], [25, 22], [0.0])
+        self.assertEqual("Amortization provided is invalid.", str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            scenario_factors([(0.01, 0.01)])
+        self.assertEqual("Scenario shocks provided are invalid.", str(context.exception))
+
+    def test_main_rejects_bad_arguments_and_missing_files(self):
+        #Test that bad counts are usage errors and a missing file is reported without a traceback.
+        #Act and Assert
+        for option in ("--workers", "--step"):
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as context:
+                main(["book.txt", option, "0"])
+            self.assertEqual(2, context.exception.code)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(["missing_book.txt"])
+        self.assertEqual(1, status)
+        self.assertTrue(output.getvalue().startswith("File not found: "))
@@ -0,0 +1,118 @@
+"""
+Description: A class used to test the asyncio pricing service.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test PricingService.
+"""
+import asyncio
+import json
+import unittest
+from mortgage.mortgage import Mortgage
+from mortgage.pixell_lookup import MortgageRate, MortgageFrequency
+from mortgage.service import PricingService
+
+class ServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = PricingService(batch_window=0.01)
+        self.server = await self.service.start("127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.close()
+
+    async def test_requests_over_socket(self):
+        #Test that priced and invalid requests are answered with their ids.
+        #Arrange
+        expected_payment = Mortgage(682912.43, MortgageRate.FIXED_1, MortgageFrequency.MONTHLY, 30).calculate_payment()
+        requests = [{"id": 1, "loan_amount": 682912.43, "rate": "FIXED_1", "frequency": "MONTHLY", "amortization": 30},
+                    {"id": 2, "loan_amount": 100, "rate": "FIXED_33", "frequency": "MONTHLY", "amortization": 30}]
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        #Act
+        writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests) + b"not json\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(3)]
+        writer.close()
+        await writer.wait_closed()
+        #Assert
+        responses.sort(key=lambda response: response["id"] or 0)
+        self.assertEqual([{"id": None, "error": "Request is not valid JSON."},
+                          {"id": 1, "payment": expected_payment},
+                          {"id": 2, "error": "Rate provided is invalid."}], responses)
+
+    async def test_concurrent_requests_share_batches(self):
+        #Test that requests arriving within the window are priced in one batch.
+        #Arrange
+        count = 50
+        service = PricingService(batch_window=1.0)
+        #Act
+        payments = await asyncio.gather(*(service.price(100000 + row, 0, 0, 25) for row in range(count)))
+        await service.close()
+        #Assert
+        self.assertEqual(count, len(payments))
+        self.assertEqual(count, service.requests)
+        self.assertEqual(1, service.batches)
+
+    async def test_invalid_terms_raise(self):
+        #Test that pricing invalid terms raises the Mortgage ValueError message.
+        #Arrange
+        expected = "Amortization provided is invalid."
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            await self.service.price(100000, 0, 0, 22)
+        self.assertEqual(expected, str(context.exception))
+
+    async def test_bad_amounts_do_not_stop_the_service(self):
+        #Test that overflowing and non-finite amounts are rejected and later requests are answered.
+        #Arrange
+        lines = [b'{"id": 1, "loan_amount": 1' + b"0" * 400 + b', "rate": "FIXED_1", "frequency": "MONTHLY", '
+                 b'"amortization": 10}\n',
+                 b'{"id": 2, "loan_amount": Infinity, "rate": "FIXED_1", "frequency": "MONTHLY", '
+                 b'"amortization": 10}\n',
+                 b'{"id": 3, "loan_amount": 100000, "rate": "FIXED_5", "frequency": "MONTHLY", '
+                 b'"amortization": 25}\n']
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        #Act
+        writer.write(b"".join(lines))
+        await writer.drain()
+        responses = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in range(3)]
+        writer.close()
+        await writer.wait_closed()
+        #Assert
+        responses.sort(key=lambda response: response["id"])
+        self.assertEqual([{"id": 1, "error": "Loan amount must be a finite number."},
+                          {"id": 2, "error": "Loan amount must be a finite number."},
+                          {"id": 3, "payment": 584.59}], responses)
+
+    async def test_invalid_requests_keep_their_ids(self):
+        #Test that requests failing validation are answered with their own ids.
+        #Arrange
+        lines = [b'{"id": 7, "loan_amount": 100000, "rate": "FIXED_5", "frequency": "MONTHLY", '
+                 b'"amortization": "25"}\n',
+                 b'{"id": 8, "loan_amount": "100000", "rate": "FIXED_5", "frequency": "MONTHLY", '
+                 b'"amortization": 25}\n',
+                 b'[9]\n']
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        #Act
+        writer.write(b"".join(lines))
+        await writer.drain()
+        responses = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in range(3)]
+        writer.close()
+        await writer.wait_closed()
+        #Assert
+        responses.sort(key=lambda response: response["id"] or 0)
+        self.assertEqual([{"id": None, "error": "Request must be a JSON object."},
+                          {"id": 7, "error": "Amortization provided is invalid."},
+                          {"id": 8, "error": "Loan amount must be positive."}], responses)
+
+    async def test_failed_batch_keeps_batcher_running(self):
+        #Test that a request the batch engine cannot price fails alone and the batcher keeps running.
+        #Act
+        results = await asyncio.gather(self.service.price(10 ** 400, 0, 0, 25),
+                                       self.service.price(100000, 0, 0, 25), return_exceptions=True)
+        payment = await asyncio.wait_for(self.service.price(100000, 0, 0, 25), 5)
+        #Assert
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(584.59, results[1])
+        self.assertEqual(584.59, payment)
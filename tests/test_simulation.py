@@ -0,0 +1,128 @@
+"""
+Description: A class used to test the Monte Carlo cash flow simulator.
+Author: Benjamin Omoregie
+Date: 18/10/2026
+Usage: Use the tests encapsulated within this class to test simulated cash
+flows against the amortization schedules and the reproducibility of the
+random streams.
+"""
+import contextlib
+import io
+import math
+import os
+import tempfile
+import unittest
+from mortgage.batch import calculate_schedules
+from mortgage.columnar import convert
+from mortgage.pixell_lookup import RATE_TABLES
+from mortgage.simulation import Assumptions, simulate, main
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "pixell_river_mortgages.txt")
+
+# Borrowers who never prepay, facing rates that never move.
+STILL = Assumptions(cpr=0.0, prepayment_volatility=0.0, refinance_sensitivity=0.0, rate_volatility=0.0)
+
+class SimulationTests(unittest.TestCase):
+    def setUp(self):
+        self.columns = ([500000.0, 690334.22, 490292.12, 201232.32, 324124.33, 259208.45],
+                        [2, 1, 5, 3, 0, 4], [0, 1, 0, 0, 2, 1], [10, 20, 25, 20, 25, 5])
+
+    def test_still_book_follows_schedules(self):
+        #Test that without prepayment or rate moves every path pays the amortization schedules.
+        #Arrange
+        _, _, paid, _, principal, _ = calculate_schedules(*self.columns)
+        #Act
+        result = simulate(*self.columns, paths=4, assumptions=STILL, block_size=3)
+        #Assert
+        self.assertEqual(4, result.paths)
+        self.assertEqual(25 * 12, len(result.mean_cash_flow))
+        self.assertAlmostEqual(math.fsum(paid), math.fsum(result.mean_cash_flow), delta=math.fsum(paid) * 1e-5)
+        self.assertLess(max(result.cash_flow_deviation), 1e-6)
+        self.assertEqual(1, len(set(result.lives)))
+
+    def test_variable_reset_without_moves_changes_nothing(self):
+        #Test that resetting a variable loan at an unchanged rate keeps its cash flows.
+        #Arrange
+        columns = ([300000.0], [3], [1], [25])
+        #Act
+        monthly = simulate(*columns, paths=2, assumptions=STILL._replace(reset_months=1))
+        never = simulate(*columns, paths=2, assumptions=STILL._replace(reset_months=1000))
+        #Assert
+        for first, second in zip(monthly.mean_cash_flow, never.mean_cash_flow):
+            self.assertAlmostEqual(first, second, places=6)
+
+    def test_full_prepayment_ends_book_in_first_month(self):
+        #Test that a cpr of 100% repays the whole book in the first month.
+        #Act
+        result = simulate(*self.columns, paths=3, assumptions=STILL._replace(cpr=1.0))
+        #Assert
+        self.assertAlmostEqual(math.fsum(self.columns[0]), result.mean_cash_flow[0], delta=20000)
+        self.assertTrue(all(flow == 0 for flow in result.mean_cash_flow[1:]))
+        self.assertAlmostEqual(1 / 12, result.expected_life)
+
+    def test_streams_are_reproducible(self):
+        #Test that a seed gives the same paths with any number of workers, and another seed does not.
+        #Act
+        serial = simulate(*self.columns, paths=30, seed=7, block_size=8)
+        parallel = simulate(*self.columns, paths=30, seed=7, block_size=8, workers=2)
+        other = simulate(*self.columns, paths=30, seed=8, block_size=8)
+        #Assert
+        self.assertEqual(list(serial.present_values), list(parallel.present_values))
+        self.assertEqual(list(serial.mean_cash_flow), list(parallel.mean_cash_flow))
+        self.assertNotEqual(list(serial.present_values), list(other.present_values))
+        self.assertEqual(30, len(set(serial.present_values)))
+
+    def test_statistics_and_rate_table(self):
+        #Test that the running statistics match the paths and a rate table snapshot is used.
+        #Arrange
+        table = RATE_TABLES.current.with_rates({rate: value + 0.02
+                                                for rate, value in RATE_TABLES.current.rates.items()})
+        #Act
+        result = simulate(*self.columns, paths=40, block_size=15)
+        higher = simulate(*self.columns, paths=40, block_size=15, rate_table=table)
+        percentiles = result.percentiles("lives", (0, 50, 100))
+        #Assert
+        self.assertAlmostEqual(math.fsum(result.lives) / 40, result.expected_life)
+        self.assertEqual(min(result.lives), percentiles[0])
+        self.assertEqual(max(result.lives), percentiles[100])
+        self.assertGreater(math.fsum(higher.mean_cash_flow), math.fsum(result.mean_cash_flow))
+
+    def test_invalid_arguments(self):
+        #Test that invalid loans and path counts are rejected.
+        #Act and Assert
+        with self.assertRaises(ValueError) as context:
+            simulate([100000], [0], [0], [22])
+        self.assertEqual("Amortization provided is invalid.", str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            simulate(*self.columns, paths=0)
+        self.assertEqual("Path count must be positive.", str(context.exception))
+
+    def test_main_reads_columnar_books(self):
+        #Test that a columnar book simulates exactly like the text file it was converted from.
+        #Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            book_path = os.path.join(directory, "book.col")
+            convert(DATA_FILE, book_path)
+            outputs = []
+            #Act
+            for path in (DATA_FILE, book_path):
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    status = main([path, "--paths", "10"])
+                outputs.append((status, output.getvalue()))
+        #Assert
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertIn("Expected life:", outputs[1][1])
+
+    def test_main_rejects_bad_arguments_and_missing_files(self):
+        #Test that bad counts are usage errors and a missing file is reported without a traceback.
+        #Act and Assert
+        for option in ("--paths", "--workers"):
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as context:
+                main([DATA_FILE, option, "0"])
+            self.assertEqual(2, context.exception.code)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(["missing_book.txt"])
+        self.assertEqual(1, status)
+        self.assertTrue(output.getvalue().startswith("File not found: "))